@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+异步数据库模块 - 所有 SQLite 操作在专用线程中按队列顺序执行，事件循环只等待结果
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from database import Database
+from utils import run_in_thread
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AsyncDatabase:
+    """
+    Database 的异步门面
+
+    专用线程顺序执行请求（各线程的长连接见 Database._connect，组提交由写后缓冲的写入线程完成），
+    事件循环中的处理器与 Twitter 监控不会因磁盘 I/O（例如提交时的 fsync）阻塞。
+    Database 的公开方法均可直接以协程方式调用，例如 ``await db.get_tweet_watermark(username)``，
+    批量方法（get_media_file_ids、save_media_file_ids、mark_tweets_processed 等）
+    在一个事务内完成多条记录。组提交的排队方法（queue_*）只追加到内存缓冲，黑名单查询只查内存集合，均直接同步返回。
+    """
+
+    # 不触及磁盘的方法（黑名单查询走内存集合）直接在调用线程执行
+    NON_BLOCKING = frozenset({
+        'queue_blacklist_add', 'queue_member_event', 'queue_api_call', 'get_write_stats',
+        'retention_cutoff', 'is_user_blacklisted', 'get_blacklisted_ids', 'get_blacklist_count',
+    })
+
+    def __init__(self, database: Database = None):
+        """
+        初始化并启动数据库线程
+
+        Args:
+            database: 同步的 Database 实例（未提供时新建）
+        """
+        self.database = database or Database()
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._methods = {}
+        self.calls = 0
+        self.failures = 0
+        self.max_wait = 0.0  # 请求在队列中等待的最长时间（秒）
+        self.busy_seconds = 0.0  # 数据库线程执行请求的累计耗时
+        self._thread = threading.Thread(target=self._worker, name='telelux-db', daemon=True)
+        self._thread.start()
+
+    def _worker(self):
+        """数据库线程：按提交顺序执行请求，并把结果交回请求所在的事件循环"""
+        while True:
+            request = self._queue.get()
+            if request is _STOP:
+                break
+
+            func, args, kwargs, loop, future, queued_at = request
+            started = time.monotonic()
+            self.max_wait = max(self.max_wait, started - queued_at)
+            try:
+                result, error = func(*args, **kwargs), None
+            except BaseException as e:  # 异常交给等待方处理
+                result, error = None, e
+            self.busy_seconds += time.monotonic() - started
+            self.calls += 1
+            if error is not None:
+                self.failures += 1
+
+            try:
+                loop.call_soon_threadsafe(self._resolve, future, result, error)
+            except RuntimeError:
+                # 事件循环已关闭，没有等待方
+                pass
+
+        # 在持有连接的线程内关闭连接
+        self.database.close()
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Any, error: BaseException):
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        在数据库线程中执行任意函数并等待结果
+
+        Raises:
+            RuntimeError: 数据库线程已关闭
+        """
+        if self._closed:
+            raise RuntimeError("数据库线程已关闭")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((func, args, kwargs, loop, future, time.monotonic()))
+        return await future
+
+    def __getattr__(self, name: str):
+        """把 Database 的公开方法映射为协程方法"""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        method = getattr(self.database, name)
+        if not callable(method) or name in self.NON_BLOCKING:
+            return method
+
+        wrapper = self._methods.get(name)
+        if wrapper is None:
+            async def wrapper(*args, **kwargs):
+                return await self.run(method, *args, **kwargs)
+            wrapper.__name__ = name
+            wrapper.__doc__ = method.__doc__
+            self._methods[name] = wrapper
+        return wrapper
+
+    async def close(self):
+        """处理完已排队的请求后停止数据库线程并关闭连接"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        await run_in_thread(self._thread.join)
+        logger.info("数据库线程已停止")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取数据库线程统计"""
+        return {
+            'calls': self.calls,
+            'failures': self.failures,
+            'queue_size': self._queue.qsize(),
+            'max_wait_ms': self.max_wait * 1000,
+            'busy_ms': self.busy_seconds * 1000,
+        }
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+数据库基准 - 对比每次调用新建连接（回滚日志模式）与每线程长连接（WAL + 调优 PRAGMA）的单次查询开销，
+以及突发写入时逐条提交与组提交的耗时
+
+用法:
+    python benchmarks/bench_database.py [--repeat 2000]
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for _key, _value in {
+    'TELEGRAM_BOT_TOKEN': '0:bench',
+    'TELEGRAM_CHAT_ID': '-1000000000000',
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from config import Config  # noqa: E402
+from database import Database  # noqa: E402
+
+
+class ConnectPerCallDatabase(Database):
+    """旧实现：每次调用都打开新连接，使用默认的回滚日志模式"""
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+
+def populate(database, rows):
+    """写入黑名单、已处理推文与高水位样本"""
+    with database._connect() as conn:
+        conn.executemany(
+            'INSERT OR IGNORE INTO blacklist (user_id, user_name, username, leave_count) VALUES (?, ?, ?, ?)',
+            ((user_id, f"用户{user_id}", f"user{user_id}", 2) for user_id in range(rows))
+        )
+        conn.executemany(
+            'INSERT OR IGNORE INTO processed_tweets (tweet_id, username, tweet_url, tweet_text, created_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            ((str(10 ** 18 + i), 'sample_user', f"https://x.com/sample_user/status/{10 ** 18 + i}", 'text',
+              '2024-01-01 00:00:00') for i in range(rows))
+        )
+        conn.execute("INSERT OR REPLACE INTO tweet_watermarks (username, last_tweet_id) VALUES ('sample_user', 1)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite 连接方式基准')
+    parser.add_argument('--repeat', type=int, default=2000, help='每个查询的调用次数')
+    parser.add_argument('--rows', type=int, default=5000, help='样本行数')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    Config._init_configs()
+    workdir = tempfile.mkdtemp(prefix='telelux-db-bench-')
+    try:
+        old = ConnectPerCallDatabase(os.path.join(workdir, 'old.db'))
+        new = Database(os.path.join(workdir, 'new.db'))
+        for database in (old, new):
+            populate(database, args.rows)
+
+        counter = iter(range(10 ** 9))
+        queries = [
+            ('get_cached_user_id', lambda db: db.get_cached_user_id('sample_user')),
+            ('get_tweet_watermark', lambda db: db.get_tweet_watermark('sample_user')),
+            ('get_processed_tweets_count', lambda db: db.get_processed_tweets_count()),
+            ('is_tweet_processed (未命中内存)', lambda db: db.is_tweet_processed(str(10 ** 17 + next(counter)))),
+            ('mark_tweet_processed', lambda db: db.mark_tweet_processed(
+                str(2 * 10 ** 18 + next(counter)), 'sample_user', 'https://x.com/i', 'text', '')),
+        ]
+
+        print(f"样本: {args.rows} 行，每个查询调用 {args.repeat} 次")
+        print(f"{'查询':<32}{'新建连接 µs':>14}{'长连接 µs':>12}{'加速':>8}")
+        for name, query in queries:
+            old_us = min(timeit.repeat(lambda: query(old), number=args.repeat, repeat=3)) / args.repeat * 1e6
+            new_us = min(timeit.repeat(lambda: query(new), number=args.repeat, repeat=3)) / args.repeat * 1e6
+            print(f"{name:<32}{old_us:>14.1f}{new_us:>12.1f}{old_us / new_us:>7.1f}x")
+
+        # 离群潮：逐条提交 vs 组提交（排队后以一次 flush 屏障确认落盘）
+        burst = 200
+        user_ids = iter(range(10 ** 6, 10 ** 9))
+
+        def one_by_one():
+            for _ in range(burst):
+                new.add_to_blacklist(next(user_ids), '用户', 'user', 2)
+
+        def grouped():
+            for _ in range(burst):
+                new.queue_blacklist_add(next(user_ids), '用户', 'user', 2)
+            new.flush_writes()
+
+        single_ms = min(timeit.repeat(one_by_one, number=1, repeat=3)) * 1000
+        grouped_ms = min(timeit.repeat(grouped, number=1, repeat=3)) * 1000
+        stats = new.get_write_stats()
+        print(f"\n{burst} 条黑名单写入: 逐条提交 {single_ms:.1f}ms，组提交 {grouped_ms:.1f}ms "
+              f"({single_ms / grouped_ms:.1f}x，平均每批 {stats['avg_batch']:.0f} 行，"
+              f"平均提交 {stats['avg_commit_ms']:.2f}ms)")
+        new.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
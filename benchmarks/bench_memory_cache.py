@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+内存缓存基准 - 对比旧的 MemoryManager（每次读写调用 datetime.now()，超过阈值时排序全部访问时间并一次淘汰一半）
+与 utils.LRUCache（OrderedDict + 单调时钟，每次只淘汰一个条目）
+
+用法:
+    python benchmarks/bench_memory_cache.py [--ops 200000] [--max-size 500]
+"""
+
+import argparse
+import gc
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import LRUCache  # noqa: E402
+
+
+class LegacyMemoryManager:
+    """旧实现（与替换前的 utils.MemoryManager 相同）"""
+
+    def __init__(self, max_size: int = 1000, cleanup_threshold: float = 0.8):
+        self.max_size = max_size
+        self.cleanup_threshold = cleanup_threshold
+        self.data = {}
+        self.access_times = {}
+
+    def add(self, key, value):
+        self.data[key] = value
+        self.access_times[key] = datetime.now()
+        if len(self.data) > self.max_size * self.cleanup_threshold:
+            self._cleanup()
+
+    def get(self, key):
+        if key in self.data:
+            self.access_times[key] = datetime.now()
+            return self.data[key]
+        return None
+
+    def remove(self, key):
+        if key in self.data:
+            del self.data[key]
+            del self.access_times[key]
+            return True
+        return False
+
+    def _cleanup(self):
+        if not self.data:
+            return
+        sorted_items = sorted(self.access_times.items(), key=lambda x: x[1])
+        items_to_remove = sorted_items[:len(sorted_items) // 2]
+        for key, _ in items_to_remove:
+            self.remove(key)
+
+    def size(self):
+        return len(self.data)
+
+
+def member_workload(ops, users, seed=1):
+    """模拟 handle_chat_member：按热度偏斜的用户ID先 get，未命中则 add"""
+    rng = random.Random(seed)
+    return [str(int(rng.paretovariate(1.2) * 1000) % users) for _ in range(ops)]
+
+
+def run(cache, keys):
+    """执行工作负载，返回 (每次操作耗时列表（秒）, 命中次数)"""
+    hits = 0
+    latencies = []
+    clock = time.perf_counter
+    gc.disable()
+    try:
+        for key in keys:
+            op_started = clock()
+            value = cache.get(key)
+            if value is None:
+                cache.add(key, {'user_name': key, 'username': key, 'total_joins': 1, 'total_leaves': 0})
+            else:
+                hits += 1
+                value['total_joins'] += 1
+            latencies.append(clock() - op_started)
+    finally:
+        gc.enable()
+    return latencies, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MemoryManager 与 LRUCache 基准')
+    parser.add_argument('--ops', type=int, default=200000, help='操作次数')
+    parser.add_argument('--max-size', type=int, default=500, help='缓存容量（TeleLuXBot 使用 500）')
+    parser.add_argument('--users', type=int, default=20000, help='不同用户数')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    keys = member_workload(args.ops, args.users)
+    candidates = [
+        ('MemoryManager', LegacyMemoryManager(max_size=args.max_size, cleanup_threshold=0.8)),
+        ('LRUCache', LRUCache(max_size=args.max_size)),
+        ('LRUCache (TTL)', LRUCache(max_size=args.max_size, ttl=3600)),
+        ('LRUCache (字节上限)', LRUCache(max_size=None, max_bytes=args.max_size * 400)),
+    ]
+
+    print(f"{args.ops} 次 get/add，{args.users} 个用户，容量 {args.max_size}")
+    print(f"{'实现':<22}{'平均 µs':>10}{'p99.9 µs':>10}{'最慢 µs':>10}{'命中率':>10}{'条目':>8}")
+    for name, cache in candidates:
+        latencies, hits = run(cache, keys)
+        ordered = sorted(latencies)
+        p999 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.999))]
+        print(f"{name:<22}{sum(latencies) / len(latencies) * 1e6:>10.2f}{p999 * 1e6:>10.1f}"
+              f"{ordered[-1] * 1e6:>10.1f}{hits / args.ops:>10.1%}{cache.size():>8}")
+
+    stats = candidates[1][1].get_stats()
+    print(f"\nLRUCache 统计: 命中 {stats['hits']}，未命中 {stats['misses']}，淘汰 {stats['evictions']}")
+
+
+if __name__ == '__main__':
+    main()
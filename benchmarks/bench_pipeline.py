@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+推文流程基准 - 在本地回放服务上驱动 check_new_tweets、get_tweet_by_id 与 check_twitter_updates，
+并在主接口变慢或持续故障时验证单推文查询的对冲与回退顺序
+
+用法:
+    python benchmarks/bench_pipeline.py [--polls 50] [--lookups 200] [--latency 0.02] [--rate-limit 0.05] [--malformed 0.02]
+
+报告每轮轮询的请求数、解析耗时（JSON 解码 + 时间线遍历 + 构建 Tweet）、端到端延迟分位数与内存分配。
+Telegram 使用只记录调用的假机器人；视频版本的 HEAD 探测不经过回放服务，按固定文件大小应答。
+"""
+
+import argparse
+import asyncio
+import functools
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 基准环境默认值（已设置的环境变量优先）
+for _key, _value in {
+    'TELEGRAM_BOT_TOKEN': '0:replay',
+    'TELEGRAM_CHAT_ID': '-1000000000000',
+    'ADMIN_CHAT_ID': '1',
+    'ADMIN_USER_IDS': '1',
+    'RAPIDAPI_KEY': 'replay',
+    'RAPIDAPI_MONTHLY_QUOTA': '100000000',
+    'TWITTER_USERNAME': 'sample_user',
+    'TWITTER_ACCOUNTS': '',
+    'TWEET_PROVIDERS': 'vxtwitter',
+    'TWEET_SEND_INTERVAL': '0',
+    'HTTP_BACKOFF_BASE': '1',
+}.items():
+    os.environ.setdefault(_key, _value)
+
+import timeline_parser  # noqa: E402
+import tweet_providers  # noqa: E402
+import twitter_monitor as twitter_monitor_module  # noqa: E402
+from config import Config  # noqa: E402
+from replay_server import ReplayServer, FAULT_SERVER_ERROR  # noqa: E402
+from resilience import TwitterAPIError  # noqa: E402
+
+VIDEO_SIZE = 8 * 1024 * 1024  # 假定的视频文件大小（低于链接拉取上限）
+SLOW_PRIMARY_LATENCY = 0.2  # 慢主接口场景中 vxtwitter 的额外延迟（秒）
+HEDGE_DELAY = 0.05  # 对冲场景中接口尚无延迟样本时的对冲等待时间（秒）
+RECOVER_AFTER = 10  # 主接口恢复场景中 vxtwitter 在第几次查询前恢复
+SLOW_BACKUP_LATENCY = 0.02  # 主接口恢复场景中 fxtwitter 的额外延迟（秒）
+
+
+class ParseTimer:
+    """统计 JSON 解码、时间线遍历与 Tweet 构建的累计耗时（包装流程中使用的解析函数）"""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self._patches = []
+
+    def _timed(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - start
+        return wrapper
+
+    def _timed_iter(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            iterator = func(*args, **kwargs)
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.seconds += time.perf_counter() - start
+                yield item
+        return wrapper
+
+    def _patch(self, owner, name, wrapper):
+        original = getattr(owner, name)
+        self._patches.append((owner, name, original))
+        setattr(owner, name, wrapper(original))
+
+    def __enter__(self):
+        self._patch(twitter_monitor_module, 'json_loads', self._timed)
+        self._patch(twitter_monitor_module, 'iter_timeline_tweets', self._timed_iter)
+        self._patch(timeline_parser.TimelineTweet, 'to_tweet', self._timed)
+        self._patch(tweet_providers.VxTwitterProvider, 'parse', self._timed)
+        self._patch(tweet_providers.FxTwitterProvider, 'parse', self._timed)
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches.clear()
+
+
+class FakeBot:
+    """只记录调用的 Telegram 机器人"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self._message_id = 0
+
+    def _message(self, kind=None):
+        self._message_id += 1
+        file_id = f"replay-file-{self._message_id}"
+        return SimpleNamespace(
+            message_id=self._message_id,
+            photo=[SimpleNamespace(file_id=file_id)] if kind == 'photo' else [],
+            video=SimpleNamespace(file_id=file_id) if kind == 'video' else None,
+            animation=None
+        )
+
+    async def send_message(self, **kwargs):
+        self.calls['send_message'] += 1
+        return self._message()
+
+    async def send_photo(self, **kwargs):
+        self.calls['send_photo'] += 1
+        return self._message('photo')
+
+    async def send_video(self, **kwargs):
+        self.calls['send_video'] += 1
+        return self._message('video')
+
+    async def send_media_group(self, media, **kwargs):
+        self.calls['send_media_group'] += 1
+        return [self._message('video' if item.type == 'video' else 'photo') for item in media]
+
+
+class Pipeline:
+    """一次基准运行所需的回放服务、监控器与机器人（使用独立的临时数据库与媒体缓存目录）"""
+
+    def __init__(self, args):
+        self.server = ReplayServer(latency=args.latency, jitter=args.jitter,
+                                   rate_limit_ratio=args.rate_limit, malformed_ratio=args.malformed,
+                                   retry_after=args.retry_after, seed=args.seed)
+        self.workdir = None
+        self.monitor = None
+        self.bot = None
+        self.fake_bot = FakeBot()
+        self.video_probes = 0
+
+    async def __aenter__(self):
+        base_url = await self.server.start()
+        self.workdir = tempfile.mkdtemp(prefix='telelux-bench-')
+        os.environ['RAPIDAPI_BASE_URL'] = base_url
+        os.environ['VXTWITTER_API_BASE'] = base_url
+        os.environ['FXTWITTER_API_BASE'] = base_url
+        os.environ['DATABASE_PATH'] = os.path.join(self.workdir, 'tweets.db')
+        os.environ['MEDIA_CACHE_DIR'] = os.path.join(self.workdir, 'media_cache')
+        Config._init_configs()
+
+        from main import TeleLuXBot
+        self.monitor = twitter_monitor_module.TwitterMonitor()
+
+        async def _probe(url):
+            self.video_probes += 1
+            return VIDEO_SIZE
+        self.monitor.video_selector._probe = _probe
+
+        self.bot = TeleLuXBot()
+        self.bot.application = SimpleNamespace(bot=self.fake_bot)
+        self.bot.twitter_monitor = self.monitor
+        self.bot.database = self.monitor.database
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.monitor.close()
+        await self.bot.database.close()
+        await self.server.stop()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def percentile(samples, pct):
+    """最近秩法分位数"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+async def run_check_new_tweets(pipeline, iterations):
+    """每轮发布 0~2 条新推文后调用 check_new_tweets，并把结果标记为已处理以推进高水位"""
+    monitor, server = pipeline.monitor, pipeline.server
+    username = Config.TWITTER_USERNAME
+    samples, found, errors = [], 0, Counter()
+    await monitor.get_user_id(username)  # 预热用户ID缓存，/user 请求不计入轮询
+    server.reset_counters()
+    with ParseTimer() as timer:
+        for i in range(iterations):
+            server.publish(i % 3)
+            start = time.perf_counter()
+            try:
+                tweets = await monitor.check_new_tweets(username)
+            except TwitterAPIError as e:
+                errors[e.category] += 1
+                tweets = []
+            samples.append(time.perf_counter() - start)
+            found += len(tweets)
+            for tweet in sorted(tweets, key=lambda t: t.id):
+                await monitor.database.mark_tweet_processed(str(tweet.id), username, tweet.url, tweet.text,
+                                                            str(tweet.created_at or ''))
+    return {'samples': samples, 'parse': timer.seconds, 'items': found, 'errors': errors}
+
+
+async def run_get_tweet_by_id(pipeline, iterations):
+    """每 4 次请求中重复请求一次上一条推文（重复请求命中单推文缓存）"""
+    monitor, server = pipeline.monitor, pipeline.server
+    base_id = server.latest_tweet_id
+    samples, found, errors = [], 0, Counter()
+    server.reset_counters()
+    with ParseTimer() as timer:
+        for i in range(iterations):
+            tweet_id = base_id - (i - i // 4)
+            start = time.perf_counter()
+            try:
+                tweet = await monitor.get_tweet_by_id(str(tweet_id))
+            except TwitterAPIError as e:
+                errors[e.category] += 1
+                tweet = None
+            samples.append(time.perf_counter() - start)
+            found += tweet is not None
+    return {'samples': samples, 'parse': timer.seconds, 'items': found, 'errors': errors}
+
+
+async def run_check_twitter_updates(pipeline, iterations):
+    """每轮发布 0~2 条新推文后执行一次完整的检查与转发"""
+    bot, server = pipeline.bot, pipeline.server
+    await pipeline.monitor.get_user_id(Config.TWITTER_USERNAME)
+    server.reset_counters()
+    samples, sent, errors = [], 0, Counter()
+    with ParseTimer() as timer:
+        for i in range(iterations):
+            server.publish(i % 3)
+            start = time.perf_counter()
+            result = await bot.check_twitter_updates(force=True)
+            samples.append(time.perf_counter() - start)
+            sent += result['sent']
+            errors.update(result['errors'].values())
+    return {'samples': samples, 'parse': timer.seconds, 'items': sent, 'errors': errors}
+
+
+async def run_hedged_lookups(pipeline, iterations, before_lookup=None):
+    """
+    vxtwitter（主）+ fxtwitter（备）对冲查询，直接调用 HedgedTweetLookup（绕过单推文缓存），每次查询不同的推文
+
+    before_lookup(i) 在第 i 次查询前调用，用于在场景中途调整回放服务
+    """
+    monitor = pipeline.monitor
+    lookup = tweet_providers.HedgedTweetLookup(
+        tweet_providers.create_providers(monitor, ['vxtwitter', 'fxtwitter']), monitor.http_client,
+        hedge_delay=HEDGE_DELAY
+    )
+    base_id = pipeline.server.latest_tweet_id
+    samples, found, errors = [], 0, Counter()
+    with ParseTimer() as timer:
+        for i in range(iterations):
+            if before_lookup:
+                before_lookup(i)
+            start = time.perf_counter()
+            try:
+                tweet = await lookup.lookup(str(base_id - i))
+            except TwitterAPIError as e:
+                errors[e.category] += 1
+                tweet = None
+            samples.append(time.perf_counter() - start)
+            found += tweet is not None
+    return {'samples': samples, 'parse': timer.seconds, 'items': found, 'errors': errors,
+            'lookup': lookup.get_stats()}
+
+
+async def run_slow_primary(pipeline, iterations):
+    """vxtwitter 每次响应额外延迟 SLOW_PRIMARY_LATENCY：首次查询对冲到 fxtwitter 后，应改为优先请求 fxtwitter"""
+    pipeline.server.route_latency['vxtwitter'] = SLOW_PRIMARY_LATENCY
+    return await run_hedged_lookups(pipeline, iterations)
+
+
+async def run_failing_primary(pipeline, iterations):
+    """vxtwitter 持续返回 503：失败后立即回退到 fxtwitter，之后只在定期探测时请求 vxtwitter"""
+    pipeline.server.route_faults['vxtwitter'] = FAULT_SERVER_ERROR
+    return await run_hedged_lookups(pipeline, iterations)
+
+
+async def run_recovering_primary(pipeline, iterations):
+    """
+    vxtwitter 在前 RECOVER_AFTER 次查询返回 503 后恢复，fxtwitter 较慢：
+    下一次探测请求成功后，vxtwitter 应重新排到第一位并赢得其余大部分查询
+    """
+    server = pipeline.server
+    server.route_faults['vxtwitter'] = FAULT_SERVER_ERROR
+    server.route_latency['fxtwitter'] = SLOW_BACKUP_LATENCY
+
+    def before_lookup(i):
+        if i == RECOVER_AFTER:
+            server.route_faults.pop('vxtwitter', None)
+
+    return await run_hedged_lookups(pipeline, iterations, before_lookup)
+
+
+SCENARIOS = [
+    ('check_new_tweets', run_check_new_tweets, 'polls'),
+    ('get_tweet_by_id', run_get_tweet_by_id, 'lookups'),
+    ('check_twitter_updates', run_check_twitter_updates, 'polls'),
+    ('hedge_slow_primary', run_slow_primary, 'lookups'),
+    ('hedge_failing_primary', run_failing_primary, 'lookups'),
+    ('hedge_recovering_primary', run_recovering_primary, 'lookups'),
+]
+
+
+async def run_scenario(args, runner, iterations, trace=False):
+    """在全新的回放环境中运行一个场景，trace=True 时统计内存分配"""
+    async with Pipeline(args) as pipeline:
+        if trace:
+            tracemalloc.start()
+            before, _ = tracemalloc.get_traced_memory()
+        result = await runner(pipeline, iterations)
+        if trace:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result['alloc_net'] = current - before
+            result['alloc_peak'] = peak - before
+        result['requests'] = Counter(pipeline.server.requests)
+        result['faults'] = Counter(pipeline.server.faults)
+        result['telegram'] = Counter(pipeline.fake_bot.calls)
+        result['video_probes'] = pipeline.video_probes
+    return result
+
+
+def report(name, unit, iterations, timing, memory):
+    samples = timing['samples']
+    requests = sum(timing['requests'].values())
+    print(f"\n== {name} ({iterations} {unit}) ==")
+    print(f"  请求数: {requests} ({requests / iterations:.2f}/次) {dict(timing['requests'])}")
+    if timing['faults']:
+        print(f"  注入故障: {dict(timing['faults'])}")
+    if timing['errors']:
+        print(f"  接口错误: {dict(timing['errors'])}")
+    print(f"  结果条数: {timing['items']}")
+    print(f"  解析耗时: 共 {timing['parse'] * 1000:.1f}ms，{timing['parse'] / iterations * 1e6:.0f}µs/次")
+    print(f"  端到端延迟 ms: p50 {percentile(samples, 50) * 1000:.2f} / p90 {percentile(samples, 90) * 1000:.2f}"
+          f" / p99 {percentile(samples, 99) * 1000:.2f} / max {max(samples) * 1000:.2f}")
+    print(f"  内存分配: 峰值 {memory['alloc_peak'] / 1024:.1f}KB，净增 {memory['alloc_net'] / 1024:.1f}KB")
+    if timing['telegram']:
+        print(f"  Telegram 调用: {dict(timing['telegram'])}，视频探测: {timing['video_probes']}")
+    if timing.get('lookup'):
+        providers = ", ".join(
+            f"{name} 请求 {stats['requests']} / 胜出 {stats['wins']} / "
+            f"延迟 {'-' if stats['latency_ms'] is None else stats['latency_ms']}ms / {stats['breaker']}"
+            for name, stats in timing['lookup']['providers'].items()
+        )
+        print(f"  对冲请求: {timing['lookup']['hedged_requests']} 次，探测 {timing['lookup']['explorations']} 次；{providers}")
+
+
+async def main_async(args):
+    print(f"回放参数: 延迟 {args.latency * 1000:.0f}ms (+{args.jitter * 1000:.0f}ms 抖动)，"
+          f"429 概率 {args.rate_limit:.0%}，异常响应概率 {args.malformed:.0%}")
+    print(f"JSON 后端: {timeline_parser.JSON_BACKEND}")
+    for name, runner, unit in SCENARIOS:
+        if args.only and name not in args.only:
+            continue
+        iterations = args.polls if unit == 'polls' else args.lookups
+        timing = await run_scenario(args, runner, iterations)
+        memory = await run_scenario(args, runner, iterations, trace=True)
+        report(name, unit, iterations, timing, memory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='推文流程基准（本地回放服务）')
+    parser.add_argument('--polls', type=int, default=50, help='check_new_tweets / check_twitter_updates 的轮询次数')
+    parser.add_argument('--lookups', type=int, default=200, help='get_tweet_by_id 的调用次数')
+    parser.add_argument('--latency', type=float, default=0.0, help='回放响应的基础延迟（秒）')
+    parser.add_argument('--jitter', type=float, default=0.0, help='随机叠加的延迟上限（秒）')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='返回 429 的概率')
+    parser.add_argument('--malformed', type=float, default=0.0, help='返回结构异常响应的概率')
+    parser.add_argument('--retry-after', type=int, default=0, help='429 响应的 Retry-After（秒）')
+    parser.add_argument('--seed', type=int, default=1, help='故障注入的随机数种子')
+    parser.add_argument('--only', nargs='*', choices=[name for name, _, _ in SCENARIOS], help='只运行指定场景')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)  # 逐条日志会淹没基准结果
+    asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+时间线解析基准 - 对比旧的整包解析（标准库 json + 逐条构建 datetime/媒体字典）与 timeline_parser 惰性解析
+
+用法:
+    python benchmarks/bench_timeline_parser.py [--repeat 2000]
+
+样本位于 benchmarks/fixtures/user_tweets.json（按 twitter241 /user-tweets 响应结构整理，已去除真实账号信息），
+包含图片、视频、转推、TweetWithVisibilityResults、置顶与分页游标条目。
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import timeline_parser  # noqa: E402
+from timeline_parser import iter_timeline_tweets  # noqa: E402
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'user_tweets.json')
+USERNAME = 'sample_user'
+
+
+def legacy_media_info(legacy_tweet: dict) -> dict:
+    """旧实现的媒体提取：为每条推文构建媒体字典列表"""
+    media_items = []
+    media_urls = []
+    preview_image_url = None
+    for m in legacy_tweet.get("extended_entities", {}).get("media", []):
+        media_type = m.get("type")
+        media_url = m.get("media_url_https")
+        if media_type == "video" or media_type == "animated_gif":
+            best_video_url = None
+            max_bitrate = -1
+            for v in m.get("video_info", {}).get("variants", []):
+                if v.get("content_type") == "video/mp4" and v.get("bitrate", -1) > max_bitrate:
+                    max_bitrate = v.get("bitrate")
+                    best_video_url = v.get("url")
+            if best_video_url:
+                media_url = best_video_url
+        media_items.append({'type': media_type, 'url': media_url, 'preview_image_url': m.get("media_url_https")})
+        if media_url:
+            media_urls.append(media_url)
+        if not preview_image_url:
+            preview_image_url = m.get("media_url_https")
+    return {
+        'has_media': len(media_items) > 0,
+        'media_urls': media_urls,
+        'preview_image_url': preview_image_url,
+        'media': media_items
+    }
+
+
+def eager_parse(raw: bytes, since_id: int = 0, count: int = 10):
+    """旧实现：标准库解码后为每条推文立即构建日期与媒体结构"""
+    data = json.loads(raw)
+    instructions = data.get("result", {}).get("timeline", {}).get("instructions", [])
+    entries = []
+    for inst in instructions:
+        if inst.get("type") == "TimelineAddEntries":
+            entries = inst.get("entries", [])
+            break
+
+    tweet_list = []
+    for entry in entries:
+        content = entry.get("content", {})
+        if content.get("entryType") != "TimelineTimelineItem":
+            continue
+        item_result = content.get("itemContent", {}).get("tweet_results", {}).get("result", {})
+        if not item_result:
+            continue
+        if item_result.get("__typename") == "TweetWithVisibilityResults":
+            item_result = item_result.get("tweet", {})
+        legacy = item_result.get("legacy", {})
+        if not legacy or legacy.get("retweeted_status_result"):
+            continue
+
+        tweet_id = legacy.get("id_str")
+        numeric_id = int(tweet_id) if tweet_id and tweet_id.isdigit() else 0
+        if since_id and numeric_id and numeric_id <= since_id:
+            break
+
+        try:
+            dt = datetime.strptime(legacy.get("created_at"), '%a %b %d %H:%M:%S %z %Y')
+        except (TypeError, ValueError):
+            dt = legacy.get("created_at")
+        media_info = legacy_media_info(legacy)
+
+        tweet_list.append({
+            'id': numeric_id,
+            'text': legacy.get("full_text"),
+            'created_at': dt,
+            'url': f"https://twitter.com/{USERNAME}/status/{tweet_id}",
+            'username': USERNAME,
+            **media_info
+        })
+        if len(tweet_list) >= count:
+            break
+    return tweet_list
+
+
+def lazy_parse(raw: bytes, since_id: int = 0, count: int = 10):
+    """新实现：快速后端解码，到达高水位前才构建 Tweet 记录"""
+    tweet_list = []
+    for record in iter_timeline_tweets(timeline_parser.loads(raw)):
+        if since_id and record.id and record.id <= since_id:
+            break
+        tweet_list.append(record.to_tweet(USERNAME))
+        if len(tweet_list) >= count:
+            break
+    return tweet_list
+
+
+def measure(func, raw, since_id, repeat):
+    """返回 (每次调用微秒数, 峰值内存 KB)"""
+    seconds = min(timeit.repeat(lambda: func(raw, since_id), number=repeat, repeat=3)) / repeat
+    tracemalloc.start()
+    func(raw, since_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds * 1e6, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='时间线解析基准')
+    parser.add_argument('--repeat', type=int, default=2000, help='每个场景的调用次数')
+    args = parser.parse_args()
+
+    with open(FIXTURE, 'rb') as f:
+        raw = f.read()
+
+    ids = [record.id for record in iter_timeline_tweets(timeline_parser.loads(raw))]
+    scenarios = [
+        ('首次抓取（无高水位）', 0),
+        ('常规轮询（2 条新推文）', ids[2]),
+        ('无新推文', ids[0]),
+    ]
+
+    eager, lazy = eager_parse(raw), lazy_parse(raw)
+    assert [(t['id'], t['created_at']) for t in eager] == [(t.id, t.created_at) for t in lazy], "新旧解析结果不一致"
+
+    print(f"样本: {os.path.basename(FIXTURE)} ({len(raw) / 1024:.1f}KB, {len(ids)} 条原创推文)")
+    print(f"JSON 后端: {timeline_parser.JSON_BACKEND}")
+    print(f"{'场景':<22}{'旧实现 µs':>12}{'新实现 µs':>12}{'加速':>8}{'旧峰值 KB':>12}{'新峰值 KB':>12}")
+    for name, since_id in scenarios:
+        eager_us, eager_kb = measure(eager_parse, raw, since_id, args.repeat)
+        lazy_us, lazy_kb = measure(lazy_parse, raw, since_id, args.repeat)
+        print(f"{name:<22}{eager_us:>12.1f}{lazy_us:>12.1f}{eager_us / lazy_us:>7.2f}x{eager_kb:>12.1f}{lazy_kb:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
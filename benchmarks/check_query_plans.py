@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+查询计划回归检查 - 在合成的大数据库（默认 100 万行）上执行 Database 的每个方法，
+记录实际执行的 SQL 并运行 EXPLAIN QUERY PLAN；热点查询退化为全表扫描或临时排序时以非零状态退出。
+随后报告每个方法的调用延迟（p50 / p99）。
+
+用法:
+    python benchmarks/check_query_plans.py [--rows 1000000] [--repeat 200] [--skip-latency]
+"""
+
+import argparse
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for _key, _value in {
+    'TELEGRAM_BOT_TOKEN': '0:bench',
+    'TELEGRAM_CHAT_ID': '-1000000000000',
+}.items():
+    os.environ.setdefault(_key, _value)
+
+from config import Config  # noqa: E402
+from database import Database  # noqa: E402
+
+USERNAME = 'sample_user'
+TWEET_ID_BASE = 10 ** 18
+USER_ID_BASE = 10 ** 9
+
+# 计划中出现即视为退化：无索引的全表扫描、为 ORDER BY 建临时 B 树
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+TEMP_SORT = 'USE TEMP B-TREE'
+
+# 允许全表扫描的方法及原因（只读取有限行，不随历史增长）
+SCAN_ALLOWED = {
+    'warm_processed_cache': '按 rowid 倒序只读取 LIMIT 行',
+}
+
+
+class TracingDatabase(Database):
+    """记录每个连接实际执行的 SQL（参数已展开）"""
+
+    def __init__(self, db_path):
+        self.statements = []
+        self.tracing = False
+        super().__init__(db_path)
+
+    def _open_connection(self):
+        conn = super()._open_connection()
+        conn.set_trace_callback(self._trace)
+        return conn
+
+    def _trace(self, statement):
+        if self.tracing:
+            self.statements.append(statement)
+
+
+def populate(database, rows):
+    """写入合成数据：processed_tweets、blacklist 与 member_events 各 rows 行，处理/加入时间分布在最近 25 天，另有少量超过 30 天"""
+    now = time.time()
+    stale = max(rows // 1000, 1)
+
+    def timestamp(i):
+        age = 40 * 86400 + i if i < stale else (i * 7919) % (25 * 86400)
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(now - age))
+
+    with database._connect() as conn:
+        conn.executemany(
+            'INSERT INTO processed_tweets (tweet_id, username, tweet_url, tweet_text, created_at, processed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            ((str(TWEET_ID_BASE + i), f"user{i % 50}", f"https://x.com/i/status/{TWEET_ID_BASE + i}",
+              'text', '2024-01-01 00:00:00', timestamp(i)) for i in range(rows))
+        )
+        conn.executemany(
+            'INSERT INTO blacklist (user_id, user_name, username, reason, leave_count, added_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            ((USER_ID_BASE + i, f"用户{i}", f"user{i}", '多次离群' if i % 10 else '管理员添加', 2, timestamp(i))
+             for i in range(rows))
+        )
+        conn.executemany(
+            'INSERT INTO media_file_ids (media_url, file_id, media_type, hits, last_used_at) VALUES (?, ?, ?, 0, ?)',
+            ((f"https://pbs.twimg.com/media/{i}.jpg", f"file{i}", 'photo', now - i)
+             for i in range(min(rows, Config.MEDIA_FILE_ID_CACHE_SIZE)))
+        )
+        conn.executemany(
+            'INSERT INTO tweet_watermarks (username, last_tweet_id) VALUES (?, ?)',
+            ((f"user{i}", TWEET_ID_BASE + rows) for i in range(1, 50))
+        )
+        conn.executemany(
+            'INSERT INTO member_events (user_id, ts, event) VALUES (?, ?, ?)',
+            ((USER_ID_BASE + i % (rows // 4 or 1), int(now) - (rows - i), 1 + i % 2) for i in range(rows))
+        )
+        conn.execute("INSERT INTO twitter_user_ids (username, rest_id) VALUES (?, '44196397')", (USERNAME,))
+        conn.execute("INSERT INTO api_usage (period, endpoint, calls, last_call_at) VALUES ('2024-01', '/user', 1, 0)")
+        conn.commit()
+
+
+def scenarios(rows):
+    """(方法名, 调用) 列表；每次调用使用不同的键，避免命中内存集合"""
+    counter = iter(range(10 ** 9))
+
+    def next_id():
+        return next(counter) % rows
+
+    def new_tweet():
+        tweet_id = str(2 * TWEET_ID_BASE + next(counter))
+        return tweet_id, USERNAME, f"https://x.com/{USERNAME}/status/{tweet_id}", 'text', ''
+
+    return [
+        ('warm_processed_cache', lambda db: db.warm_processed_cache(100)),
+        ('load_blacklist_cache', lambda db: db.load_blacklist_cache()),
+        ('is_tweet_processed', lambda db: db.is_tweet_processed(str(TWEET_ID_BASE + next_id()))),
+        ('filter_unprocessed', lambda db: db.filter_unprocessed(
+            [str(TWEET_ID_BASE + next_id()) for _ in range(20)])),
+        ('mark_tweet_processed', lambda db: db.mark_tweet_processed(*new_tweet())),
+        ('mark_tweets_processed', lambda db: db.mark_tweets_processed([new_tweet() for _ in range(5)])),
+        # user0 没有高水位记录，走 processed_tweets 的回退查询
+        ('get_tweet_watermark', lambda db: db.get_tweet_watermark('User0')),
+        ('get_processed_tweets_count', lambda db: db.get_processed_tweets_count()),
+        ('cleanup_old_records', lambda db: db.cleanup_old_records(30)),
+        ('delete_expired_rows', lambda db: db.delete_expired_rows(
+            'processed_tweets', db.retention_cutoff('processed_tweets', 30), ('1970-01-01 00:00:00', 0), 10)),
+        ('delete_expired_rows(api_usage)', lambda db: db.delete_expired_rows(
+            'api_usage', db.retention_cutoff('api_usage', 400), ('1970-01-01', ''), 10)),
+        ('delete_expired_rows(member_events)', lambda db: db.delete_expired_rows(
+            'member_events', db.retention_cutoff('member_events', 1), (0, 0), 10)),
+        ('incremental_vacuum', lambda db: db.incremental_vacuum(16)),
+        ('add_to_blacklist', lambda db: db.add_to_blacklist(2 * USER_ID_BASE + next(counter), '用户', 'user', 2)),
+        ('queue_blacklist_add', lambda db: (
+            db.queue_blacklist_add(2 * USER_ID_BASE + next(counter), '用户', 'user', 2), db.flush_writes())),
+        ('is_user_blacklisted', lambda db: db.is_user_blacklisted(USER_ID_BASE + next_id())),
+        ('get_blacklisted_ids', lambda db: db.get_blacklisted_ids([USER_ID_BASE + next_id() for _ in range(20)])),
+        ('get_blacklist', lambda db: db.get_blacklist()),
+        ('get_blacklist_page', lambda db: db.get_blacklist_page(10)),
+        ('get_blacklist_page(下一页)', lambda db: db.get_blacklist_page(
+            10, before=('2100-01-01 00:00:00', USER_ID_BASE + next_id()))),
+        # 过滤翻页的起点行按 user_id 查出过滤列取值；命中很少的前缀同样只读取索引范围内的行
+        ('get_blacklist_page(按原因)', lambda db: db.get_blacklist_page(10, reason_prefix='管理员')),
+        ('get_blacklist_page(按原因下一页)', lambda db: db.get_blacklist_page(
+            10, before=('2100-01-01 00:00:00', USER_ID_BASE + next_id()), reason_prefix='多次离群')),
+        ('get_blacklist_page(按用户名上一页)', lambda db: db.get_blacklist_page(
+            10, after=('1970-01-01 00:00:00', USER_ID_BASE + next_id()), username_prefix='User1')),
+        ('get_blacklist_page(罕见用户名)', lambda db: db.get_blacklist_page(10, username_prefix='user99999')),
+        ('remove_from_blacklist', lambda db: db.remove_from_blacklist(3 * USER_ID_BASE + next(counter))),
+        ('get_blacklist_count', lambda db: db.get_blacklist_count()),
+        ('count_blacklist', lambda db: db.count_blacklist(username_prefix='user1')),
+        ('count_blacklist(按原因)', lambda db: db.count_blacklist(reason_prefix='多次')),
+        ('queue_member_event', lambda db: (db.queue_member_event(USER_ID_BASE + next_id(), 1), db.flush_writes())),
+        ('get_member_event_counts', lambda db: db.get_member_event_counts(USER_ID_BASE + next_id() % (rows // 4 or 1))),
+        ('get_member_events', lambda db: db.get_member_events(USER_ID_BASE + next_id() % (rows // 4 or 1), 20)),
+        ('get_cached_user_id', lambda db: db.get_cached_user_id(USERNAME)),
+        ('save_user_id', lambda db: db.save_user_id(USERNAME, '44196397')),
+        ('delete_user_id', lambda db: db.delete_user_id('missing_user')),
+        ('queue_api_call', lambda db: (db.queue_api_call('2024-01', '/user', time.time()), db.flush_writes())),
+        ('get_api_usage', lambda db: db.get_api_usage('2024-01')),
+        ('get_media_file_ids', lambda db: db.get_media_file_ids(
+            [f"https://pbs.twimg.com/media/{next_id()}.jpg" for _ in range(4)])),
+        ('save_media_file_ids', lambda db: db.save_media_file_ids(
+            [(f"https://video.twimg.com/{next(counter)}.mp4", 'file', 'video')])),
+        ('delete_media_file_ids', lambda db: db.delete_media_file_ids(['https://pbs.twimg.com/media/missing.jpg'])),
+        ('get_media_file_id_count', lambda db: db.get_media_file_id_count()),
+    ]
+
+
+def explain(conn, statement):
+    """返回语句的查询计划明细（非 DML/DQL 语句返回空列表）"""
+    if not re.match(r'\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE|WITH)\b', statement, re.IGNORECASE):
+        return []
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {statement}')]
+
+
+def check_plans(db_path, rows):
+    """执行每个方法并检查其 SQL 的查询计划，返回退化列表"""
+    database = TracingDatabase(db_path)
+    conn = sqlite3.connect(db_path)
+    regressions = []
+    try:
+        for name, call in scenarios(rows):
+            database.statements.clear()
+            database.tracing = True
+            call(database)
+            database.flush_writes()
+            database.tracing = False
+
+            seen = set()
+            for statement in database.statements:
+                statement = ' '.join(statement.split())
+                if statement in seen:
+                    continue
+                seen.add(statement)
+                details = explain(conn, statement)
+                bad = [d for d in details if FULL_SCAN.match(d) or TEMP_SORT in d]
+                status = 'OK'
+                if bad and name in SCAN_ALLOWED:
+                    status = f"允许（{SCAN_ALLOWED[name]}）"
+                elif bad:
+                    status = '退化'
+                    regressions.append((name, statement, bad))
+                if details:
+                    print(f"[{status}] {name}: {statement[:100]}")
+                    for detail in details:
+                        print(f"        {detail}")
+    finally:
+        conn.close()
+        database.close()
+    return regressions
+
+
+def measure_latency(db_path, rows, repeat):
+    """报告每个方法的调用延迟"""
+    database = Database(db_path)
+    try:
+        print(f"\n{'方法':<28}{'p50 µs':>10}{'p99 µs':>10}")
+        for name, call in scenarios(rows):
+            samples = []
+            deadline = time.monotonic() + 5  # 返回全部行的方法（get_blacklist）限制总耗时
+            while len(samples) < repeat and (not samples or time.monotonic() < deadline):
+                started = time.perf_counter()
+                call(database)
+                samples.append((time.perf_counter() - started) * 1e6)
+            samples.sort()
+            p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+            print(f"{name:<28}{statistics.median(samples):>10.1f}{p99:>10.1f}")
+    finally:
+        database.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Database 查询计划回归检查与延迟基准')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='各表的合成行数')
+    parser.add_argument('--repeat', type=int, default=200, help='延迟基准中每个方法的调用次数')
+    parser.add_argument('--skip-latency', action='store_true', help='只检查查询计划')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    Config._init_configs()
+    workdir = tempfile.mkdtemp(prefix='telelux-plan-')
+    db_path = os.path.join(workdir, 'plans.db')
+    try:
+        started = time.monotonic()
+        database = Database(db_path)
+        populate(database, args.rows)
+        database.close()
+        print(f"已生成 {args.rows} 行合成数据，用时 {time.monotonic() - started:.1f}s\n")
+
+        regressions = check_plans(db_path, args.rows)
+        if not args.skip_latency:
+            measure_latency(db_path, args.rows, args.repeat)
+
+        if regressions:
+            print(f"\n{len(regressions)} 条查询退化为全表扫描或临时排序:")
+            for name, statement, details in regressions:
+                print(f"  {name}: {statement[:100]} -> {'; '.join(details)}")
+            sys.exit(1)
+        print("\n所有查询均使用索引")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+回放服务 - 基于 aiohttp 的本地替身服务，回放录制的 twitter241 /user、/user-tweets、vxtwitter /Twitter/status/<id>
+与 fxtwitter /status/<id>（由 vxtwitter 录制响应转换）响应
+
+可注入延迟、429 限流与结构异常的响应，用于在不消耗 RapidAPI 配额的情况下测量与回归测试推文抓取流程。
+
+用法:
+    python benchmarks/replay_server.py [--port 8089] [--latency 0.05] [--rate-limit 0.1] [--malformed 0.05]
+
+然后将 RAPIDAPI_BASE_URL、VXTWITTER_API_BASE 与 FXTWITTER_API_BASE 指向输出的地址。
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import time
+from collections import Counter
+from typing import List, Optional
+
+from aiohttp import web
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+FAULT_RATE_LIMITED = 'rate_limited'
+FAULT_EMPTY = 'empty'  # 200 + 空响应体
+FAULT_TRUNCATED = 'truncated'  # 200 + 截断的 JSON
+FAULT_SHAPE = 'shape'  # 200 + 合法 JSON 但结构不符
+FAULT_SERVER_ERROR = 'server_error'  # 503
+MALFORMED_FAULTS = (FAULT_EMPTY, FAULT_TRUNCATED, FAULT_SHAPE)
+
+# 各路由结构不符时返回的响应（均为线上出现过的形态）
+MALFORMED_SHAPES = {
+    'user': [
+        {"result": {"data": {}}},
+        {"message": "You have exceeded the rate limit per second for your plan"},
+    ],
+    'user-tweets': [
+        {"errors": [{"message": "Internal error", "code": 131}]},
+        {"result": {"timeline": {"instructions": [
+            {"type": "TimelineAddEntries", "entries": [
+                {"entryId": "tweet-0", "content": {
+                    "entryType": "TimelineTimelineItem",
+                    "itemContent": {"tweet_results": {"result": {"__typename": "TweetTombstone"}}}
+                }}
+            ]}
+        ]}}},
+    ],
+    'vxtwitter': [
+        {"error": "Failed to scan your link! This may be due to an incorrect link, private/suspended account, "
+                  "deleted tweet, or recent changes to Twitter's API"},
+        [],
+    ],
+    'fxtwitter': [
+        {"code": 500, "message": "API_FAIL", "tweet": None},
+        {"code": 200, "message": "OK"},
+    ],
+}
+
+TWITTER_DATE_FORMAT = '%a %b %d %H:%M:%S +0000 %Y'
+
+
+def _load_fixture(name: str):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return json.loads(f.read())
+
+
+def _dumps(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _tweet_result(entry: dict) -> Optional[dict]:
+    """返回时间线条目中的推文结果（展开 TweetWithVisibilityResults）"""
+    content = entry.get('content') or {}
+    if content.get('entryType') != 'TimelineTimelineItem':
+        return None
+    result = ((content.get('itemContent') or {}).get('tweet_results') or {}).get('result')
+    if result and result.get('__typename') == 'TweetWithVisibilityResults':
+        result = result.get('tweet')
+    return result
+
+
+class ReplayServer:
+    """录制响应的回放服务（单个时间线，所有用户名共享）"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 rate_limit_ratio: float = 0.0, malformed_ratio: float = 0.0, retry_after: int = 1,
+                 seed: Optional[int] = None):
+        """
+        初始化回放服务
+
+        Args:
+            host: 监听地址
+            port: 监听端口（0 表示随机分配）
+            latency: 每个响应的基础延迟（秒）
+            jitter: 在基础延迟上叠加的随机延迟上限（秒）
+            rate_limit_ratio: 返回 429 的概率
+            malformed_ratio: 返回结构异常响应（空响应体/截断 JSON/结构不符）的概率
+            retry_after: 429 响应携带的 Retry-After（秒）
+            seed: 随机数种子（固定后故障注入可复现）
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.malformed_ratio = malformed_ratio
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+
+        self.user = _load_fixture('user.json')
+        self.vxtwitter_status = _load_fixture('vxtwitter_status.json')
+        timeline = _load_fixture('user_tweets.json')
+        self.timeline = timeline
+        self._entries = next(
+            inst['entries'] for inst in timeline['result']['timeline']['instructions']
+            if inst.get('type') == 'TimelineAddEntries'
+        )
+        # 发布新推文时按顺序复制的原创推文条目模板
+        self._templates = [
+            entry for entry in self._entries
+            if (_tweet_result(entry) or {}).get('legacy')
+            and not _tweet_result(entry)['legacy'].get('retweeted_status_result')
+        ]
+        self._page_size = sum(1 for entry in self._entries if _tweet_result(entry))
+        # 全部推文条目（从新到旧）；第一页为前 _page_size 条，带 cursor 参数的请求按 Bottom 游标中的偏移量翻页
+        self._history = [entry for entry in self._entries if _tweet_result(entry)]
+        for entry in self._entries:
+            content = entry.get('content') or {}
+            if content.get('cursorType') == 'Bottom':
+                content['value'] = f"replay:{self._page_size}"
+        self._published = 0
+        self._user_body = _dumps(self.user)
+        self._timeline_body = _dumps(self.timeline)
+
+        self._scheduled_faults = []  # [(路由或 None, 故障类型)]，优先于按概率注入
+        self.route_latency = {}  # 路由 -> 额外延迟（秒），例如模拟变慢的单推文接口
+        self.route_faults = {}  # 路由 -> 每次请求都返回的故障类型，例如模拟持续故障的单推文接口
+        self.requests = Counter()  # 路由 -> 请求数
+        self.faults = Counter()  # 故障类型 -> 注入次数
+        self._runner = None
+        self.base_url = None
+
+    @property
+    def latest_tweet_id(self) -> int:
+        """时间线中最新推文的ID"""
+        for entry in self._entries:
+            result = _tweet_result(entry)
+            if result and result.get('legacy'):
+                return int(result['legacy']['id_str'])
+        return 0
+
+    def publish(self, count: int = 1) -> List[int]:
+        """
+        在时间线顶部发布新推文（按顺序复制录制的原创推文，分页大小保持不变）
+
+        Returns:
+            新推文ID列表（从新到旧）
+        """
+        new_entries = []
+        next_id = self.latest_tweet_id
+        now = time.strftime(TWITTER_DATE_FORMAT, time.gmtime())
+        for _ in range(count):
+            template = self._templates[self._published % len(self._templates)]
+            self._published += 1
+            next_id += 1000
+            entry = copy.deepcopy(template)
+            entry['entryId'] = f"tweet-{next_id}"
+            entry['sortIndex'] = str(next_id)
+            result = _tweet_result(entry)
+            result['rest_id'] = str(next_id)
+            result['legacy']['id_str'] = str(next_id)
+            result['legacy']['created_at'] = now
+            new_entries.insert(0, entry)
+
+        self._history[:0] = new_entries
+        others = [entry for entry in self._entries if not _tweet_result(entry)]
+        self._entries[:] = self._history[:self._page_size] + others
+        self._timeline_body = _dumps(self.timeline)
+        return [int(entry['sortIndex']) for entry in new_entries]
+
+    def schedule_fault(self, fault: str, count: int = 1, route: Optional[str] = None) -> None:
+        """
+        指定接下来的请求返回的故障（用于可复现的回归场景）
+
+        Args:
+            fault: rate_limited / empty / truncated / shape
+            count: 连续注入的次数
+            route: 仅对该路由（user / user-tweets / vxtwitter / fxtwitter）生效，None 表示任意路由
+        """
+        self._scheduled_faults.extend([(route, fault)] * count)
+
+    def reset_counters(self) -> None:
+        self.requests.clear()
+        self.faults.clear()
+
+    def _next_fault(self, route: str) -> Optional[str]:
+        if route in self.route_faults:
+            return self.route_faults[route]
+        for index, (fault_route, fault) in enumerate(self._scheduled_faults):
+            if fault_route is None or fault_route == route:
+                del self._scheduled_faults[index]
+                return fault
+
+        roll = self.random.random()
+        if roll < self.rate_limit_ratio:
+            return FAULT_RATE_LIMITED
+        if roll < self.rate_limit_ratio + self.malformed_ratio:
+            return self.random.choice(MALFORMED_FAULTS)
+        return None
+
+    async def _respond(self, route: str, body: bytes) -> web.Response:
+        self.requests[route] += 1
+        delay = self.latency + self.route_latency.get(route, 0)
+        if self.jitter:
+            delay += self.random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        fault = self._next_fault(route)
+        if fault:
+            self.faults[fault] += 1
+        if fault == FAULT_RATE_LIMITED:
+            return web.json_response({"message": "Too many requests"}, status=429,
+                                     headers={'Retry-After': str(self.retry_after)})
+        if fault == FAULT_SERVER_ERROR:
+            return web.json_response({"message": "Service Unavailable"}, status=503)
+        if fault == FAULT_EMPTY:
+            body = b''
+        elif fault == FAULT_TRUNCATED:
+            body = body[:len(body) // 2]
+        elif fault == FAULT_SHAPE:
+            body = _dumps(self.random.choice(MALFORMED_SHAPES[route]))
+        return web.Response(body=body, content_type='application/json')
+
+    async def _handle_user(self, request: web.Request) -> web.Response:
+        return await self._respond('user', self._user_body)
+
+    async def _handle_user_tweets(self, request: web.Request) -> web.Response:
+        cursor = request.query.get('cursor', '')
+        if not cursor.startswith('replay:'):
+            return await self._respond('user-tweets', self._timeline_body)
+
+        offset = int(cursor.split(':', 1)[1])
+        entries = self._history[offset:offset + self._page_size]
+        if offset + self._page_size < len(self._history):
+            entries = entries + [{
+                'entryId': f"cursor-bottom-{offset}",
+                'content': {'entryType': 'TimelineTimelineCursor', '__typename': 'TimelineTimelineCursor',
+                            'cursorType': 'Bottom', 'value': f"replay:{offset + self._page_size}"},
+            }]
+        page = {'result': {'timeline': {'instructions': [{'type': 'TimelineAddEntries', 'entries': entries}]}}}
+        return await self._respond('user-tweets', _dumps(page))
+
+    async def _handle_vxtwitter(self, request: web.Request) -> web.Response:
+        tweet_id = request.match_info['tweet_id']
+        screen_name = self.vxtwitter_status.get('user_screen_name', 'i')
+        data = dict(
+            self.vxtwitter_status,
+            tweetID=tweet_id,
+            conversationID=tweet_id,
+            tweetURL=f"https://twitter.com/{screen_name}/status/{tweet_id}"
+        )
+        return await self._respond('vxtwitter', _dumps(data))
+
+    async def _handle_fxtwitter(self, request: web.Request) -> web.Response:
+        tweet_id = request.match_info['tweet_id']
+        status = self.vxtwitter_status
+        screen_name = status.get('user_screen_name', 'i')
+        fx_types = {'image': 'photo', 'gif': 'gif', 'video': 'video'}
+        data = {
+            'code': 200,
+            'message': 'OK',
+            'tweet': {
+                'id': tweet_id,
+                'url': f"https://twitter.com/{screen_name}/status/{tweet_id}",
+                'text': status.get('text', ''),
+                'created_timestamp': status.get('date_epoch'),
+                'author': {'screen_name': screen_name, 'name': status.get('user_name')},
+                'media': {'all': [
+                    {'type': fx_types.get(m.get('type'), m.get('type')), 'url': m.get('url'),
+                     'thumbnail_url': m.get('thumbnail_url')}
+                    for m in status.get('media_extended') or []
+                ]},
+            },
+        }
+        return await self._respond('fxtwitter', _dumps(data))
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/user', self._handle_user)
+        app.router.add_get('/user-tweets', self._handle_user_tweets)
+        app.router.add_get(r'/Twitter/status/{tweet_id:\d+}', self._handle_vxtwitter)
+        app.router.add_get(r'/status/{tweet_id:\d+}', self._handle_fxtwitter)
+        return app
+
+    async def start(self) -> str:
+        """启动服务，返回服务地址"""
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://{self.host}:{port}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(args):
+    server = ReplayServer(args.host, args.port, args.latency, args.jitter,
+                          args.rate_limit, args.malformed, args.retry_after, args.seed)
+    base_url = await server.start()
+    print(f"回放服务已启动: {base_url}")
+    print(f"  RAPIDAPI_BASE_URL={base_url} VXTWITTER_API_BASE={base_url} FXTWITTER_API_BASE={base_url}")
+    try:
+        while True:
+            await asyncio.sleep(args.publish_interval or 3600)
+            if args.publish_interval:
+                print(f"发布新推文: {server.publish(1)}，累计请求: {dict(server.requests)}")
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='twitter241 / vxtwitter / fxtwitter 录制响应回放服务')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.0, help='每个响应的基础延迟（秒）')
+    parser.add_argument('--jitter', type=float, default=0.0, help='随机叠加的延迟上限（秒）')
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='返回 429 的概率')
+    parser.add_argument('--malformed', type=float, default=0.0, help='返回结构异常响应的概率')
+    parser.add_argument('--retry-after', type=int, default=1, help='429 响应的 Retry-After（秒）')
+    parser.add_argument('--publish-interval', type=float, default=0, help='每隔多少秒发布一条新推文（0 表示不发布）')
+    parser.add_argument('--seed', type=int, default=None, help='故障注入的随机数种子')
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -75,6 +75,9 @@ class Config:
     
     # Twitter (X) RapidAPI 配置
     RAPIDAPI_KEY = None
+    RAPIDAPI_MONTHLY_QUOTA = 100  # 每个计费周期允许的调用次数
+    RAPIDAPI_BILLING_DAY = 1  # 计费周期起始日（每月几号）
+    RAPIDAPI_BASE_URL = "https://twitter241.p.rapidapi.com"  # twitter241 接口地址（基准测试时可指向本地回放服务）
     
     # 兼容老的官方 Twitter 配置 (已废弃/非必填)
     TWITTER_BEARER_TOKEN = None
@@ -93,15 +96,72 @@ class Config:
     # 监控配置
     TWITTER_USERNAME = None  # 要监控的Twitter用户名
     CHECK_INTERVAL = 86400  # 检查间隔（秒），默认24小时
+    USER_ID_CACHE_TTL = 2592000  # 用户名 -> 用户ID 缓存有效期（秒），默认30天
+    TWITTER_ACCOUNTS = []  # 多账号监控列表 [{'username', 'interval', 'chat_id', 'forward'}]
+    TWITTER_MAX_CONCURRENCY = 3  # 同时抓取的账号数量上限
+    TWITTER_FETCH_BUDGET = 5  # 每轮检查最多抓取的账号数量（全局配额预算）
+    TWEET_BACKFILL_MAX_PAGES = 3  # 两次检查之间新推文超过一页时，最多向前翻几页补齐到高水位（每页消耗一次配额）
+    TWEET_SEND_INTERVAL = 1.0  # 连续转发推文之间的间隔（秒），避免发送过快
+    
+    # HTTP 连接池配置
+    HTTP_POOL_LIMIT = 20  # 连接池总连接数上限
+    HTTP_POOL_LIMIT_PER_HOST = 4  # 单主机连接数上限
+    HTTP_DNS_CACHE_TTL = 600  # DNS 缓存时间（秒）
+    HTTP_KEEPALIVE_TIMEOUT = 60  # 空闲连接保活时间（秒）
+    
+    # 单推文缓存配置
+    TWEET_CACHE_SIZE = 256  # 缓存的推文详情数量
+    TWEET_CACHE_TTL = 600  # 推文详情缓存有效期（秒）
+    
+    # 单推文查询接口配置
+    TWEET_PROVIDERS = ['vxtwitter', 'fxtwitter']  # 参与对冲查询的接口（可选 rapidapi，会消耗配额）
+    VXTWITTER_API_BASE = "https://api.vxtwitter.com"
+    FXTWITTER_API_BASE = "https://api.fxtwitter.com"
+    TWEET_HEDGE_DELAY = 1.5  # 接口尚无延迟样本时的对冲等待时间（秒）
+    TWEET_LOOKUP_TIMEOUT = 15  # 单推文查询整体超时（秒）
+    
+    # 重试与熔断配置
+    HTTP_MAX_RETRIES = 2  # 瞬时错误的最大重试次数
+    HTTP_BACKOFF_BASE = 2  # 指数退避基数（秒）
+    HTTP_BACKOFF_MAX = 30  # 单次退避最长等待（秒），Retry-After 超过该值时直接熔断
+    CIRCUIT_FAILURE_THRESHOLD = 3  # 连续失败多少次后熔断
+    CIRCUIT_RECOVERY_TIMEOUT = 1800  # 熔断后多久允许试探请求（秒）
     
     # 数据库配置
     DATABASE_PATH = None
+    PROCESSED_TWEET_CACHE_SIZE = 2000  # 内存中保留的已处理推文ID数量
+    DATABASE_MMAP_SIZE = 64 * 1024 * 1024  # SQLite 内存映射读取的大小（字节）
+    DATABASE_CACHE_SIZE_KB = 8192  # 每个连接的 SQLite 页缓存大小（KB）
+    DATABASE_BUSY_TIMEOUT = 5  # 等待其他连接释放写锁的超时（秒）
+    DATABASE_STATEMENT_CACHE_SIZE = 128  # 每个连接缓存的预编译语句数量
+    WRITE_BATCH_MAX_ROWS = 100  # 组提交：累计多少行写入后立即提交
+    WRITE_BATCH_MAX_DELAY_MS = 50  # 组提交：第一行写入排队后最多等待多久提交（毫秒）
+    WRITE_BATCH_MAX_RETRIES = 3  # 组提交：批次提交失败后的重试次数（仍失败时逐行提交）
+    RETENTION_INTERVAL = 86400  # 数据保留任务的运行间隔（秒）
+    RETENTION_CHUNK_SIZE = 500  # 数据保留任务每个事务删除的行数
+    RETENTION_VACUUM_PAGES = 256  # 每次增量回收的空闲页数
+    PROCESSED_TWEET_RETENTION_DAYS = 30  # 已处理推文记录保留天数（0 表示不清理）
+    API_USAGE_RETENTION_DAYS = 400  # RapidAPI 调用计数保留天数（0 表示不清理）
+    MEMBER_EVENT_RETENTION_DAYS = 365  # 成员进出群记录保留天数（0 表示不清理）
+    MEMBER_HISTORY_LIMIT = 20  # 管理员通知中显示的进出群记录条数
+    MEDIA_FILE_ID_CACHE_SIZE = 500  # 缓存的媒体 Telegram file_id 数量
+    TWEET_ALBUM_MODE = True  # 多图推文是否以相册（媒体组）形式发送
+    TWEET_ALBUM_MAX_ITEMS = 10  # 相册最多包含的媒体数量（Telegram 上限为 10）
+    TELEGRAM_VIDEO_MAX_BYTES = 20 * 1024 * 1024  # Telegram 通过链接拉取视频的大小上限（字节）
+    VIDEO_PROBE_TIMEOUT = 5  # 视频大小 HEAD 探测超时（秒）
+    VIDEO_PROBE_CACHE_SIZE = 512  # 缓存的视频大小条目数
+    TELEGRAM_UPLOAD_MAX_BYTES = 50 * 1024 * 1024  # 本地上传文件的大小上限（字节）
+    MEDIA_CACHE_DIR = 'media_cache'  # 本地媒体缓存目录
+    MEDIA_CACHE_MAX_BYTES = 500 * 1024 * 1024  # 本地媒体缓存总大小上限（字节）
     
     @classmethod
     def _init_configs(cls):
         """初始化配置（在类加载后调用）"""
         # Twitter (X) API 配置
         cls.RAPIDAPI_KEY = cls.get_config('RAPIDAPI_KEY')
+        cls.RAPIDAPI_MONTHLY_QUOTA = max(cls.get_int_config('RAPIDAPI_MONTHLY_QUOTA', 100), 1)
+        cls.RAPIDAPI_BILLING_DAY = cls.get_int_config('RAPIDAPI_BILLING_DAY', 1)
+        cls.RAPIDAPI_BASE_URL = cls.get_config('RAPIDAPI_BASE_URL', "https://twitter241.p.rapidapi.com").rstrip('/')
         cls.TWITTER_BEARER_TOKEN = cls.get_config('TWITTER_BEARER_TOKEN')
         cls.TWITTER_API_KEY = cls.get_config('TWITTER_API_KEY')
         cls.TWITTER_API_SECRET = cls.get_config('TWITTER_API_SECRET')
@@ -124,17 +184,130 @@ class Config:
             except ValueError:
                 continue
         
-        # 监控配置
-        cls.TWITTER_USERNAME = cls.get_config('TWITTER_USERNAME', required=True)  # 要监控的Twitter用户名
+        # 监控配置（配置了 TWITTER_ACCOUNTS 时主账号默认取列表中的第一个）
+        cls.TWITTER_USERNAME = cls.get_config('TWITTER_USERNAME')  # 要监控的Twitter用户名
         cls.CHECK_INTERVAL = cls.get_int_config('CHECK_INTERVAL', 86400)  # 检查间隔（秒），默认24小时
+        cls.USER_ID_CACHE_TTL = cls.get_int_config('USER_ID_CACHE_TTL', 2592000)  # 用户ID缓存有效期（秒）
+        cls.TWITTER_ACCOUNTS = cls._parse_twitter_accounts(cls.get_config('TWITTER_ACCOUNTS', ''))
+        if not cls.TWITTER_USERNAME and cls.TWITTER_ACCOUNTS:
+            cls.TWITTER_USERNAME = cls.TWITTER_ACCOUNTS[0]['username']
+        cls.TWITTER_MAX_CONCURRENCY = max(cls.get_int_config('TWITTER_MAX_CONCURRENCY', 3), 1)
+        cls.TWITTER_FETCH_BUDGET = max(cls.get_int_config('TWITTER_FETCH_BUDGET', 5), 1)
+        cls.TWEET_BACKFILL_MAX_PAGES = max(cls.get_int_config('TWEET_BACKFILL_MAX_PAGES', 3), 1)
+        try:
+            cls.TWEET_SEND_INTERVAL = max(float(cls.get_config('TWEET_SEND_INTERVAL', '1')), 0.0)
+        except ValueError:
+            cls.TWEET_SEND_INTERVAL = 1.0
         
         # 允许发送链接的用户名列表
         allowed_str = cls.get_config('ALLOWED_USERNAMES', 'mteacherlu,bryansuperb')
         cls.ALLOWED_USERNAMES = [u.strip().lower() for u in allowed_str.split(',') if u.strip()]
         
+        # HTTP 连接池配置
+        cls.HTTP_POOL_LIMIT = cls.get_int_config('HTTP_POOL_LIMIT', 20)
+        cls.HTTP_POOL_LIMIT_PER_HOST = cls.get_int_config('HTTP_POOL_LIMIT_PER_HOST', 4)
+        cls.HTTP_DNS_CACHE_TTL = cls.get_int_config('HTTP_DNS_CACHE_TTL', 600)
+        cls.HTTP_KEEPALIVE_TIMEOUT = cls.get_int_config('HTTP_KEEPALIVE_TIMEOUT', 60)
+        
+        # 单推文缓存配置
+        cls.TWEET_CACHE_SIZE = max(cls.get_int_config('TWEET_CACHE_SIZE', 256), 1)
+        cls.TWEET_CACHE_TTL = cls.get_int_config('TWEET_CACHE_TTL', 600)
+        
+        # 单推文查询接口配置
+        providers_str = cls.get_config('TWEET_PROVIDERS', 'vxtwitter,fxtwitter')
+        cls.TWEET_PROVIDERS = [p.strip().lower() for p in providers_str.split(',') if p.strip()]
+        cls.VXTWITTER_API_BASE = cls.get_config('VXTWITTER_API_BASE', "https://api.vxtwitter.com")
+        cls.FXTWITTER_API_BASE = cls.get_config('FXTWITTER_API_BASE', "https://api.fxtwitter.com")
+        try:
+            cls.TWEET_HEDGE_DELAY = float(cls.get_config('TWEET_HEDGE_DELAY', '1.5'))
+        except ValueError:
+            cls.TWEET_HEDGE_DELAY = 1.5
+        cls.TWEET_LOOKUP_TIMEOUT = max(cls.get_int_config('TWEET_LOOKUP_TIMEOUT', 15), 1)
+        
+        # 重试与熔断配置
+        cls.HTTP_MAX_RETRIES = max(cls.get_int_config('HTTP_MAX_RETRIES', 2), 0)
+        cls.HTTP_BACKOFF_BASE = cls.get_int_config('HTTP_BACKOFF_BASE', 2)
+        cls.HTTP_BACKOFF_MAX = cls.get_int_config('HTTP_BACKOFF_MAX', 30)
+        cls.CIRCUIT_FAILURE_THRESHOLD = max(cls.get_int_config('CIRCUIT_FAILURE_THRESHOLD', 3), 1)
+        cls.CIRCUIT_RECOVERY_TIMEOUT = cls.get_int_config('CIRCUIT_RECOVERY_TIMEOUT', 1800)
+        
         # 数据库配置 - 融合两个版本的实现
         cls.DATABASE_PATH = cls.get_config('DATABASE_PATH', 'tweets.db')
+        cls.PROCESSED_TWEET_CACHE_SIZE = cls.get_int_config('PROCESSED_TWEET_CACHE_SIZE', 2000)
+        cls.DATABASE_MMAP_SIZE = max(cls.get_int_config('DATABASE_MMAP_SIZE', 64 * 1024 * 1024), 0)
+        cls.DATABASE_CACHE_SIZE_KB = max(cls.get_int_config('DATABASE_CACHE_SIZE_KB', 8192), 64)
+        cls.DATABASE_BUSY_TIMEOUT = max(cls.get_int_config('DATABASE_BUSY_TIMEOUT', 5), 1)
+        cls.DATABASE_STATEMENT_CACHE_SIZE = max(cls.get_int_config('DATABASE_STATEMENT_CACHE_SIZE', 128), 0)
+        cls.WRITE_BATCH_MAX_ROWS = max(cls.get_int_config('WRITE_BATCH_MAX_ROWS', 100), 1)
+        cls.WRITE_BATCH_MAX_DELAY_MS = max(cls.get_int_config('WRITE_BATCH_MAX_DELAY_MS', 50), 0)
+        cls.WRITE_BATCH_MAX_RETRIES = max(cls.get_int_config('WRITE_BATCH_MAX_RETRIES', 3), 0)
+        cls.RETENTION_INTERVAL = max(cls.get_int_config('RETENTION_INTERVAL', 86400), 60)
+        cls.RETENTION_CHUNK_SIZE = max(cls.get_int_config('RETENTION_CHUNK_SIZE', 500), 1)
+        cls.RETENTION_VACUUM_PAGES = max(cls.get_int_config('RETENTION_VACUUM_PAGES', 256), 1)
+        cls.PROCESSED_TWEET_RETENTION_DAYS = max(cls.get_int_config('PROCESSED_TWEET_RETENTION_DAYS', 30), 0)
+        cls.API_USAGE_RETENTION_DAYS = max(cls.get_int_config('API_USAGE_RETENTION_DAYS', 400), 0)
+        cls.MEMBER_EVENT_RETENTION_DAYS = max(cls.get_int_config('MEMBER_EVENT_RETENTION_DAYS', 365), 0)
+        cls.MEMBER_HISTORY_LIMIT = max(cls.get_int_config('MEMBER_HISTORY_LIMIT', 20), 1)
+        cls.MEDIA_FILE_ID_CACHE_SIZE = max(cls.get_int_config('MEDIA_FILE_ID_CACHE_SIZE', 500), 1)
+        cls.TWEET_ALBUM_MODE = cls.get_bool_config('TWEET_ALBUM_MODE', True)
+        cls.TWEET_ALBUM_MAX_ITEMS = min(max(cls.get_int_config('TWEET_ALBUM_MAX_ITEMS', 10), 1), 10)
+        cls.TELEGRAM_VIDEO_MAX_BYTES = cls.get_int_config('TELEGRAM_VIDEO_MAX_BYTES', 20 * 1024 * 1024)
+        cls.VIDEO_PROBE_TIMEOUT = cls.get_int_config('VIDEO_PROBE_TIMEOUT', 5)
+        cls.VIDEO_PROBE_CACHE_SIZE = cls.get_int_config('VIDEO_PROBE_CACHE_SIZE', 512)
+        cls.TELEGRAM_UPLOAD_MAX_BYTES = cls.get_int_config('TELEGRAM_UPLOAD_MAX_BYTES', 50 * 1024 * 1024)
+        cls.MEDIA_CACHE_DIR = cls.get_config('MEDIA_CACHE_DIR', 'media_cache')
+        cls.MEDIA_CACHE_MAX_BYTES = cls.get_int_config('MEDIA_CACHE_MAX_BYTES', 500 * 1024 * 1024)
     
+    @classmethod
+    def _parse_twitter_accounts(cls, accounts_str: str) -> list:
+        """
+        解析多账号监控配置
+
+        格式: 用户名[:间隔秒数[:目标Chat ID[:on|off]]]，多个账号用英文逗号分隔，
+        例如 "user_a:28800:-100123:on,user_b::-100456:off"。
+        未填写的字段分别使用 CHECK_INTERVAL、TELEGRAM_CHAT_ID 和开启转发作为默认值。
+        未配置 TWITTER_ACCOUNTS 时回退为单账号 TWITTER_USERNAME。
+
+        Returns:
+            账号配置字典列表
+        """
+        accounts = []
+        seen = set()
+        for raw_account in (accounts_str or '').split(','):
+            parts = [part.strip() for part in raw_account.strip().split(':')]
+            username = parts[0].lstrip('@') if parts else ''
+            if not username or username.lower() in seen:
+                continue
+            seen.add(username.lower())
+
+            interval = None
+            if len(parts) > 1 and parts[1]:
+                try:
+                    interval = int(parts[1])
+                except ValueError:
+                    interval = None
+
+            chat_id = parts[2] if len(parts) > 2 and parts[2] else cls.TELEGRAM_CHAT_ID
+            forward = True
+            if len(parts) > 3 and parts[3]:
+                forward = parts[3].lower() in ('true', '1', 'yes', 'on', 'enabled')
+
+            accounts.append({
+                'username': username,
+                'interval': interval,
+                'chat_id': chat_id,
+                'forward': forward
+            })
+
+        if not accounts and cls.TWITTER_USERNAME:
+            accounts.append({
+                'username': cls.TWITTER_USERNAME.lstrip('@'),
+                'interval': None,
+                'chat_id': cls.TELEGRAM_CHAT_ID,
+                'forward': True
+            })
+        return accounts
+
     @classmethod
     def require_telegram(cls, require_chat_id=False, require_admin=False):
         """
@@ -178,9 +351,11 @@ class Config:
         required_configs = [
             'RAPIDAPI_KEY',
             'TELEGRAM_BOT_TOKEN', 
-            'TELEGRAM_CHAT_ID',
-            'TWITTER_USERNAME'
+            'TELEGRAM_CHAT_ID'
         ]
+        # 多账号配置可替代单账号 TWITTER_USERNAME
+        if not cls.get_config('TWITTER_ACCOUNTS'):
+            required_configs.append('TWITTER_USERNAME')
         
         missing_configs = []
         for config in required_configs:
@@ -1,22 +1,296 @@
 import sqlite3
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# 只转换 ASCII 字母的小写映射（与 SQLite NOCASE 排序规则一致）
+ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+# member_events 中的事件类型编码
+MEMBER_EVENT_JOIN = 1
+MEMBER_EVENT_LEAVE = 2
+
+
+class WriteBehindBuffer:
+    """
+    写后缓冲（组提交）：在短时间窗口内或累计到指定行数时，把排队的写入合并为一个事务提交
+
+    写入由后台线程提交，调用方需要确认落盘时调用 flush() 作为屏障（可只等待指定类别的写入）。
+    提交失败的批次按退避重试有限次，仍失败时逐行提交，最终失败的行交给 on_failed 回调。
+    """
+
+    def __init__(self, commit_func, max_rows=None, max_delay=None, max_retries=None, on_failed=None):
+        """
+        初始化写后缓冲
+
+        Args:
+            commit_func: 在一个事务内写入一批 (类别, 行) 的函数
+            max_rows: 累计到该行数时立即提交
+            max_delay: 第一行入队后最多等待的时间（秒）
+            max_retries: 批次提交失败后的重试次数
+            on_failed: 逐行提交后仍失败的行的回调 (类别, 行)
+        """
+        self.commit_func = commit_func
+        self.max_rows = max_rows or Config.WRITE_BATCH_MAX_ROWS
+        self.max_delay = Config.WRITE_BATCH_MAX_DELAY_MS / 1000 if max_delay is None else max_delay
+        self.max_retries = Config.WRITE_BATCH_MAX_RETRIES if max_retries is None else max_retries
+        self.on_failed = on_failed
+        self._pending = []
+        self._first_queued_at = None
+        self._seq = 0  # 已入队的行数（序号）
+        self._kind_seq = {}  # 类别 -> 该类别最后入队的行序号
+        self._committed_seq = 0  # 已处理（提交或失败）的行序号
+        self._flush_requested = False
+        self._stopping = False
+        self._running = False
+        self._failed_rows = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        # 统计
+        self.batches = 0
+        self.rows = 0
+        self.max_batch = 0
+        self.failures = 0
+        self.retries = 0
+        self.commit_seconds = 0.0
+        self.max_commit_seconds = 0.0
+
+    def add(self, kind, row):
+        """排队一行写入，返回其序号"""
+        with self._cond:
+            if not self._running:
+                self._running = True
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name='telelux-db-writer', daemon=True)
+                self._thread.start()
+            if not self._pending:
+                self._first_queued_at = time.monotonic()
+            self._pending.append((kind, row))
+            self._seq += 1
+            self._kind_seq[kind] = self._seq
+            if len(self._pending) >= self.max_rows:
+                self._cond.notify_all()
+            return self._seq
+
+    def flush(self, timeout=None, kinds=None):
+        """
+        屏障：等待调用前排队的写入全部提交
+
+        Args:
+            timeout: 最长等待时间（秒）
+            kinds: 只等待这些类别的写入（None 表示全部类别）；没有排队中的相关写入时立即返回
+
+        Returns:
+            这些写入是否全部成功（超时或提交失败时为 False）
+        """
+        with self._cond:
+            if kinds is None:
+                target = self._seq
+            else:
+                target = max((self._kind_seq.get(kind, 0) for kind in kinds), default=0)
+            if self._committed_seq >= target:
+                return True
+            failed_before = self._failed_rows
+            self._flush_requested = True
+            self._cond.notify_all()
+            done = self._cond.wait_for(lambda: self._committed_seq >= target, timeout)
+            return done and self._failed_rows == failed_before
+
+    def close(self, timeout=None):
+        """提交剩余写入并停止后台线程（之后再次排队会重新启动线程）"""
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending:
+                    self._running = False
+                    return
+                # 等待窗口结束、行数达到上限或收到 flush 请求
+                deadline = self._first_queued_at + self.max_delay
+                while (len(self._pending) < self.max_rows and not self._flush_requested
+                       and not self._stopping and time.monotonic() < deadline):
+                    self._cond.wait(deadline - time.monotonic())
+                batch, self._pending = self._pending, []
+                last_seq = self._seq
+                self._flush_requested = False
+
+            started = time.monotonic()
+            failed = self._commit(batch)
+            elapsed = time.monotonic() - started
+            if failed and self.on_failed:
+                for kind, row in failed:
+                    try:
+                        self.on_failed(kind, row)
+                    except Exception as e:
+                        logger.error(f"处理写入失败的 {kind} 行时出错: {e}")
+
+            with self._cond:
+                self.batches += 1
+                self.rows += len(batch) - len(failed)
+                if failed:
+                    self.failures += 1
+                    self._failed_rows += len(failed)
+                else:
+                    self.max_batch = max(self.max_batch, len(batch))
+                self.commit_seconds += elapsed
+                self.max_commit_seconds = max(self.max_commit_seconds, elapsed)
+                self._committed_seq = last_seq
+                self._cond.notify_all()
+
+    def _commit(self, batch):
+        """
+        提交一批写入：失败时按退避重试 max_retries 次，仍失败则逐行提交，使个别坏行不会连累整批
+
+        Returns:
+            最终写入失败的 (类别, 行) 列表
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.commit_func(batch)
+                return []
+            except Exception as e:
+                logger.warning(f"批量写入 {len(batch)} 行失败（第 {attempt + 1} 次）: {e}")
+            if attempt < self.max_retries:
+                with self._cond:
+                    self.retries += 1
+                time.sleep(min(0.05 * 2 ** attempt, 1.0))
+
+        failed = []
+        for item in batch:
+            try:
+                self.commit_func([item])
+            except Exception as e:
+                logger.error(f"写入 {item[0]} 行失败，已放弃: {e}")
+                failed.append(item)
+        if len(batch) > 1:
+            logger.warning(f"批量写入改为逐行提交: {len(batch) - len(failed)} 行成功，{len(failed)} 行失败")
+        return failed
+
+    def get_stats(self):
+        """获取批量提交统计"""
+        with self._cond:
+            return {
+                'batches': self.batches,
+                'rows': self.rows,
+                'pending': len(self._pending),
+                'avg_batch': self.rows / self.batches if self.batches else 0,
+                'max_batch': self.max_batch,
+                'failures': self.failures,
+                'retries': self.retries,
+                'failed_rows': self._failed_rows,
+                'avg_commit_ms': self.commit_seconds / self.batches * 1000 if self.batches else 0,
+                'max_commit_ms': self.max_commit_seconds * 1000,
+            }
+
+
 class Database:
     """数据库操作类"""
+
+    # 数据保留策略：表 -> (键集分页的键列（首列为时间列）, 保留天数配置项, 截止值的时间格式)
+    RETENTION_POLICIES = {
+        'processed_tweets': (('processed_at', 'id'), 'PROCESSED_TWEET_RETENTION_DAYS', '%Y-%m-%d %H:%M:%S'),
+        'api_usage': (('period', 'endpoint'), 'API_USAGE_RETENTION_DAYS', '%Y-%m-%d'),
+        'member_events': (('ts', 'id'), 'MEMBER_EVENT_RETENTION_DAYS', None),  # ts 为 Unix 秒
+    }
     
     def __init__(self, db_path=None):
         self.db_path = db_path or Config.DATABASE_PATH
+        # 每个线程持有一个长连接（主线程与 run_in_thread 的工作线程各自复用），close() 时统一关闭
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._generation = 0  # close() 后递增，使各线程缓存的旧连接失效
+        # 已处理推文ID的有界内存集合（按插入顺序淘汰最旧条目）
+        self.processed_cache_size = Config.PROCESSED_TWEET_CACHE_SIZE
+        self._processed_ids = OrderedDict()
+        # 黑名单用户ID的完整内存集合：启动时完整加载（加载失败则启动失败），之后增删时同步更新，
+        # 黑名单查询只查该集合，可以在事件循环中直接调用（见 AsyncDatabase.NON_BLOCKING）
+        self._blacklisted_ids = set()
+        # 两个内存集合会被事件循环（queue_* 与黑名单查询）、数据库线程与组提交的写入线程同时访问，读写都需持有此锁
+        self._cache_lock = threading.Lock()
+        # 已处理推文、黑名单、成员进出群事件与 API 调用计数的写后缓冲（组提交）
+        self.write_buffer = WriteBehindBuffer(self._commit_write_batch, on_failed=self._on_write_failed)
         self.init_database()
+        self.warm_processed_cache()
+        self.load_blacklist_cache()
     
+    def _open_connection(self):
+        """打开新连接并设置 WAL 与性能相关的 PRAGMA"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=Config.DATABASE_BUSY_TIMEOUT,
+            check_same_thread=False,  # 只在所属线程内使用，但允许 close() 从其他线程关闭
+            cached_statements=Config.DATABASE_STATEMENT_CACHE_SIZE
+        )
+        # 新数据库文件必须在写入文件头（切换 WAL）之前设置 auto_vacuum；已有数据库见 migrate_auto_vacuum.py
+        conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA mmap_size={int(Config.DATABASE_MMAP_SIZE)}')
+        conn.execute(f'PRAGMA cache_size=-{int(Config.DATABASE_CACHE_SIZE_KB)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+
+    def _connect(self):
+        """
+        获取当前线程的长连接（不存在或已被 close() 失效时新建）
+
+        返回的连接可直接用作上下文管理器：正常退出时提交，异常时回滚，但不会关闭连接。
+        """
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is not None and local.generation == self._generation:
+            return conn
+
+        conn = self._open_connection()
+        with self._connections_lock:
+            self._connections.append(conn)
+            local.conn = conn
+            local.generation = self._generation
+        return conn
+
+    def close(self):
+        """提交缓冲中的写入并关闭所有线程的长连接（关闭前执行 PRAGMA optimize），之后的调用会重新建立连接"""
+        self.write_buffer.close()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+
+        for index, conn in enumerate(connections):
+            try:
+                if index == len(connections) - 1:
+                    conn.execute('PRAGMA optimize')
+                conn.close()
+            except Exception as e:
+                logger.error(f"关闭数据库连接失败: {e}")
+        if connections:
+            logger.info(f"已关闭 {len(connections)} 个数据库连接")
+
     def init_database(self):
         """初始化数据库表"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
+                # 增量 auto_vacuum 使数据保留任务删除旧数据后可逐步归还空间；旧数据库切换模式需要一次完整 VACUUM，
+                # 耗时长且独占数据库，不在启动时执行，由 migrate_auto_vacuum.py 在机器人停止时完成
+                if not self.is_incremental_auto_vacuum():
+                    logger.warning("数据库未启用增量 auto_vacuum，清理旧数据后不会归还磁盘空间；"
+                                   "请在机器人停止时运行一次 python migrate_auto_vacuum.py")
+
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS processed_tweets (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -43,44 +317,350 @@ class Database:
                     )
                 ''')
                 
+                # 创建每个监控账号的推文高水位表（已处理的最大推文ID）
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS tweet_watermarks (
+                        username TEXT PRIMARY KEY,
+                        last_tweet_id INTEGER NOT NULL DEFAULT 0,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                
+                # 创建 RapidAPI 调用计数表（按计费周期和接口统计）
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS api_usage (
+                        period TEXT NOT NULL,
+                        endpoint TEXT NOT NULL,
+                        calls INTEGER NOT NULL DEFAULT 0,
+                        last_call_at INTEGER,
+                        PRIMARY KEY (period, endpoint)
+                    )
+                ''')
+                
+                # 创建媒体链接 -> Telegram file_id 缓存表
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS media_file_ids (
+                        media_url TEXT PRIMARY KEY,
+                        file_id TEXT NOT NULL,
+                        media_type TEXT NOT NULL DEFAULT 'photo',
+                        hits INTEGER NOT NULL DEFAULT 0,
+                        last_used_at REAL NOT NULL
+                    )
+                ''')
+                
+                # 创建用户名 -> rest_id 解析缓存表
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS twitter_user_ids (
+                        username TEXT PRIMARY KEY,
+                        rest_id TEXT NOT NULL,
+                        resolved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
+                # 创建成员进出群事件表（只追加；时间为 Unix 秒，事件类型为整数编码，同一秒内的多次进出都会保留）
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS member_events (
+                        id INTEGER PRIMARY KEY,
+                        user_id INTEGER NOT NULL,
+                        ts INTEGER NOT NULL,
+                        event INTEGER NOT NULL
+                    )
+                ''')
+
+                # 二级索引：清理旧记录按 processed_at、黑名单分页按 (added_at, user_id)、file_id 缓存淘汰按 last_used_at；
+                # (username, tweet_id) 覆盖高水位回退查询，按账号探测推文ID时无需回表
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_processed_tweets_processed_at
+                    ON processed_tweets (processed_at)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_processed_tweets_username_tweet_id
+                    ON processed_tweets (username COLLATE NOCASE, tweet_id)
+                ''')
+                cursor.execute('DROP INDEX IF EXISTS idx_blacklist_added_at')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_blacklist_added_at_user_id
+                    ON blacklist (added_at, user_id)
+                ''')
+                # 按原因/用户名前缀过滤的黑名单分页：前缀改写为索引范围，按 (过滤列, added_at, user_id) 键集分页
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_blacklist_reason_added_at
+                    ON blacklist (reason, added_at, user_id)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_blacklist_username_added_at
+                    ON blacklist (username COLLATE NOCASE, added_at, user_id)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_media_file_ids_last_used_at
+                    ON media_file_ids (last_used_at)
+                ''')
+                # (user_id, ts) 供按用户读取计数与最近记录，ts 供数据保留任务清理
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_member_events_user_ts
+                    ON member_events (user_id, ts)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_member_events_ts
+                    ON member_events (ts)
+                ''')
+
                 conn.commit()
                 logger.info("数据库初始化成功")
         except Exception as e:
             logger.error(f"数据库初始化失败: {e}")
             raise
     
+    def _remember_processed(self, tweet_id):
+        """将推文ID记入内存集合，超出容量时淘汰最旧的条目"""
+        tweet_id = str(tweet_id)
+        with self._cache_lock:
+            self._processed_ids[tweet_id] = None
+            self._processed_ids.move_to_end(tweet_id)
+            while len(self._processed_ids) > self.processed_cache_size:
+                self._processed_ids.popitem(last=False)
+    
+    def warm_processed_cache(self, limit=None):
+        """从最近的 processed_tweets 记录预热内存集合"""
+        limit = limit or self.processed_cache_size
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT tweet_id FROM processed_tweets
+                    ORDER BY id DESC LIMIT ?
+                ''', (limit,))
+                rows = cursor.fetchall()
+            # 倒序插入，使最新的记录位于淘汰队列末尾
+            for (tweet_id,) in reversed(rows):
+                self._remember_processed(tweet_id)
+            logger.info(f"已预热 {len(rows)} 条已处理推文ID")
+        except Exception as e:
+            logger.error(f"预热已处理推文缓存失败: {e}")
+    
+    def load_blacklist_cache(self):
+        """把黑名单用户ID全部加载到内存集合（失败时抛出异常，保留原有集合）"""
+        self.write_buffer.flush(kinds=('blacklist',))
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT user_id FROM blacklist')
+                blacklisted_ids = {row[0] for row in cursor.fetchall()}
+            with self._cache_lock:
+                self._blacklisted_ids = blacklisted_ids
+            logger.info(f"已加载 {len(blacklisted_ids)} 个黑名单用户ID")
+        except Exception as e:
+            logger.error(f"加载黑名单缓存失败: {e}")
+            raise
+
+    def _add_blacklisted(self, user_id):
+        with self._cache_lock:
+            self._blacklisted_ids.add(user_id)
+
+    def _discard_blacklisted(self, user_id):
+        with self._cache_lock:
+            self._blacklisted_ids.discard(user_id)
+
     def is_tweet_processed(self, tweet_id):
         """检查推文是否已经处理过"""
+        with self._cache_lock:
+            if str(tweet_id) in self._processed_ids:
+                return True
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute('SELECT 1 FROM processed_tweets WHERE tweet_id = ?', (tweet_id,))
-                return cursor.fetchone() is not None
+                cursor.execute('SELECT 1 FROM processed_tweets WHERE tweet_id = ?', (str(tweet_id),))
+                processed = cursor.fetchone() is not None
+            if processed:
+                self._remember_processed(tweet_id)
+            return processed
         except Exception as e:
             logger.error(f"检查推文状态失败: {e}")
             return False
     
-    def mark_tweet_processed(self, tweet_id, username, tweet_url, tweet_text, created_at):
-        """标记推文为已处理"""
+    def filter_unprocessed(self, tweet_ids):
+        """
+        批量过滤出尚未处理的推文ID
+
+        先查询内存集合，只有未命中的ID才通过一次 IN (...) 查询确认。
+
+        Args:
+            tweet_ids: 推文ID列表
+
+        Returns:
+            未处理的推文ID列表（保持输入顺序）
+        """
+        tweet_ids = [str(tweet_id) for tweet_id in tweet_ids]
+        with self._cache_lock:
+            candidates = [tweet_id for tweet_id in tweet_ids if tweet_id not in self._processed_ids]
+        if not candidates:
+            return []
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR IGNORE INTO processed_tweets 
-                    (tweet_id, username, tweet_url, tweet_text, created_at)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (tweet_id, username, tweet_url, tweet_text, created_at))
+                placeholders = ','.join('?' * len(candidates))
+                cursor.execute(
+                    f'SELECT tweet_id FROM processed_tweets WHERE tweet_id IN ({placeholders})',
+                    candidates
+                )
+                found = {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"批量检查推文状态失败: {e}")
+            return candidates
+
+        for tweet_id in found:
+            self._remember_processed(tweet_id)
+        return [tweet_id for tweet_id in candidates if tweet_id not in found]
+    
+    def mark_tweet_processed(self, tweet_id, username, tweet_url, tweet_text, created_at):
+        """标记推文为已处理，并在同一事务内推进该账号的高水位"""
+        if not self.mark_tweets_processed([(tweet_id, username, tweet_url, tweet_text, created_at)]):
+            return False
+        logger.info(f"推文 {tweet_id} 标记为已处理")
+        return True
+
+    def mark_tweets_processed(self, tweets):
+        """
+        在同一事务内批量标记推文为已处理，并推进各账号的高水位
+
+        Args:
+            tweets: (tweet_id, username, tweet_url, tweet_text, created_at) 列表
+
+        Returns:
+            是否成功
+        """
+        tweets = [(str(tweet_id), username, tweet_url, tweet_text, created_at)
+                  for tweet_id, username, tweet_url, tweet_text, created_at in tweets]
+        if not tweets:
+            return True
+        try:
+            with self._connect() as conn:
+                self._write_processed_tweets(conn.cursor(), tweets)
                 conn.commit()
-                logger.info(f"推文 {tweet_id} 标记为已处理")
-                return True
+            for tweet in tweets:
+                self._remember_processed(tweet[0])
+            return True
         except Exception as e:
             logger.error(f"标记推文失败: {e}")
             return False
+
+    @staticmethod
+    def _write_processed_tweets(cursor, tweets):
+        """写入已处理推文并推进高水位（不提交）"""
+        cursor.executemany('''
+            INSERT OR IGNORE INTO processed_tweets
+            (tweet_id, username, tweet_url, tweet_text, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', tweets)
+        cursor.executemany('''
+            INSERT INTO tweet_watermarks (username, last_tweet_id, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(username) DO UPDATE SET
+                last_tweet_id = MAX(last_tweet_id, excluded.last_tweet_id),
+                updated_at = CURRENT_TIMESTAMP
+        ''', [(username.lower(), int(tweet_id)) for tweet_id, username, _, _, _ in tweets if tweet_id.isdigit()])
+
+    @staticmethod
+    def _write_blacklist(cursor, entries):
+        """写入黑名单条目（不提交）"""
+        cursor.executemany('''
+            INSERT OR REPLACE INTO blacklist
+            (user_id, user_name, username, reason, leave_count, added_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', entries)
+
+    @staticmethod
+    def _write_member_events(cursor, events):
+        """写入成员进出群事件（不提交）"""
+        cursor.executemany('INSERT INTO member_events (user_id, ts, event) VALUES (?, ?, ?)', events)
+
+    @staticmethod
+    def _write_api_calls(cursor, calls):
+        """累加 API 调用计数（不提交）"""
+        cursor.executemany('''
+            INSERT INTO api_usage (period, endpoint, calls, last_call_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(period, endpoint) DO UPDATE SET
+                calls = calls + excluded.calls,
+                last_call_at = MAX(COALESCE(last_call_at, 0), excluded.last_call_at)
+        ''', calls)
+
+    def _commit_write_batch(self, batch):
+        """在一个事务内写入写后缓冲中的一批 (类别, 行)，由缓冲的后台线程调用"""
+        writers = {
+            'blacklist': self._write_blacklist,
+            'member_event': self._write_member_events,
+            'api_call': self._write_api_calls,
+        }
+        rows_by_kind = {}
+        for kind, row in batch:
+            rows_by_kind.setdefault(kind, []).append(row)
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            for kind, rows in rows_by_kind.items():
+                writers[kind](cursor, rows)
+            conn.commit()
+
+    def _on_write_failed(self, kind, row):
+        """组提交最终失败的行：撤销内存集合中已提前生效的条目，使其与数据库保持一致"""
+        if kind == 'blacklist':
+            self._discard_blacklisted(row[0])
+
+    def queue_blacklist_add(self, user_id, user_name, username, leave_count, reason="多次离群"):
+        """把用户排队加入黑名单（组提交，不等待落盘；内存集合立即生效）"""
+        self._add_blacklisted(user_id)
+        self.write_buffer.add('blacklist', (user_id, user_name, username, reason, leave_count))
+        logger.info(f"用户 {user_name} (ID: {user_id}) 已排队加入黑名单")
+
+    def queue_member_event(self, user_id, event, ts=None):
+        """
+        把成员进出群事件排队写入（组提交，不等待落盘）
+
+        Args:
+            user_id: Telegram 用户ID
+            event: MEMBER_EVENT_JOIN / MEMBER_EVENT_LEAVE
+            ts: 事件时间（Unix 秒，默认当前时间）
+        """
+        self.write_buffer.add('member_event', (user_id, int(time.time() if ts is None else ts), event))
+
+    def queue_api_call(self, period, endpoint, called_at, cost=1):
+        """把 API 调用计数排队累加（组提交，不等待落盘）"""
+        self.write_buffer.add('api_call', (period, endpoint, cost, int(called_at)))
+
+    def flush_writes(self, timeout=None):
+        """屏障：等待已排队的写入全部提交，返回是否全部成功"""
+        return self.write_buffer.flush(timeout)
+
+    def get_write_stats(self):
+        """获取组提交统计（批次数、平均/最大批量、提交耗时）"""
+        return self.write_buffer.get_stats()
+
+    def get_tweet_watermark(self, username):
+        """获取监控账号已处理的最大推文ID（高水位），不存在时返回 0"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT last_tweet_id FROM tweet_watermarks WHERE username = ?',
+                               (username.lower(),))
+                row = cursor.fetchone()
+                if row:
+                    return int(row[0])
+                # 兼容旧数据：高水位表为空时从已处理推文中推导
+                cursor.execute('''
+                    SELECT MAX(CAST(tweet_id AS INTEGER)) FROM processed_tweets
+                    WHERE username = ? COLLATE NOCASE
+                ''', (username,))
+                row = cursor.fetchone()
+                return int(row[0]) if row and row[0] else 0
+        except Exception as e:
+            logger.error(f"获取推文高水位失败: {e}")
+            return 0
     
     def get_processed_tweets_count(self):
         """获取已处理的推文数量"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT COUNT(*) FROM processed_tweets')
                 return cursor.fetchone()[0]
@@ -89,54 +669,180 @@ class Database:
             return 0
     
     def cleanup_old_records(self, days=30):
-        """清理旧记录"""
+        """清理旧记录（分批删除，每批单独提交）"""
+        cutoff = self.retention_cutoff('processed_tweets', days)
+        if cutoff is None:
+            return 0
+        deleted_count, after = 0, None
+        while True:
+            deleted, after = self.delete_expired_rows('processed_tweets', cutoff, after)
+            deleted_count += deleted
+            if after is None:
+                break
+        logger.info(f"清理了 {deleted_count} 条旧记录")
+        return deleted_count
+
+    def retention_cutoff(self, table, days=None, now=None):
+        """
+        计算表的保留截止值（早于该值的行视为过期）
+
+        Args:
+            table: RETENTION_POLICIES 中的表名
+            days: 保留天数（默认取策略对应的配置项）
+            now: 当前时间戳（默认 time.time()）
+
+        Returns:
+            截止值（时间字符串，或时间列为 Unix 秒时的整数），保留天数为 0（不清理）时返回 None
+        """
+        _, days_config, time_format = self.RETENTION_POLICIES[table]
+        days = getattr(Config, days_config) if days is None else days
+        if days <= 0:
+            return None
+        now = time.time() if now is None else now
+        if time_format is None:
+            return int(now - days * 86400)
+        return time.strftime(time_format, time.gmtime(now - days * 86400))
+
+    def delete_expired_rows(self, table, cutoff, after=None, limit=None):
+        """
+        按键集分页删除一批过期行，每批单独提交，写锁只在一个小事务内持有
+
+        Args:
+            table: RETENTION_POLICIES 中的表名
+            cutoff: 保留截止值（retention_cutoff 的返回值）
+            after: 上一批最后一行的键，None 表示从头开始
+            limit: 每批行数（默认 RETENTION_CHUNK_SIZE）
+
+        Returns:
+            (删除行数, 本批最后一行的键)；键为 None 表示已没有过期行
+        """
+        key_columns = self.RETENTION_POLICIES[table][0]
+        columns = ', '.join(key_columns)
+        limit = limit or Config.RETENTION_CHUNK_SIZE
+        self.write_buffer.flush()
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
-                # 使用参数化查询防止SQL注入
-                cursor.execute('''
-                    DELETE FROM processed_tweets 
-                    WHERE processed_at < datetime('now', '-' || ? || ' days')
-                ''', (days,))
-                deleted_count = cursor.rowcount
+                if after is None:
+                    cursor.execute(f'''
+                        SELECT {columns} FROM {table}
+                        WHERE {key_columns[0]} < ?
+                        ORDER BY {columns} LIMIT ?
+                    ''', (cutoff, limit))
+                else:
+                    cursor.execute(f'''
+                        SELECT {columns} FROM {table}
+                        WHERE {key_columns[0]} < ? AND ({columns}) > ({', '.join('?' * len(key_columns))})
+                        ORDER BY {columns} LIMIT ?
+                    ''', (cutoff, *after, limit))
+                keys = cursor.fetchall()
+                if not keys:
+                    return 0, None
+                conditions = ' AND '.join(f'{column} = ?' for column in key_columns)
+                cursor.executemany(f'DELETE FROM {table} WHERE {conditions}', keys)
                 conn.commit()
-                logger.info(f"清理了 {deleted_count} 条旧记录")
-                return deleted_count
+                return len(keys), tuple(keys[-1])
         except Exception as e:
-            logger.error(f"清理旧记录失败: {e}")
-            return 0
+            logger.error(f"清理 {table} 过期记录失败: {e}")
+            return 0, None
+
+    def incremental_vacuum(self, pages=None):
+        """
+        把最多 pages 个空闲页归还给文件系统（需要增量 auto_vacuum 模式）
+
+        Returns:
+            (回收的字节数, 剩余空闲页数)
+        """
+        pages = pages or Config.RETENTION_VACUUM_PAGES
+        try:
+            with self._connect() as conn:
+                page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+                before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+                if before:
+                    conn.execute(f'PRAGMA incremental_vacuum({int(pages)})').fetchall()
+                    conn.commit()
+                after = conn.execute('PRAGMA freelist_count').fetchone()[0]
+                return (before - after) * page_size, after
+        except Exception as e:
+            logger.error(f"增量回收空间失败: {e}")
+            return 0, 0
+
+    def is_incremental_auto_vacuum(self):
+        """数据库是否已启用增量 auto_vacuum"""
+        try:
+            with self._connect() as conn:
+                return conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+        except Exception as e:
+            logger.error(f"读取 auto_vacuum 模式失败: {e}")
+            return False
+
+    def enable_incremental_auto_vacuum(self):
+        """
+        把已有数据库切换为增量 auto_vacuum 模式
+
+        需要执行一次完整 VACUUM：重写整个文件、期间独占数据库，并临时占用与数据库相当的磁盘空间，
+        只应在机器人停止时通过 migrate_auto_vacuum.py 运行。
+
+        Returns:
+            是否已处于增量模式（切换成功或原本即是）
+        """
+        if self.is_incremental_auto_vacuum():
+            return True
+        self.write_buffer.flush()
+        try:
+            conn = self._connect()
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            conn.execute('VACUUM')
+        except Exception as e:
+            logger.error(f"切换增量 auto_vacuum 失败: {e}")
+            return False
+        logger.info("数据库已切换为增量 auto_vacuum 模式")
+        return self.is_incremental_auto_vacuum()
+
+    def get_storage_stats(self):
+        """获取数据库文件大小与空闲空间（字节）"""
+        try:
+            with self._connect() as conn:
+                page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+                page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+                freelist_count = conn.execute('PRAGMA freelist_count').fetchone()[0]
+                return {
+                    'size_bytes': page_size * page_count,
+                    'free_bytes': page_size * freelist_count,
+                }
+        except Exception as e:
+            logger.error(f"获取数据库空间统计失败: {e}")
+            return {'size_bytes': 0, 'free_bytes': 0}
+
     def add_to_blacklist(self, user_id, user_name, username, leave_count, reason="多次离群"):
         """将用户添加到黑名单"""
+        self.write_buffer.flush(kinds=('blacklist',))
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO blacklist 
-                    (user_id, user_name, username, reason, leave_count, added_at)
-                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (user_id, user_name, username, reason, leave_count))
+            with self._connect() as conn:
+                self._write_blacklist(conn.cursor(), [(user_id, user_name, username, reason, leave_count)])
                 conn.commit()
-                logger.info(f"用户 {user_name} (ID: {user_id}) 已添加到黑名单")
-                return True
+            self._add_blacklisted(user_id)
+            logger.info(f"用户 {user_name} (ID: {user_id}) 已添加到黑名单")
+            return True
         except Exception as e:
             logger.error(f"添加用户到黑名单失败: {e}")
             return False
     
     def is_user_blacklisted(self, user_id):
-        """检查用户是否在黑名单中"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('SELECT 1 FROM blacklist WHERE user_id = ?', (user_id,))
-                return cursor.fetchone() is not None
-        except Exception as e:
-            logger.error(f"检查黑名单状态失败: {e}")
-            return False
-    
+        """检查用户是否在黑名单中（查内存集合，O(1) 且不访问数据库）"""
+        with self._cache_lock:
+            return user_id in self._blacklisted_ids
+
+    def get_blacklisted_ids(self, user_ids):
+        """批量检查用户，返回其中位于黑名单的用户ID集合"""
+        with self._cache_lock:
+            return self._blacklisted_ids.intersection(user_ids)
+
     def get_blacklist(self):
         """获取黑名单列表"""
+        self.write_buffer.flush(kinds=('blacklist',))
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT user_id, user_name, username, reason, leave_count, added_at 
@@ -148,28 +854,340 @@ class Database:
             logger.error(f"获取黑名单失败: {e}")
             return []
     
+    @staticmethod
+    def _prefix_range(prefix):
+        """
+        把前缀匹配改写为范围 [prefix, upper)，使其能使用索引
+
+        upper 为末字符加一后的字符串；前缀全部由最大码点组成时没有上界，返回 None
+        """
+        stripped = prefix.rstrip(chr(0x10FFFF))
+        if not stripped:
+            return prefix, None
+        return prefix, stripped[:-1] + chr(ord(stripped[-1]) + 1)
+
+    @classmethod
+    def _blacklist_filter(cls, reason_prefix=None, username_prefix=None):
+        """
+        把黑名单前缀过滤改写为索引范围
+
+        Returns:
+            [(列名, 排序规则, 下界, 上界)]，上界为 None 表示没有上界
+        """
+        filters = []
+        if reason_prefix:
+            filters.append(('reason', '', *cls._prefix_range(reason_prefix)))
+        if username_prefix:
+            # NOCASE 只折叠 ASCII 大小写，先把前缀转为小写，使范围边界与索引顺序一致
+            filters.append(('username', ' COLLATE NOCASE', *cls._prefix_range(username_prefix.translate(ASCII_LOWER))))
+        return filters
+
+    @staticmethod
+    def _range_conditions(filters, skip_lower=False, skip_upper=False):
+        """
+        构造前缀范围的 WHERE 条件与参数
+
+        排序规则写在右侧的绑定参数上：左侧为裸列名时，SQLite 才会把行值比较用作索引边界
+        skip_lower / skip_upper 省略第一个过滤列的下界/上界（由翻页起点的行值比较代替）
+        """
+        conditions, params = [], []
+        for i, (column, collate, lower, upper) in enumerate(filters):
+            if not (i == 0 and skip_lower):
+                conditions.append(f"{column} >= ?{collate}")
+                params.append(lower)
+            if upper is not None and not (i == 0 and skip_upper):
+                conditions.append(f"{column} < ?{collate}")
+                params.append(upper)
+        return conditions, params
+
+    def count_blacklist(self, reason_prefix=None, username_prefix=None, limit=100):
+        """
+        获取符合前缀过滤条件的黑名单用户数量（无过滤条件时直接取内存集合大小）
+
+        过滤时最多统计 limit 行，返回 limit 表示“至少 limit 个”，耗时与黑名单总量无关
+        """
+        filters = self._blacklist_filter(reason_prefix, username_prefix)
+        if not filters:
+            return self.get_blacklist_count()
+        conditions, params = self._range_conditions(filters)
+        self.write_buffer.flush(kinds=('blacklist',))
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT COUNT(*) FROM (
+                        SELECT 1 FROM blacklist WHERE {' AND '.join(conditions)} LIMIT ?
+                    )
+                ''', (*params, limit))
+                return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"统计黑名单数量失败: {e}")
+            return 0
+
+    def get_blacklist_page(self, limit=10, before=None, after=None, reason_prefix=None, username_prefix=None):
+        """
+        键集分页读取黑名单，每页只读取 limit + 1 行
+
+        无过滤时按 (added_at, user_id) 倒序；按前缀过滤时在对应索引的范围内分页，
+        按原因过滤为 (原因, 加入时间) 倒序，按用户名过滤为 (用户名, 加入时间) 升序（不区分大小写）
+
+        Args:
+            limit: 每页行数
+            before: 翻页起点行的 (added_at, user_id)，返回排在其后的行，用于下一页
+            after: 翻页起点行的 (added_at, user_id)，返回排在其前的行，用于上一页
+            reason_prefix: 按原因前缀过滤
+            username_prefix: 按用户名前缀过滤（不区分大小写）
+
+        Returns:
+            (按显示顺序排列的行列表, 该方向上是否还有更多行)
+        """
+        filters = self._blacklist_filter(reason_prefix, username_prefix)
+        column, collate = filters[0][:2] if filters else (None, '')
+        descending = column != 'username'
+        start = before if before is not None else after
+        # 沿索引顺序向后（>）还是向前（<）读取
+        ascending_read = start is not None and (before is not None) != descending
+
+        conditions, params = self._range_conditions(
+            filters, skip_lower=start is not None and ascending_read,
+            skip_upper=start is not None and not ascending_read)
+        if start is not None:
+            op = '>' if ascending_read else '<'
+            if column:
+                # 起点行的过滤列取值按 user_id 查出；该行已被移除时比较结果为 NULL，返回空页
+                conditions.append(f"({column}, added_at, user_id) {op} "
+                                  f"((SELECT {column} FROM blacklist WHERE user_id = ?){collate}, ?, ?)")
+                params.extend((start[1], *start))
+            else:
+                conditions.append(f"(added_at, user_id) {op} (?, ?)")
+                params.extend(start)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        order = 'ASC' if (ascending_read if start is not None else not descending) else 'DESC'
+        order_by = f"{column}{collate} {order}, " if column else ''
+
+        self.write_buffer.flush(kinds=('blacklist',))
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT user_id, user_name, username, reason, leave_count, added_at
+                    FROM blacklist {where}
+                    ORDER BY {order_by}added_at {order}, user_id {order}
+                    LIMIT ?
+                ''', (*params, limit + 1))
+                rows = cursor.fetchall()
+        except Exception as e:
+            logger.error(f"分页获取黑名单失败: {e}")
+            return [], False
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if after is not None:
+            rows.reverse()
+        return rows, has_more
+
     def remove_from_blacklist(self, user_id):
         """从黑名单中移除用户"""
+        self.write_buffer.flush(kinds=('blacklist',))
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('DELETE FROM blacklist WHERE user_id = ?', (user_id,))
                 removed = cursor.rowcount > 0
                 conn.commit()
-                if removed:
-                    logger.info(f"用户 ID {user_id} 已从黑名单中移除")
-                return removed
+            self._discard_blacklisted(user_id)
+            if removed:
+                logger.info(f"用户 ID {user_id} 已从黑名单中移除")
+            return removed
         except Exception as e:
             logger.error(f"从黑名单移除用户失败: {e}")
             return False
     
     def get_blacklist_count(self):
-        """获取黑名单用户数量"""
+        """获取黑名单用户数量（查内存集合）"""
+        with self._cache_lock:
+            return len(self._blacklisted_ids)
+    
+    def get_member_event_counts(self, user_id):
+        """获取用户的进出群次数，返回 (加入次数, 离开次数)"""
+        self.write_buffer.flush(kinds=('member_event',))
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
-                cursor.execute('SELECT COUNT(*) FROM blacklist')
+                cursor.execute('''
+                    SELECT COALESCE(SUM(event = ?), 0), COALESCE(SUM(event = ?), 0)
+                    FROM member_events WHERE user_id = ?
+                ''', (MEMBER_EVENT_JOIN, MEMBER_EVENT_LEAVE, user_id))
+                joins, leaves = cursor.fetchone()
+                return joins, leaves
+        except Exception as e:
+            logger.error(f"获取成员进出群次数失败: {e}")
+            return 0, 0
+
+    def get_member_events(self, user_id, limit=20):
+        """获取用户最近 limit 条进出群事件 [(ts, event)]，按时间正序"""
+        self.write_buffer.flush(kinds=('member_event',))
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT ts, event FROM member_events WHERE user_id = ?
+                    ORDER BY ts DESC, id DESC LIMIT ?
+                ''', (user_id, limit))
+                return cursor.fetchall()[::-1]
+        except Exception as e:
+            logger.error(f"获取成员进出群记录失败: {e}")
+            return []
+
+    def get_cached_user_id(self, username):
+        """获取缓存的 Twitter 用户ID
+
+        Returns:
+            (rest_id, resolved_at_epoch) 元组，不存在时返回 None
+        """
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT rest_id, CAST(strftime('%s', resolved_at) AS INTEGER)
+                    FROM twitter_user_ids WHERE username = ?
+                ''', (username.lower(),))
+                return cursor.fetchone()
+        except Exception as e:
+            logger.error(f"获取用户ID缓存失败: {e}")
+            return None
+    
+    def save_user_id(self, username, rest_id):
+        """保存 Twitter 用户名 -> 用户ID 的解析结果"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO twitter_user_ids (username, rest_id, resolved_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                ''', (username.lower(), str(rest_id)))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"保存用户ID缓存失败: {e}")
+            return False
+    
+    def delete_user_id(self, username):
+        """删除 Twitter 用户ID 缓存"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('DELETE FROM twitter_user_ids WHERE username = ?', (username.lower(),))
+                conn.commit()
+                return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"删除用户ID缓存失败: {e}")
+            return False
+    
+    def get_api_usage(self, period):
+        """获取指定计费周期内各接口的调用次数
+
+        Returns:
+            {endpoint: (calls, last_call_at)} 字典
+        """
+        self.write_buffer.flush(kinds=('api_call',))
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT endpoint, calls, last_call_at FROM api_usage WHERE period = ?
+                ''', (period,))
+                return {endpoint: (calls, last_call_at) for endpoint, calls, last_call_at in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"获取API调用统计失败: {e}")
+            return {}
+    
+    def get_media_file_ids(self, media_urls):
+        """
+        批量获取媒体链接对应的 Telegram file_id，并刷新命中条目的最近使用时间
+
+        Returns:
+            {媒体链接: file_id}，未缓存的链接不在结果中
+        """
+        media_urls = list(dict.fromkeys(media_urls))
+        if not media_urls:
+            return {}
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                placeholders = ','.join('?' * len(media_urls))
+                cursor.execute(
+                    f'SELECT media_url, file_id FROM media_file_ids WHERE media_url IN ({placeholders})',
+                    media_urls
+                )
+                found = dict(cursor.fetchall())
+                if found:
+                    now = time.time()
+                    cursor.executemany('''
+                        UPDATE media_file_ids SET hits = hits + 1, last_used_at = ?
+                        WHERE media_url = ?
+                    ''', [(now, media_url) for media_url in found])
+                conn.commit()
+                return found
+        except Exception as e:
+            logger.error(f"批量获取媒体 file_id 失败: {e}")
+            return {}
+
+    def save_media_file_ids(self, entries, max_entries=None):
+        """
+        在同一事务内批量保存 Telegram file_id，超出容量时按最近使用时间淘汰
+
+        Args:
+            entries: (媒体链接, file_id, 媒体类型) 列表
+            max_entries: 缓存容量
+        """
+        max_entries = max_entries or Config.MEDIA_FILE_ID_CACHE_SIZE
+        entries = list(entries)
+        if not entries:
+            return True
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                now = time.time()
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO media_file_ids (media_url, file_id, media_type, hits, last_used_at)
+                    VALUES (?, ?, ?, 0, ?)
+                ''', [(media_url, file_id, media_type, now) for media_url, file_id, media_type in entries])
+                cursor.execute('''
+                    DELETE FROM media_file_ids WHERE media_url IN (
+                        SELECT media_url FROM media_file_ids
+                        ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (max_entries,))
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"保存媒体 file_id 失败: {e}")
+            return False
+    
+    def delete_media_file_ids(self, media_urls):
+        """批量删除失效的 Telegram file_id 缓存，返回删除的条目数"""
+        media_urls = list(media_urls)
+        if not media_urls:
+            return 0
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.executemany('DELETE FROM media_file_ids WHERE media_url = ?',
+                                   [(media_url,) for media_url in media_urls])
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            logger.error(f"删除媒体 file_id 失败: {e}")
+            return 0
+    
+    def get_media_file_id_count(self):
+        """获取缓存的媒体 file_id 数量"""
+        try:
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT COUNT(*) FROM media_file_ids')
                 return cursor.fetchone()[0]
         except Exception as e:
-            logger.error(f"获取黑名单数量失败: {e}")
-            return 0
\ No newline at end of file
+            logger.error(f"获取媒体 file_id 数量失败: {e}")
+            return 0
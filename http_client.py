@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+HTTP 连接池模块 - 为 TwitterMonitor 提供长连接复用的 aiohttp 客户端
+"""
+
+import asyncio
+import logging
+from typing import Optional, Dict, Any
+
+import aiohttp
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class PooledHttpClient:
+    """长生命周期的 aiohttp 客户端（连接池 + keep-alive + DNS 缓存）"""
+
+    def __init__(self, limit: int = None, limit_per_host: int = None,
+                 dns_cache_ttl: int = None, keepalive_timeout: int = None,
+                 timeout: int = 15):
+        """
+        初始化连接池配置（会话在首次请求时于事件循环内懒加载创建）
+
+        Args:
+            limit: 连接池总连接数上限
+            limit_per_host: 单个主机的连接数上限
+            dns_cache_ttl: DNS 缓存时间（秒）
+            keepalive_timeout: 空闲连接保活时间（秒）
+            timeout: 默认请求超时时间（秒）
+        """
+        self.limit = limit or Config.HTTP_POOL_LIMIT
+        self.limit_per_host = limit_per_host or Config.HTTP_POOL_LIMIT_PER_HOST
+        self.dns_cache_ttl = dns_cache_ttl or Config.HTTP_DNS_CACHE_TTL
+        self.keepalive_timeout = keepalive_timeout or Config.HTTP_KEEPALIVE_TIMEOUT
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._lock = asyncio.Lock()
+        self.stats = {
+            'requests': 0,
+            'connections_opened': 0,
+            'connections_reused': 0,
+            'dns_cache_hits': 0,
+            'dns_cache_misses': 0,
+        }
+
+    def _create_trace_config(self) -> aiohttp.TraceConfig:
+        """创建用于统计连接复用情况的 TraceConfig"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.stats['requests'] += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self.stats['connections_opened'] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.stats['connections_reused'] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.stats['dns_cache_hits'] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self.stats['dns_cache_misses'] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """获取（必要时创建）共享的 ClientSession"""
+        if self._session is not None and not self._session.closed:
+            return self._session
+
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                self._connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                    use_dns_cache=True,
+                    keepalive_timeout=self.keepalive_timeout,
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=self._connector,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    trace_configs=[self._create_trace_config()],
+                )
+                logger.info(
+                    f"HTTP连接池已创建 (总上限: {self.limit}, 单主机上限: {self.limit_per_host}, "
+                    f"DNS缓存: {self.dns_cache_ttl}s, 保活: {self.keepalive_timeout}s)"
+                )
+        return self._session
+
+    def idle_connections(self) -> int:
+        """获取连接池中当前空闲的 keep-alive 连接数"""
+        connector = self._connector
+        if connector is None or connector.closed:
+            return 0
+        try:
+            return sum(len(conns) for conns in connector._conns.values())
+        except Exception:
+            return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取连接池统计信息"""
+        stats = dict(self.stats)
+        stats['idle_connections'] = self.idle_connections()
+        stats['active'] = self._session is not None and not self._session.closed
+        return stats
+
+    async def close(self) -> None:
+        """关闭共享会话并释放所有连接"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP连接池已关闭")
+        self._session = None
+        self._connector = None
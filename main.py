@@ -5,16 +5,25 @@ TeleLuX - Twitter监控和Telegram通知系统
 """
 
 import asyncio
+import calendar
+import hashlib
 import logging
 import random
 import re
+import time
+from contextlib import AsyncExitStack
 from datetime import datetime, timedelta
-from telegram import Update, ChatPermissions, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, MessageHandler, ChatMemberHandler, filters, ContextTypes
+from telegram import Update, ChatPermissions, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, InputMediaVideo
+from telegram.ext import Application, MessageHandler, ChatMemberHandler, CallbackQueryHandler, filters, ContextTypes
+from telegram.error import BadRequest
 from config import Config
 from twitter_monitor import TwitterMonitor
-from database import Database
-from utils import utils, async_error_handler, run_in_thread
+from async_database import AsyncDatabase
+from retention import RetentionJob
+from database import Database, MEMBER_EVENT_JOIN, MEMBER_EVENT_LEAVE
+from utils import utils, async_error_handler, LRUCache
+from resilience import TwitterAPIError, ERROR_DESCRIPTIONS
+from tweet_model import Tweet
 
 # 配置日志
 logging.basicConfig(
@@ -26,6 +35,10 @@ logger = logging.getLogger(__name__)
 
 ORDER_BOT_URL = "https://t.me/lulaoshishop_bot"
 ORDER_BOT_BUTTON_TEXT = "点击自助下单进群"
+ORDER_BOT_FOLLOWUP_TEXT = "👇 自助下单进群"  # 相册不支持内联按钮，随后单独发送的按钮消息文字
+BLACKLIST_PAGE_SIZE = 10  # 黑名单每页显示的用户数
+BLACKLIST_MATCH_COUNT_LIMIT = 100  # 过滤后的匹配数最多统计到此值，超过时显示“100+”
+BLACKLIST_FILTER_MAX_LENGTH = 64  # 过滤前缀最大字符数（过滤条件保存在服务端，翻页按钮只携带短键）
 
 class TeleLuXBot:
     """TeleLuX完整版机器人"""
@@ -37,15 +50,16 @@ class TeleLuXBot:
         self.application = None
         self.twitter_monitor = None
         self.database = None
+        self.retention_job = None  # 数据保留任务（定期清理过期数据）
         self.last_check_time = None
         self.last_business_intro_time = None
         self.last_business_intro_message_id = None
         self.last_twitter_check_time = None  # Twitter监控上次检查时间
         # 免费API限额优化：默认8小时检查一次 (100条/月 ≈ 3次/天)
         self.twitter_check_interval = max(Config.CHECK_INTERVAL, 28800)  # 最小8小时
-        self.twitter_api_calls_today = 0  # 今日API调用次数
-        self.twitter_api_reset_date = datetime.now().date()  # API计数重置日期
         self.twitter_auto_forward_enabled = True  # 是否启用自动转发新推文
+        # 多账号监控状态（每个账号独立的检查间隔、目标群组与转发开关）
+        self.twitter_accounts = [dict(account, last_check_time=None) for account in Config.TWITTER_ACCOUNTS]
         # 统计数据
         self.stats = {
             'start_time': datetime.now(),
@@ -54,12 +68,14 @@ class TeleLuXBot:
             'users_joined': 0,
             'users_left': 0,
             'commands_processed': 0,
+            'blacklist_kicks': 0,
             'errors': 0
         }
-        # 使用内存管理器替代普通字典，防止内存无限增长
-        from utils import MemoryManager
-        self.user_activity_manager = MemoryManager(max_size=500, cleanup_threshold=0.8)
+        # 用户进出群次数的热缓存（持久化在 member_events 表，未命中时从数据库加载；按最近使用淘汰）
+        self.user_activity_manager = LRUCache(max_size=500)
         self.welcome_messages = []  # 记录所有欢迎消息ID
+        self.kicked_blacklisted_ids = set()  # 刚被踢出的黑名单用户（忽略随后的离群事件）
+        self.blacklist_filters = LRUCache(max_size=100)  # 黑名单翻页按钮的过滤键 -> (过滤类型, 过滤值)
         self.activity_logs = []  # 操作日志记录
         # 入群验证配置
         self.pending_verifications = {}  # 待验证用户 {user_id: {'expires': datetime, 'code': str}}
@@ -101,24 +117,22 @@ class TeleLuXBot:
         user = update.effective_user
         return bool(user and user.id in Config.ADMIN_USER_IDS)
 
-    def _format_tweet_message(self, title: str, username: str, tweet_text: str, tweet_url: str, created_at) -> str:
+    def _format_tweet_message(self, title: str, tweet: Tweet, default_username: str = '',
+                              max_text_length: int = 800) -> str:
         """格式化推文消息，保证 HTML 字段已转义并限制链接域名。"""
+        username = tweet.username or default_username
         safe_username = username if utils.is_safe_twitter_username(username) else Config.TWITTER_USERNAME
         safe_username = safe_username if utils.is_safe_twitter_username(safe_username) else "i"
         display_username = utils.escape_html(username or safe_username)
-        safe_tweet_url = tweet_url if utils.is_safe_twitter_url(tweet_url) else f"https://x.com/{safe_username}"
-
-        if hasattr(created_at, 'strftime'):
-            time_text = created_at.strftime('%Y-%m-%d %H:%M:%S UTC')
-        else:
-            time_text = utils.escape_html(str(created_at or '未知'))
+        safe_tweet_url = tweet.url if utils.is_safe_twitter_url(tweet.url) else f"https://x.com/{safe_username}"
+        tweet_text = utils.truncate_text(tweet.text, max_text_length)
 
         return f"""{title}
 
 👤 <b>用户:</b> <a href="https://x.com/{safe_username}">{display_username}</a>
 📝 <b>内容:</b>
-{utils.escape_html(tweet_text or '')}
-🕒 <b>时间:</b> {time_text}
+{utils.escape_html(tweet_text)}
+🕒 <b>时间:</b> {tweet.created_at_text}
 
 🔗 <a href="{safe_tweet_url}">查看原推文</a>"""
         
@@ -277,7 +291,7 @@ class TeleLuXBot:
 
                     logger.info(f"🧹 收到私聊清除命令'clear'，已清除所有欢迎消息 (来自用户: {user_name})")
 
-                elif message_text.lower() == "blacklist":
+                elif message_text.lower() == "blacklist" or message_text.lower().startswith("blacklist "):
                     if not is_admin_chat:
                         await context.bot.send_message(
                             chat_id=chat_id,
@@ -286,8 +300,21 @@ class TeleLuXBot:
                         )
                         logger.warning(f"未经授权的黑名单查看尝试 (来自用户: {user_name}, Chat ID: {chat_id})")
                         return
-                    # 处理查看黑名单命令
-                    await self._show_blacklist(context, chat_id)
+                    # 处理查看黑名单命令：blacklist @前缀 按用户名过滤，blacklist 前缀 按原因过滤
+                    filter_value = message_text[len("blacklist"):].strip()
+                    filter_type = ''
+                    if filter_value.startswith('@'):
+                        filter_type, filter_value = 'u', filter_value[1:]
+                    elif filter_value:
+                        filter_type = 'r'
+                    if filter_type and (not filter_value or len(filter_value) > BLACKLIST_FILTER_MAX_LENGTH):
+                        await context.bot.send_message(
+                            chat_id=chat_id,
+                            text=f"❌ 过滤条件无效（不能为空，最多 {BLACKLIST_FILTER_MAX_LENGTH} 个字符）",
+                            parse_mode='HTML'
+                        )
+                        return
+                    await self._show_blacklist(context, chat_id, filter_type, filter_value)
                     logger.info(f"📋 收到私聊黑名单查看命令 (来自用户: {user_name})")
 
                 elif message_text.lower().startswith("unban "):
@@ -400,43 +427,12 @@ class TeleLuXBot:
                             tweet_info = await self.twitter_monitor.get_tweet_by_id(tweet_id, username=username)
 
                             if tweet_info:
-                                # 发送到群组
-                                tweet_text = tweet_info['text']
-                                if tweet_text and len(tweet_text) > 800:
-                                    tweet_text = tweet_text[:800] + "..."
-
-                                tweet_message = self._format_tweet_message(
-                                    "🐦 <b>推文分享</b>",
-                                    tweet_info.get('username', ''),
-                                    tweet_text,
-                                    tweet_info.get('url', ''),
-                                    tweet_info.get('created_at')
+                                # 发送到群组（与自动推送共用发送逻辑及媒体 file_id 缓存）
+                                await self._post_tweet(
+                                    tweet_info, self.chat_id, username or '',
+                                    title="🐦 <b>推文分享</b>"
                                 )
 
-                                preview_url = tweet_info.get('preview_image_url')
-                                if preview_url and not utils.is_safe_twitter_media_url(preview_url):
-                                    logger.warning(f"跳过不在白名单内的推文预览图: {preview_url}")
-                                    preview_url = None
-                                if preview_url:
-                                    if len(tweet_message) > 900:
-                                        tweet_message = tweet_message[:900] + "..."
-
-                                    await context.bot.send_photo(
-                                        chat_id=self.chat_id,
-                                        photo=preview_url,
-                                        caption=tweet_message,
-                                        parse_mode='HTML',
-                                        reply_markup=self._create_order_bot_button()
-                                    )
-                                else:
-                                    await context.bot.send_message(
-                                        chat_id=self.chat_id,
-                                        text=tweet_message,
-                                        parse_mode='HTML',
-                                        disable_web_page_preview=False,
-                                        reply_markup=self._create_order_bot_button()
-                                    )
-
                                 # 给私聊用户发送确认消息
                                 await context.bot.send_message(
                                     chat_id=chat_id,
@@ -453,6 +449,13 @@ class TeleLuXBot:
                                     parse_mode='HTML'
                                 )
 
+                        except TwitterAPIError as e:
+                            logger.error(f"处理Twitter URL失败 ({e.category}): {e}")
+                            await context.bot.send_message(
+                                chat_id=chat_id,
+                                text=f"❌ {e.description}",
+                                parse_mode='HTML'
+                            )
                         except Exception as e:
                             logger.error(f"处理Twitter URL失败: {e}")
 
@@ -562,48 +565,108 @@ class TeleLuXBot:
         except Exception as e:
             logger.error(f"处理消息时发生错误: {e}")
 
-    async def _show_blacklist(self, context, chat_id):
-        """显示黑名单列表"""
-        try:
-            blacklist = self.database.get_blacklist()
-            blacklist_count = len(blacklist)
+    def _blacklist_filter_key(self, filter_type, filter_value):
+        """把过滤条件保存在服务端，返回翻页按钮中携带的短键（无过滤时为空）"""
+        if not filter_type:
+            return ''
+        key = hashlib.sha1(f"{filter_type}|{filter_value}".encode('utf-8')).hexdigest()[:10]
+        self.blacklist_filters.add(key, (filter_type, filter_value))
+        return key
 
-            if blacklist_count == 0:
-                message = "📋 <b>黑名单管理</b>\n\n✅ 黑名单为空，暂无被封禁用户。"
-            else:
-                message = f"📋 <b>黑名单管理</b>\n\n👥 <b>总计:</b> {blacklist_count} 个用户\n\n"
-                
-                for i, (user_id, user_name, username, reason, leave_count, added_at) in enumerate(blacklist, 1):
-                    # 格式化时间
-                    try:
-                        from datetime import datetime
-                        if isinstance(added_at, str):
-                            added_time = datetime.fromisoformat(added_at.replace('Z', '+00:00'))
-                        else:
-                            added_time = added_at
-                        time_str = added_time.strftime('%Y-%m-%d %H:%M')
-                    except:
-                        time_str = str(added_at)[:16]
+    @staticmethod
+    def _blacklist_callback_data(direction, row, filter_key):
+        """
+        构造黑名单翻页按钮的回调数据: bl|方向|added_at(epoch)|user_id|过滤键
 
-                    safe_user_name = utils.escape_html(user_name or '未知用户')
-                    safe_username = utils.escape_html(username or '无')
-                    safe_reason = utils.escape_html(reason or '未记录')
+        各字段长度固定有界（最长约 45 字节），不会超过 Telegram 64 字节的限制
+        """
+        user_id, added_at = row[0], row[5]
+        added_epoch = calendar.timegm(time.strptime(str(added_at)[:19], '%Y-%m-%d %H:%M:%S'))
+        return f"bl|{direction}|{added_epoch}|{user_id}|{filter_key}"
 
-                    message += f"""<b>{i}.</b> {safe_user_name}
+    async def _render_blacklist_page(self, direction='', cursor=None, filter_type='', filter_value=''):
+        """
+        渲染一页黑名单（键集分页，每页固定行数，与黑名单总量无关）
+
+        Args:
+            direction: '' 第一页，'n' 下一页，'p' 上一页（排列顺序见 Database.get_blacklist_page）
+            cursor: 翻页起点行的 (added_at, user_id)
+            filter_type: '' 不过滤，'r' 按原因前缀，'u' 按用户名前缀
+            filter_value: 过滤前缀
+
+        Returns:
+            (消息文本, 内联键盘)
+        """
+        filters_kwargs = {
+            'reason_prefix': filter_value if filter_type == 'r' else None,
+            'username_prefix': filter_value if filter_type == 'u' else None,
+        }
+        rows, has_more = [], False
+        if direction == 'n':
+            rows, has_more = await self.database.get_blacklist_page(BLACKLIST_PAGE_SIZE, before=cursor, **filters_kwargs)
+        elif direction == 'p':
+            rows, has_more = await self.database.get_blacklist_page(BLACKLIST_PAGE_SIZE, after=cursor, **filters_kwargs)
+        if not rows:
+            # 第一页，或翻页起点之后的行已被移除
+            direction = ''
+            rows, has_more = await self.database.get_blacklist_page(BLACKLIST_PAGE_SIZE, **filters_kwargs)
+        has_newer = has_more if direction == 'p' else direction == 'n'
+        has_older = has_more if direction != 'p' else True
+
+        message = "📋 <b>黑名单管理</b>\n\n"
+        if filter_type:
+            filter_text = f"用户名以 @{filter_value}" if filter_type == 'u' else f"原因以「{filter_value}」"
+            message += f"🔍 <b>过滤:</b> {utils.escape_html(filter_text)} 开头\n"
+        total = self.database.get_blacklist_count()
+        if filter_type:
+            # 只统计到上限为止，匹配很多时显示“N+”，避免每次翻页都数完整个范围
+            matched = await self.database.count_blacklist(**filters_kwargs, limit=BLACKLIST_MATCH_COUNT_LIMIT + 1)
+            matched_text = f"{BLACKLIST_MATCH_COUNT_LIMIT}+" if matched > BLACKLIST_MATCH_COUNT_LIMIT else str(matched)
+            message += f"👥 <b>符合条件:</b> {matched_text} 个用户（黑名单共 {total} 个）\n\n"
+        else:
+            message += f"👥 <b>总计:</b> {total} 个用户\n\n"
+
+        if not rows:
+            message += "✅ 没有符合条件的用户。" if filter_type else "✅ 黑名单为空，暂无被封禁用户。"
+            return message, None
+
+        for user_id, user_name, username, reason, leave_count, added_at in rows:
+            safe_user_name = utils.escape_html(user_name or '未知用户')
+            safe_username = utils.escape_html(username or '无')
+            safe_reason = utils.escape_html(reason or '未记录')
+            message += f"""<b>•</b> {safe_user_name}
 • ID: <code>{user_id}</code>
 • 用户名: @{safe_username}
 • 原因: {safe_reason}
 • 离群次数: {leave_count}
-• 加入时间: {time_str}
+• 加入时间: {str(added_at)[:16]}
 
 """
+        message += f"💡 <b>管理提示:</b>\n• 发送 'unban 用户ID' 可移除用户\n• 例如: unban {rows[0][0]}"
 
-                message += f"\n💡 <b>管理提示:</b>\n• 发送 'unban 用户ID' 可移除用户\n• 例如: unban {blacklist[0][0]}"
-
+        buttons = []
+        filter_key = self._blacklist_filter_key(filter_type, filter_value)
+        try:
+            if has_newer:
+                buttons.append(InlineKeyboardButton(
+                    "⬅️ 上一页", callback_data=self._blacklist_callback_data('p', rows[0], filter_key)))
+            if has_older:
+                buttons.append(InlineKeyboardButton(
+                    "下一页 ➡️", callback_data=self._blacklist_callback_data('n', rows[-1], filter_key)))
+        except ValueError as e:
+            logger.warning(f"黑名单加入时间格式异常，无法翻页: {e}")
+            buttons = []
+        return message, InlineKeyboardMarkup([buttons]) if buttons else None
+
+    async def _show_blacklist(self, context, chat_id, filter_type='', filter_value=''):
+        """显示黑名单第一页"""
+        try:
+            message, reply_markup = await self._render_blacklist_page(filter_type=filter_type, filter_value=filter_value)
             await context.bot.send_message(
                 chat_id=chat_id,
                 text=message,
-                parse_mode='HTML'
+                parse_mode='HTML',
+                reply_markup=reply_markup
             )
 
         except Exception as e:
@@ -614,6 +677,34 @@ class TeleLuXBot:
                 parse_mode='HTML'
             )
 
+    async def handle_blacklist_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """处理黑名单翻页按钮"""
+        query = update.callback_query
+        if not self._is_admin(update):
+            await query.answer("❌ 此操作仅管理员可用", show_alert=True)
+            return
+        try:
+            _, direction, added_epoch, user_id, filter_key = query.data.split('|', 4)
+            filter_type, filter_value = '', ''
+            if filter_key:
+                saved_filter = self.blacklist_filters.get(filter_key)
+                if saved_filter is None:
+                    # 机器人重启或过滤条件已被淘汰
+                    await query.answer("⌛ 过滤条件已过期，请重新发送 blacklist 命令", show_alert=True)
+                    return
+                filter_type, filter_value = saved_filter
+            cursor = (time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(int(added_epoch))), int(user_id))
+            message, reply_markup = await self._render_blacklist_page(direction, cursor, filter_type, filter_value)
+            await query.answer()
+            await query.edit_message_text(text=message, parse_mode='HTML', reply_markup=reply_markup)
+        except BadRequest as e:
+            # 内容未变化（例如重复点击）时 Telegram 拒绝编辑
+            if 'not modified' not in str(e).lower():
+                logger.error(f"黑名单翻页失败: {e}")
+        except Exception as e:
+            logger.error(f"黑名单翻页失败: {e}")
+            await query.answer("❌ 获取黑名单信息失败")
+
     async def _unban_user(self, context, chat_id, user_id):
         """从黑名单移除用户"""
         try:
@@ -627,7 +718,7 @@ class TeleLuXBot:
                 return
 
             # 从黑名单移除
-            success = self.database.remove_from_blacklist(user_id)
+            success = await self.database.remove_from_blacklist(user_id)
             
             if success:
                 # 获取用户信息（如果在活动管理器中）
@@ -788,18 +879,8 @@ class TeleLuXBot:
             username = user.username or "无用户名"
             current_time = datetime.now()
 
-            # 记录用户活动 - 使用内存管理器
-            user_data = self.user_activity_manager.get(str(user_id))
-            if not user_data:
-                user_data = {
-                    'user_name': user_name,
-                    'username': username,
-                    'join_times': [],
-                    'leave_times': [],
-                    'total_joins': 0,
-                    'total_leaves': 0
-                }
-                self.user_activity_manager.add(str(user_id), user_data)
+            # 获取用户活动摘要（热缓存未命中时从 member_events 加载进出群次数）
+            user_data = await self._get_member_activity(user_id)
 
             # 更新用户信息（可能会变化）
             user_data['user_name'] = user_name
@@ -807,9 +888,15 @@ class TeleLuXBot:
 
             # 检查用户加入
             if old_status in ['left', 'kicked'] and new_status in ['member', 'administrator', 'creator']:
-                # 记录加入时间
-                user_data['join_times'].append(current_time)
+                # 黑名单用户重新进群：直接踢出，不发送欢迎消息、私信引导与入群验证
+                if new_status == 'member' and self.database and self.database.is_user_blacklisted(user_id):
+                    await self._kick_blacklisted_user(context, user_id, user_name)
+                    return
+
+                # 记录加入事件
                 user_data['total_joins'] += 1
+                if self.database:
+                    self.database.queue_member_event(user_id, MEMBER_EVENT_JOIN, current_time.timestamp())
 
                 logger.info(f"👋 用户加入: {user_name} (ID: {user_id}, 用户名: @{username})")
                 self.stats['users_joined'] += 1
@@ -877,9 +964,15 @@ class TeleLuXBot:
 
             # 检查用户离开
             elif old_status in ['member', 'administrator', 'creator'] and new_status in ['left', 'kicked']:
-                # 记录离开时间
-                user_data['leave_times'].append(current_time)
+                # 黑名单用户被踢出产生的离群事件不计入离群次数
+                if user_id in self.kicked_blacklisted_ids:
+                    self.kicked_blacklisted_ids.discard(user_id)
+                    return
+
+                # 记录离开事件
                 user_data['total_leaves'] += 1
+                if self.database:
+                    self.database.queue_member_event(user_id, MEMBER_EVENT_LEAVE, current_time.timestamp())
 
                 logger.info(f"👋 用户离开: {user_name} (ID: {user_id}, 用户名: @{username})")
                 self.stats['users_left'] += 1
@@ -888,18 +981,18 @@ class TeleLuXBot:
                 # 检查是否是第二次离开，如果是则加入黑名单
                 if user_data['total_leaves'] >= 2:
                     # 添加到黑名单（移除黑名单检查，确保每次第二次离开都加入）
-                    success = self.database.add_to_blacklist(
+                    # 写入走组提交，离群潮中的多条黑名单记录合并为一个事务
+                    self.database.queue_blacklist_add(
                         user_id=user_id,
                         user_name=user_name,
                         username=username,
                         leave_count=user_data['total_leaves'],
                         reason=f"多次离群 ({user_data['total_leaves']}次)"
                     )
-                    
-                    if success:
-                        # 通知管理员用户已被加入黑名单
-                        await self._notify_user_blacklisted(user_id, context)
-                        logger.info(f"🚫 用户 {user_name} (ID: {user_id}) 因多次离群已自动加入黑名单")
+
+                    # 通知管理员用户已被加入黑名单
+                    await self._notify_user_blacklisted(user_id, context)
+                    logger.info(f"🚫 用户 {user_name} (ID: {user_id}) 因多次离群已自动加入黑名单")
 
                 # 如果用户离开超过1次，通知管理员
                 if user_data['total_leaves'] > 1:
@@ -908,6 +1001,51 @@ class TeleLuXBot:
         except Exception as e:
             logger.error(f"处理群组成员变化时发生错误: {e}")
 
+    async def _get_member_activity(self, user_id):
+        """获取用户活动摘要（进出群次数），热缓存未命中时从 member_events 加载"""
+        user_data = self.user_activity_manager.get(str(user_id))
+        if not user_data:
+            joins, leaves = await self.database.get_member_event_counts(user_id) if self.database else (0, 0)
+            user_data = {
+                'user_name': f"用户{user_id}",
+                'username': "无用户名",
+                'total_joins': joins,
+                'total_leaves': leaves
+            }
+            self.user_activity_manager.add(str(user_id), user_data)
+        return user_data
+
+    async def _format_member_history(self, user_id) -> str:
+        """读取用户最近的进出群记录（条数受 MEMBER_HISTORY_LIMIT 限制）并格式化"""
+        events = await self.database.get_member_events(user_id, Config.MEMBER_HISTORY_LIMIT) if self.database else []
+        activity_history = []
+        for ts, event in events:
+            activity_type = "加入" if event == MEMBER_EVENT_JOIN else "离开"
+            time_str = datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+            activity_history.append(f"• {activity_type}: {time_str}")
+        if len(events) >= Config.MEMBER_HISTORY_LIMIT:
+            activity_history.append(f"（仅显示最近 {Config.MEMBER_HISTORY_LIMIT} 条）")
+        return chr(10).join(activity_history)
+
+    async def _kick_blacklisted_user(self, context, user_id, user_name):
+        """踢出重新进群的黑名单用户"""
+        self.kicked_blacklisted_ids.add(user_id)
+        try:
+            await context.bot.ban_chat_member(
+                chat_id=self.chat_id,
+                user_id=user_id
+            )
+            await context.bot.unban_chat_member(
+                chat_id=self.chat_id,
+                user_id=user_id
+            )
+            self.stats['blacklist_kicks'] += 1
+            logger.info(f"🚫 黑名单用户 {user_name} (ID: {user_id}) 重新进群，已踢出")
+            self._log_activity('blacklist_kick', f"{user_name} (ID: {user_id})")
+        except Exception as e:
+            self.kicked_blacklisted_ids.discard(user_id)
+            logger.error(f"踢出黑名单用户失败: {e}")
+
     async def _notify_repeat_user(self, user_id, action, context):
         """通知管理员用户的重复进群/退群行为"""
         try:
@@ -919,23 +1057,8 @@ class TeleLuXBot:
             user_name = user_data['user_name']
             username = user_data['username']
 
-            # 构建活动历史
-            activity_history = []
-
-            # 合并加入和离开时间，按时间排序
-            all_activities = []
-            for join_time in user_data['join_times']:
-                all_activities.append(('加入', join_time))
-            for leave_time in user_data['leave_times']:
-                all_activities.append(('离开', leave_time))
-
-            # 按时间排序
-            all_activities.sort(key=lambda x: x[1])
-
-            # 格式化活动历史
-            for activity_type, activity_time in all_activities:
-                time_str = activity_time.strftime('%Y-%m-%d %H:%M:%S')
-                activity_history.append(f"• {activity_type}: {time_str}")
+            # 构建活动历史（从 member_events 读取最近的记录）
+            activity_history = await self._format_member_history(user_id)
 
             # 构建通知消息
             action_text = "加入" if action == 'join' else "离开"
@@ -952,7 +1075,7 @@ class TeleLuXBot:
 • 当前动作: {action_text}
 
 📝 <b>活动历史:</b>
-{chr(10).join(activity_history)}
+{activity_history}
 
 ⚠️ 该用户存在多次进群/退群行为，请注意关注。"""
 
@@ -988,21 +1111,8 @@ class TeleLuXBot:
             user_name = user_data['user_name']
             username = user_data['username']
 
-            # 构建活动历史
-            activity_history = []
-            all_activities = []
-            for join_time in user_data['join_times']:
-                all_activities.append(('加入', join_time))
-            for leave_time in user_data['leave_times']:
-                all_activities.append(('离开', leave_time))
-
-            # 按时间排序
-            all_activities.sort(key=lambda x: x[1])
-
-            # 格式化活动历史
-            for activity_type, activity_time in all_activities:
-                time_str = activity_time.strftime('%Y-%m-%d %H:%M:%S')
-                activity_history.append(f"• {activity_type}: {time_str}")
+            # 构建活动历史（从 member_events 读取最近的记录）
+            activity_history = await self._format_member_history(user_id)
 
             blacklist_message = f"""🚫 <b>用户已自动加入黑名单</b>
 
@@ -1017,7 +1127,7 @@ class TeleLuXBot:
 • 加入黑名单原因: 多次离群 ({user_data['total_leaves']}次)
 
 📝 <b>活动历史:</b>
-{chr(10).join(activity_history)}
+{activity_history}
 
 ⚠️ 该用户因多次离群已被自动加入黑名单。
 
@@ -1480,102 +1590,379 @@ class TeleLuXBot:
         if len(self.activity_logs) > 200:
             self.activity_logs = self.activity_logs[-200:]
 
-    async def check_twitter_updates(self):
-        """检查Twitter新推文并自动发送到群组"""
+    def _format_monitored_accounts(self) -> str:
+        """格式化监控账号列表（HTML 已转义）"""
+        if not self.twitter_accounts:
+            return "无"
+        parts = []
+        for account in self.twitter_accounts:
+            status = "" if account.get('forward', True) else " (已暂停)"
+            parts.append(f"@{utils.escape_html(account['username'])}{status}")
+        return ", ".join(parts)
+
+    def _get_account_interval(self, account) -> int:
+        """获取账号的检查间隔（未单独配置时使用全局间隔）"""
+        if account.get('interval'):
+            return max(account['interval'], 3600)
+        return self.twitter_check_interval
+
+    def _get_due_accounts(self, now, force=False):
+        """获取已到检查时间的账号，最久未检查的优先，并受每轮抓取预算和月度配额配速限制"""
+        if not force and self.twitter_monitor:
+            wait_seconds = self.twitter_monitor.quota.seconds_until_next_call()
+            if wait_seconds > 0:
+                return []  # 按配额配速推迟到下一个可用时间点
+
+        due_accounts = []
+        for account in self.twitter_accounts:
+            if not account.get('forward', True):
+                continue
+            last_check = account.get('last_check_time')
+            if not force and last_check and (now - last_check).total_seconds() < self._get_account_interval(account):
+                continue
+            due_accounts.append(account)
+
+        due_accounts.sort(key=lambda acc: acc.get('last_check_time') or datetime.min)
+        return due_accounts[:Config.TWITTER_FETCH_BUDGET]
+
+    async def _prepare_media_item(self, item):
+        """
+        准备单个媒体条目：校验链接白名单并查询已缓存的 Telegram file_id
+
+        Args:
+            item: Tweet.media 中的 TweetMedia 条目
+
+        Returns:
+            {'type': 'photo'/'video', 'url': 链接, 'file_id': 缓存的 file_id 或 None, 'upload': 是否需本地上传}，
+            链接不安全时返回 None
+        """
+        media_type, url, upload = 'photo', item.url, False
+        if item.type != 'photo':
+            # 视频/GIF 选择不超过大小限制的版本，没有可用版本时以封面图展示
+            url = item.preview_image_url
+            if item.variants and self.twitter_monitor:
+                variant = await self.twitter_monitor.select_video_variant(item)
+                if variant:
+                    media_type, url, upload = 'video', variant['url'], variant.get('upload', False)
+        if not url:
+            return None
+        if not utils.is_safe_twitter_media_url(url):
+            logger.warning(f"跳过不在白名单内的推文媒体: {url}")
+            return None
+
+        return {'type': media_type, 'url': url, 'file_id': None, 'upload': upload}
+
+    async def _prepare_media(self, tweet):
+        """并发准备推文的全部媒体，返回可发送的媒体列表（保持原顺序、去重，并批量查询已缓存的 file_id）"""
+        prepared = await asyncio.gather(*(self._prepare_media_item(item) for item in tweet.media))
+
+        media, seen = [], set()
+        for item in prepared:
+            if item and item['url'] not in seen:
+                seen.add(item['url'])
+                media.append(item)
+        media = media[:Config.TWEET_ALBUM_MAX_ITEMS]
+
+        if media and self.database:
+            file_ids = await self.database.get_media_file_ids([item['url'] for item in media])
+            for item in media:
+                item['file_id'] = file_ids.get(item['url'])
+        return media
+
+    @staticmethod
+    def _message_file_id(message):
+        """获取消息中媒体的 file_id（视频可能被 Telegram 识别为动图）"""
+        if not message:
+            return None
+        if message.photo:
+            return message.photo[-1].file_id
+        media = message.video or message.animation
+        return media.file_id if media else None
+
+    async def _remember_file_ids(self, media, messages):
+        """把发送后 Telegram 返回的 file_id 批量写入缓存"""
+        if not self.database:
+            return
+        entries = []
+        for item, message in zip(media, messages):
+            file_id = self._message_file_id(message)
+            if file_id and item['file_id'] != file_id:
+                entries.append((item['url'], file_id, item['type']))
+        if entries:
+            await self.database.save_media_file_ids(entries)
+
+    async def _forget_file_ids(self, media):
+        """删除失效的 file_id 缓存，返回改用原始链接的媒体列表"""
+        stale = [item['url'] for item in media if item['file_id']]
+        if stale and self.database:
+            await self.database.delete_media_file_ids(stale)
+        return [dict(item, file_id=None) for item in media]
+
+    async def _send_single_media(self, chat_id, item, source, **kwargs):
+        """按媒体类型调用 send_photo 或 send_video"""
+        bot = self.application.bot
+        if item['type'] == 'video':
+            return await bot.send_video(chat_id=chat_id, video=source, supports_streaming=True, **kwargs)
+        return await bot.send_photo(chat_id=chat_id, photo=source, **kwargs)
+
+    def _open_local_media(self, item):
+        """
+        从本地媒体缓存打开（必要时流式下载）媒体文件（异步上下文管理器，文件在线程中打开，使用期间不会被淘汰）
+
+        Raises:
+            OSError: 媒体无法下载或文件无法打开
+        """
+        if not self.twitter_monitor:
+            raise OSError(f"Twitter监控未初始化，无法下载媒体: {item['url']}")
+        return self.twitter_monitor.open_cached_media(item['url'])
+
+    async def _send_cached_media(self, chat_id, item, **kwargs):
+        """
+        发送单个图片或视频：优先复用 Telegram 已缓存的 file_id，其次让 Telegram 拉取原始链接，
+        拉取失败（或文件超过链接拉取上限）时从本地缓存上传
+
+        Args:
+            chat_id: 目标聊天ID
+            item: _prepare_media_item 返回的媒体条目
+            **kwargs: 传递给 send_photo/send_video 的其他参数
+
+        Returns:
+            发送成功的消息对象
+
+        Raises:
+            OSError: 需要本地上传但媒体无法下载或文件无法打开
+        """
+        if item['file_id']:
+            try:
+                return await self._send_single_media(chat_id, item, item['file_id'], **kwargs)
+            except BadRequest as e:
+                # file_id 失效（例如机器人令牌更换），删除缓存后回退到原始链接
+                logger.warning(f"缓存的媒体 file_id 已失效，改用原始链接发送: {e}")
+                item = (await self._forget_file_ids([item]))[0]
+
+        if not item.get('upload'):
+            try:
+                message = await self._send_single_media(chat_id, item, item['url'], **kwargs)
+                await self._remember_file_ids([item], [message])
+                return message
+            except BadRequest as e:
+                logger.warning(f"Telegram 无法拉取媒体链接，改为本地上传: {e}")
+
+        async with self._open_local_media(item) as media_file:
+            message = await self._send_single_media(chat_id, item, media_file, **kwargs)
+        await self._remember_file_ids([item], [message])
+        return message
+
+    async def _send_album_once(self, chat_id, media, caption, upload_all=False):
+        """
+        发送一次媒体组，已缓存 file_id 的媒体直接引用，需要上传的媒体从本地缓存打开文件
+
+        Args:
+            upload_all: 是否把所有未缓存 file_id 的媒体都改为本地上传
+
+        Raises:
+            OSError: 需要本地上传的媒体无法下载或文件无法打开
+        """
+        uploads = [
+            index for index, item in enumerate(media)
+            if not item['file_id'] and (upload_all or item.get('upload'))
+        ]
+
+        async with AsyncExitStack() as stack:
+            # 并发下载；等待全部完成后再检查异常，已打开的文件都登记在 stack 中，失败时统一关闭
+            opened = await asyncio.gather(
+                *(stack.enter_async_context(self._open_local_media(media[index])) for index in uploads),
+                return_exceptions=True
+            )
+            for result in opened:
+                if isinstance(result, BaseException):
+                    raise result
+            files = dict(zip(uploads, opened))
+
+            album = []
+            for index, item in enumerate(media):
+                if index in files:
+                    source = files[index]
+                else:
+                    source = item['file_id'] or item['url']
+                options = {
+                    'media': source,
+                    'caption': caption if index == 0 else None,
+                    'parse_mode': 'HTML' if index == 0 else None,
+                }
+                if item['type'] == 'video':
+                    album.append(InputMediaVideo(supports_streaming=True, **options))
+                else:
+                    album.append(InputMediaPhoto(**options))
+
+            messages = await self.application.bot.send_media_group(chat_id=chat_id, media=album)
+
+        await self._remember_file_ids(media, messages)
+        return messages
+
+    async def _send_album(self, chat_id, media, caption):
+        """
+        以媒体组（相册）形式一次发送多个图片/视频，说明文字附在第一个媒体上
+
+        Args:
+            chat_id: 目标聊天ID
+            media: _prepare_media 返回的媒体列表
+            caption: 相册说明文字（HTML）
+
+        Returns:
+            发送成功的消息列表
+        """
+        if any(item['file_id'] for item in media):
+            try:
+                return await self._send_album_once(chat_id, media, caption)
+            except BadRequest as e:
+                logger.warning(f"相册中缓存的 file_id 已失效，改用原始链接发送: {e}")
+                media = await self._forget_file_ids(media)
+
+        if not all(item.get('upload') for item in media):
+            try:
+                return await self._send_album_once(chat_id, media, caption)
+            except BadRequest as e:
+                logger.warning(f"Telegram 无法拉取相册媒体链接，改为本地上传: {e}")
+
+        return await self._send_album_once(chat_id, media, caption, upload_all=True)
+
+    async def _post_tweet(self, tweet, chat_id, default_username, title="🐦 <b>发布了新推文</b>"):
+        """将推文发送到指定群组（多媒体时发送相册，单个媒体发送图片/视频，否则发送文本）"""
+        # 构建推文消息
+        tweet_message = self._format_tweet_message(title, tweet, default_username)
+
+        media = await self._prepare_media(tweet)
+        if media and len(tweet_message) > 900:
+            tweet_message = tweet_message[:900] + "..."
+
+        if Config.TWEET_ALBUM_MODE and len(media) > 1:
+            try:
+                await self._send_album(chat_id, media, tweet_message)
+            except OSError as e:
+                logger.error(f"推文 {tweet.id} 的相册媒体无法上传，改为只发送文字: {e}")
+            else:
+                # 媒体组不支持内联键盘，下单按钮随后以一条简短消息单独发送
+                try:
+                    await self.application.bot.send_message(
+                        chat_id=chat_id,
+                        text=ORDER_BOT_FOLLOWUP_TEXT,
+                        reply_markup=self._create_order_bot_button()
+                    )
+                except Exception as e:
+                    # 相册已发出，按钮消息失败不应导致整条推文被重新转发
+                    logger.error(f"发送相册下单按钮失败: {e}")
+                return
+        elif media:
+            try:
+                await self._send_cached_media(
+                    chat_id,
+                    media[0],
+                    caption=tweet_message,
+                    parse_mode='HTML',
+                    reply_markup=self._create_order_bot_button()
+                )
+                return
+            except OSError as e:
+                logger.error(f"推文 {tweet.id} 的媒体无法上传，改为只发送文字: {e}")
+
+        # 无媒体，或链接拉取与本地上传均失败（媒体无法下载、本地文件不可用）：只发送文字，
+        # 避免同一条推文每轮重试失败并阻塞该账号后续推文的转发
+        await self.application.bot.send_message(
+            chat_id=chat_id,
+            text=tweet_message,
+            parse_mode='HTML',
+            disable_web_page_preview=False,
+            reply_markup=self._create_order_bot_button()
+        )
+
+    async def check_twitter_updates(self, force=False):
+        """
+        检查所有监控账号的新推文并自动发送到对应群组
+
+        Args:
+            force: 是否忽略检查间隔与配额配速立即检查（管理员手动检查）
+
+        Returns:
+            检查结果 {'checked': 检查的账号列表, 'sent': 发送的推文数, 'errors': {用户名: 错误类别}}
+        """
+        result = {'checked': [], 'sent': 0, 'errors': {}}
         try:
             now = datetime.now()
             
-            # 检查是否到了检查时间
-            if self.last_twitter_check_time:
-                elapsed = (now - self.last_twitter_check_time).total_seconds()
-                if elapsed < self.twitter_check_interval:
-                    return  # 还没到检查时间
-            
-            # 更新检查时间
-            self.last_twitter_check_time = now
-            
             if not self.twitter_monitor:
                 logger.warning("Twitter监控未初始化")
-                return
+                return result
 
             if not self.twitter_auto_forward_enabled:
-                return
-            
-            username = Config.TWITTER_USERNAME
-            logger.info(f"🔍 检查 @{username} 的新推文...")
+                return result
+
+            # 检查哪些账号到了检查时间
+            due_accounts = self._get_due_accounts(now, force=force)
+            if not due_accounts:
+                return result  # 还没到检查时间
+
+            # 更新检查时间
+            for account in due_accounts:
+                account['last_check_time'] = now
+            self.last_twitter_check_time = now
+
+            accounts_by_name = {account['username'].lower(): account for account in due_accounts}
+            usernames = [account['username'] for account in due_accounts]
+            logger.info(f"🔍 检查 {', '.join('@' + name for name in usernames)} 的新推文...")
             
-            # 获取新推文 (现在是异步方法)
-            new_tweets = await self.twitter_monitor.check_new_tweets(username)
+            # 并发获取各账号新推文，每个账号每轮最多转发最旧的三条（其余留到下一轮），
+            # 合并后按时间正序发送以保证高水位单调推进
+            new_tweets = await self.twitter_monitor.check_accounts(usernames, per_account_limit=3)
+            result['checked'] = usernames
+            result['errors'] = dict(self.twitter_monitor.last_check_errors)
+            for username, category in result['errors'].items():
+                self.stats['errors'] += 1
+                self._log_activity('twitter_api_error', f"@{username}: {ERROR_DESCRIPTIONS.get(category, category)}")
             
             if new_tweets:
-                # 每次自动转发仅限前三条推文
-                display_tweets = new_tweets[:3]
-                logger.info(f"📢 发现 {len(new_tweets)} 条新推文，将转发前 {len(display_tweets)} 条")
+                logger.info(f"📢 发现 {len(new_tweets)} 条待转发的新推文")
+                failed_accounts = set()
                 
-                for tweet in display_tweets:
-                    try:
-                        tweet_text = tweet.get('text', '')
-                        if tweet_text and len(tweet_text) > 800:
-                            tweet_text = tweet_text[:800] + "..."
-
-                        # 构建推文消息
-                        tweet_message = self._format_tweet_message(
-                            "🐦 <b>发布了新推文</b>",
-                            tweet.get('username') or username,
-                            tweet_text,
-                            tweet.get('url', ''),
-                            tweet.get('created_at')
-                        )
-
-                        # 发送到群组
-                        preview_url = tweet.get('preview_image_url')
-                        if preview_url and not utils.is_safe_twitter_media_url(preview_url):
-                            logger.warning(f"跳过不在白名单内的推文预览图: {preview_url}")
-                            preview_url = None
-                        if preview_url:
-                            if len(tweet_message) > 900:
-                                tweet_message = tweet_message[:900] + "..."
+                for tweet in new_tweets:
+                    username = tweet.username or usernames[0]
+                    account = accounts_by_name.get(username.lower())
+                    if not account or username.lower() in failed_accounts:
+                        continue
 
-                            await self.application.bot.send_photo(
-                                chat_id=self.chat_id,
-                                photo=preview_url,
-                                caption=tweet_message,
-                                parse_mode='HTML',
-                                reply_markup=self._create_order_bot_button()
-                            )
-                        else:
-                            await self.application.bot.send_message(
-                                chat_id=self.chat_id,
-                                text=tweet_message,
-                                parse_mode='HTML',
-                                disable_web_page_preview=False,
-                                reply_markup=self._create_order_bot_button()
-                            )
+                    try:
+                        await self._post_tweet(tweet, account['chat_id'], username)
                         
                         self.stats['tweets_sent'] += 1
-                        if self.database:
-                            self.database.mark_tweet_processed(
-                                str(tweet['id']),
-                                tweet.get('username') or username,
-                                tweet.get('url', ''),
-                                tweet.get('text', ''),
-                                str(tweet.get('created_at', ''))
-                            )
-                        self._log_activity('tweet_sent', f"推文ID: {tweet['id']}")
-                        logger.info(f"✅ 已发送推文到群组: {tweet['id']}")
+                        result['sent'] += 1
+                        # 发送成功后立即在事务内标记已处理并推进高水位（在数据库线程执行，不阻塞事件循环），
+                        # 再发送下一条：崩溃时最多重复转发刚发送、尚未提交的这一条（至少一次语义）
+                        if self.database and not await self.database.mark_tweet_processed(
+                                str(tweet.id),
+                                username,
+                                tweet.url,
+                                tweet.text,
+                                str(tweet.created_at or '')
+                        ):
+                            logger.error(f"推文 {tweet.id} 已转发但处理记录写入失败，下次检查时可能重复转发")
+                        self._log_activity('tweet_sent', f"@{username} 推文ID: {tweet.id}")
+                        logger.info(f"✅ 已发送推文到群组: {tweet.id}")
                         
                         # 避免发送过快
-                        await asyncio.sleep(1)
+                        await asyncio.sleep(Config.TWEET_SEND_INTERVAL)
                         
                     except Exception as e:
                         logger.error(f"发送推文失败: {e}")
                         self.stats['errors'] += 1
-            else:
-                logger.info(f"📭 @{username} 暂无新推文")
+                        # 停止发送该账号更新的推文，避免高水位越过失败的推文，下次检查时重试
+                        failed_accounts.add(username.lower())
+            elif not result['errors']:
+                logger.info(f"📭 {', '.join('@' + name for name in usernames)} 暂无新推文")
                 
         except Exception as e:
             logger.error(f"检查Twitter更新失败: {e}")
             self.stats['errors'] += 1
+        return result
 
     async def _toggle_feature(self, chat_id, context, feature: str):
         """切换功能开关"""
@@ -1628,8 +2015,86 @@ class TeleLuXBot:
             minutes, seconds = divmod(remainder, 60)
             
             # 获取数据库统计
-            processed_tweets = self.database.get_processed_tweets_count() if self.database else 0
+            processed_tweets = await self.database.get_processed_tweets_count() if self.database else 0
             blacklist_count = self.database.get_blacklist_count() if self.database else 0
+            db_thread_text = "未初始化"
+            if self.database:
+                db_stats = self.database.get_stats()
+                db_thread_text = (f"{db_stats['calls']} 次请求 (失败 {db_stats['failures']}, "
+                                  f"排队 {db_stats['queue_size']}, 最长等待 {db_stats['max_wait_ms']:.1f}ms)")
+                write_stats = self.database.get_write_stats()
+                db_thread_text += (f"\n• 组提交: {write_stats['batches']} 批 / {write_stats['rows']} 行 "
+                                   f"(平均 {write_stats['avg_batch']:.1f} 行, 最大 {write_stats['max_batch']} 行, "
+                                   f"提交耗时 {write_stats['avg_commit_ms']:.1f}/{write_stats['max_commit_ms']:.1f}ms, "
+                                   f"重试 {write_stats['retries']} 次, 失败 {write_stats['failures']} 批 / "
+                                   f"{write_stats['failed_rows']} 行)")
+                storage = await self.database.get_storage_stats()
+                db_thread_text += (f"\n• 文件大小: {storage['size_bytes'] / 1024 / 1024:.1f}MB "
+                                   f"(空闲 {storage['free_bytes'] / 1024:.0f}KB)")
+            activity_stats = self.user_activity_manager.get_stats()
+            db_thread_text += (f"\n• 成员活动缓存: {activity_stats['size']} / {activity_stats['max_size']} "
+                               f"(命中率 {activity_stats['hit_rate']:.0%}, 淘汰 {activity_stats['evictions']})")
+            if self.retention_job:
+                retention = self.retention_job.get_stats()
+                last_run = retention['last_run_at'].strftime('%m-%d %H:%M') if retention['last_run_at'] else "未运行"
+                db_thread_text += (f"\n• 数据保留: {retention['runs']} 次 (上次 {last_run}), "
+                                   f"累计删除 {retention['total_rows_removed']} 行, "
+                                   f"回收 {retention['bytes_reclaimed'] / 1024:.0f}KB")
+
+            # 获取 RapidAPI 配额、推文缓存与 HTTP 连接池统计
+            quota_stats_text = "• 未初始化"
+            tweet_cache_text = "• 未初始化"
+            http_stats_text = "• 未初始化"
+            media_cache_text = "• 未初始化"
+            if self.twitter_monitor:
+                cache_stats = self.twitter_monitor.get_tweet_cache_stats()
+                tweet_cache_text = f"""• 缓存条目: {cache_stats['size']} / {cache_stats['max_size']}
+• 命中: {cache_stats['hits']} 次
+• 未命中: {cache_stats['misses']} 次
+• 合并请求: {cache_stats['coalesced']} 次"""
+                lookup_stats = self.twitter_monitor.get_lookup_stats()
+                for name, provider_stats in lookup_stats['providers'].items():
+                    latency_text = f"{provider_stats['latency_ms']}ms" if provider_stats['latency_ms'] is not None else "暂无样本"
+                    tweet_cache_text += f"\n• {name}: 平均 {latency_text}, 胜出 {provider_stats['wins']}/{provider_stats['requests']} 次"
+                tweet_cache_text += (f"\n• 对冲请求: {lookup_stats['hedged_requests']} 次，"
+                                     f"探测 {lookup_stats['explorations']} 次")
+                probe_stats = self.twitter_monitor.get_video_probe_stats()
+                tweet_cache_text += (
+                    f"\n• 视频探测: {probe_stats['probes']} 次 (失败 {probe_stats['probe_failures']}, "
+                    f"缓存命中 {probe_stats['cache_hits']}, 本地上传 {probe_stats['uploads']}, 超限 {probe_stats['oversized']})"
+                )
+                if self.database:
+                    tweet_cache_text += f"\n• 媒体 file_id: {await self.database.get_media_file_id_count()} / {Config.MEDIA_FILE_ID_CACHE_SIZE}"
+
+                quota_stats = await self.twitter_monitor.get_quota_stats()
+                endpoint_text = ", ".join(
+                    f"{utils.escape_html(endpoint)} {calls}" for endpoint, calls in quota_stats['endpoints'].items()
+                ) or "无"
+                quota_stats_text = f"""• 计费周期: {quota_stats['period_start'].strftime('%Y-%m-%d')} ~ {quota_stats['period_end'].strftime('%Y-%m-%d')}
+• 已用/总额: {quota_stats['used']} / {quota_stats['monthly_quota']} 次
+• 剩余额度: {quota_stats['remaining']} 次
+• 接口明细: {endpoint_text}
+• 配速间隔: {int(quota_stats['pace_interval'] // 60)} 分钟
+• 下次可调用: {int(quota_stats['next_call_in'] // 60)} 分钟后
+• 拒绝调用: {quota_stats['refused_calls']} 次"""
+
+                breaker_text = ", ".join(
+                    f"{name} {state}" + (f" ({retry_in // 60}分钟后试探)" if retry_in else "")
+                    for name, (state, retry_in) in self.twitter_monitor.get_breaker_states().items()
+                )
+                http_stats = self.twitter_monitor.get_http_stats()
+                http_stats_text = f"""• 请求总数: {http_stats['requests']} 次
+• 新建连接: {http_stats['connections_opened']} 个
+• 复用连接: {http_stats['connections_reused']} 次
+• 空闲连接: {http_stats['idle_connections']} 个
+• 熔断状态: {breaker_text}"""
+
+                media_stats = self.twitter_monitor.get_media_cache_stats()
+                media_cache_text = f"""• 缓存文件: {media_stats['files']} 个
+• 占用空间: {media_stats['total_bytes'] / 1024 / 1024:.1f} / {media_stats['max_bytes'] / 1024 / 1024:.0f}MB
+• 命中率: {media_stats['hit_rate']:.0%} ({media_stats['hits']}/{media_stats['hits'] + media_stats['misses']})
+• 下载: {media_stats['downloads']} 次 (失败 {media_stats['download_failures']}, 共 {media_stats['downloaded_bytes'] / 1024 / 1024:.1f}MB)
+• 淘汰文件: {media_stats['evictions']} 个"""
             
             stats_message = f"""📊 <b>TeleLuX 运行统计</b>
 
@@ -1640,15 +2105,29 @@ class TeleLuXBot:
 • 欢迎消息: {self.stats['welcome_sent']} 条
 • 用户加入: {self.stats['users_joined']} 人
 • 用户离开: {self.stats['users_left']} 人
+• 踢出黑名单用户: {self.stats['blacklist_kicks']} 次
 • 命令处理: {self.stats['commands_processed']} 次
 • 错误次数: {self.stats['errors']} 次
 
 💾 <b>数据库统计:</b>
 • 已处理推文: {processed_tweets} 条
 • 黑名单用户: {blacklist_count} 人
+• 数据库线程: {db_thread_text}
+
+📉 <b>RapidAPI配额:</b>
+{quota_stats_text}
+
+🗂️ <b>推文缓存:</b>
+{tweet_cache_text}
+
+🌐 <b>HTTP连接池:</b>
+{http_stats_text}
+
+📦 <b>本地媒体缓存:</b>
+{media_cache_text}
 
 🔧 <b>系统配置:</b>
-• 监控用户: @{utils.escape_html(Config.TWITTER_USERNAME)}
+• 监控用户: {self._format_monitored_accounts()}
 • 检查间隔: {self.twitter_check_interval} 秒
 • 启动时间: {self.stats['start_time'].strftime('%Y-%m-%d %H:%M:%S')}"""
 
@@ -1714,7 +2193,8 @@ class TeleLuXBot:
 • <code>stats</code> - 查看运行统计
 • <code>logs</code> - 查看最近操作日志
 • <code>clear</code> - 清除所有欢迎消息
-• <code>blacklist</code> - 查看黑名单
+• <code>blacklist</code> - 查看黑名单（分页）
+• <code>blacklist @前缀</code> / <code>blacklist 原因前缀</code> - 按用户名或原因过滤黑名单
 • <code>unban 用户ID</code> - 解除用户封禁
 • <code>check</code> - 立即检查Twitter更新
 • <code>setinterval 秒数</code> - 设置检查间隔
@@ -1738,7 +2218,7 @@ class TeleLuXBot:
 • https://x.com/用户名/status/推文ID
 
 🔧 <b>当前配置:</b>
-• 监控用户: @{Config.TWITTER_USERNAME}
+• 监控用户: {self._format_monitored_accounts()}
 • 检查间隔: {self.twitter_check_interval // 3600} 小时
 • 入群验证: {verify_status}
 • 广告检测: {ad_status}
@@ -1761,22 +2241,32 @@ class TeleLuXBot:
         try:
             await context.bot.send_message(
                 chat_id=chat_id,
-                text=f"🔍 正在检查 @{Config.TWITTER_USERNAME} 的新推文...",
+                text=f"🔍 正在检查 {self._format_monitored_accounts()} 的新推文...",
                 parse_mode='HTML'
             )
             
-            # 重置上次检查时间以强制检查
-            self.last_twitter_check_time = None
+            # 忽略检查间隔与配额配速，强制检查
             prev_auto_forward = self.twitter_auto_forward_enabled
             try:
                 self.twitter_auto_forward_enabled = True
-                await self.check_twitter_updates()
+                result = await self.check_twitter_updates(force=True)
             finally:
                 self.twitter_auto_forward_enabled = prev_auto_forward
+
+            if result['errors']:
+                error_lines = "\n".join(
+                    f"• @{utils.escape_html(username)}: {ERROR_DESCRIPTIONS.get(category, category)}"
+                    for username, category in result['errors'].items()
+                )
+                result_text = f"⚠️ 检查完成，部分账号检查失败\n\n{error_lines}\n\n📤 已转发: {result['sent']} 条"
+            elif result['sent']:
+                result_text = f"✅ 检查完成，已转发 {result['sent']} 条新推文"
+            else:
+                result_text = "✅ 检查完成，暂无新推文"
             
             await context.bot.send_message(
                 chat_id=chat_id,
-                text="✅ 检查完成",
+                text=result_text,
                 parse_mode='HTML'
             )
             self.stats['commands_processed'] += 1
@@ -1909,6 +2399,11 @@ class TeleLuXBot:
         except Exception as e:
             logger.error(f"定时业务介绍发送失败: {e}")
 
+    async def check_retention_schedule(self):
+        """到达运行间隔时执行数据保留任务（分批删除过期数据并增量回收空间）"""
+        if self.retention_job and self.retention_job.is_due():
+            await self.retention_job.run()
+
     async def start_bot(self):
         """启动机器人"""
         try:
@@ -1925,12 +2420,15 @@ class TeleLuXBot:
             # 添加群组成员变化处理器
             chat_member_handler = ChatMemberHandler(self.handle_chat_member, ChatMemberHandler.CHAT_MEMBER)
             self.application.add_handler(chat_member_handler)
+
+            # 添加黑名单翻页按钮处理器
+            self.application.add_handler(CallbackQueryHandler(self.handle_blacklist_callback, pattern=r'^bl\|'))
             
             # 启动机器人
             await self.application.initialize()
             await self.application.start()
             await self.application.updater.start_polling(
-                allowed_updates=['message', 'chat_member'],
+                allowed_updates=['message', 'chat_member', 'callback_query'],
                 drop_pending_updates=True
             )
             
@@ -1951,6 +2449,18 @@ class TeleLuXBot:
                 logger.info("机器人已停止")
         except Exception as e:
             logger.error(f"停止失败: {e}")
+        finally:
+            # 释放 Twitter 监控的共享连接池
+            if self.twitter_monitor:
+                try:
+                    await self.twitter_monitor.close()
+                except Exception as e:
+                    logger.error(f"关闭Twitter监控连接失败: {e}")
+            # 停止数据库线程并关闭长连接（监控器未共用机器人的数据库实例时一并关闭）
+            if self.database:
+                await self.database.close()
+            if self.twitter_monitor and self.twitter_monitor.database is not self.database:
+                await self.twitter_monitor.database.close()
 
 async def main():
     """主函数"""
@@ -1964,12 +2474,14 @@ async def main():
         # 创建机器人
         bot = TeleLuXBot()
         
-        # 初始化数据库
-        bot.database = Database()
+        # 初始化数据库（处理器通过专用数据库线程异步访问）
+        bot.database = AsyncDatabase(Database())
+        bot.retention_job = RetentionJob(bot.database)
         logger.info("✅ 数据库初始化完成")
         
         # 初始化Twitter监控
-        bot.twitter_monitor = TwitterMonitor()
+        bot.twitter_monitor = TwitterMonitor(bot.database)
+        await bot.twitter_monitor.quota.load()  # 按配额配速前先加载本计费周期的调用计数
         logger.info("✅ Twitter监控初始化完成")
         
         # 启动机器人
@@ -1978,7 +2490,7 @@ async def main():
         # 发送启动通知
         startup_message = None
         
-        logger.info(f"🐦 Twitter监控已启动: @{Config.TWITTER_USERNAME}, 间隔: {bot.twitter_check_interval}秒")
+        logger.info(f"🐦 Twitter监控已启动: {bot._format_monitored_accounts()}, 间隔: {bot.twitter_check_interval}秒")
         logger.info("💡 私聊机器人发送 'help' 查看所有命令")
         
         # 保持运行并定期检查
@@ -1990,6 +2502,9 @@ async def main():
                 # 检查定时业务介绍
                 await bot.check_business_intro_schedule()
 
+                # 检查数据保留任务
+                await bot.check_retention_schedule()
+
                 await asyncio.sleep(30)  # 每30秒检查一次
         except KeyboardInterrupt:
             logger.info("\n⏹️  收到停止信号")
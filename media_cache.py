@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+媒体磁盘缓存模块 - 分块流式下载推特媒体到本地，按总字节数 LRU 淘汰，供 Telegram 无法拉取链接时本地上传
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+
+import aiohttp
+
+from config import Config
+from utils import utils, run_in_thread
+
+logger = logging.getLogger(__name__)
+
+
+class MediaDiskCache:
+    """有容量上限的本地媒体缓存（文件名为链接的哈希，按最近使用顺序淘汰）"""
+
+    CHUNK_SIZE = 64 * 1024
+    WRITE_BUFFER_SIZE = 1024 * 1024  # 攒够这么多字节才交给线程写盘一次，减少线程切换
+
+    def __init__(self, http_client, directory: str = None, max_bytes: int = None,
+                 max_file_bytes: int = None, timeout: int = 120):
+        """
+        初始化媒体缓存（目录中已有的文件在首次使用时于线程中加载）
+
+        Args:
+            http_client: 共享的 PooledHttpClient
+            directory: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+            max_file_bytes: 单个文件大小上限（字节），超过时放弃下载
+            timeout: 单个文件下载超时时间（秒）
+        """
+        self.http_client = http_client
+        self.directory = directory or Config.MEDIA_CACHE_DIR
+        self.max_bytes = max_bytes or Config.MEDIA_CACHE_MAX_BYTES
+        self.max_file_bytes = max_file_bytes or Config.TELEGRAM_UPLOAD_MAX_BYTES
+        self.timeout = timeout
+        self._entries = OrderedDict()  # {文件名: 大小}，按最近使用排序
+        self._inflight = {}  # {链接: asyncio.Task}
+        self._pins = Counter()  # {文件名: 正在使用的次数}，淘汰时跳过
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.downloads = 0
+        self.download_failures = 0
+        self.downloaded_bytes = 0
+        self.evictions = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    def _scan(self) -> list:
+        """扫描缓存目录（在线程中执行），清理残留的临时文件，返回 [(修改时间, 文件名, 大小)]"""
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            if entry.name.endswith('.part'):
+                os.remove(entry.path)
+                continue
+            stat = entry.stat()
+            files.append((stat.st_mtime, entry.name, stat.st_size))
+        return files
+
+    async def _load(self) -> None:
+        """首次使用时在线程中扫描缓存目录重建索引（按修改时间恢复 LRU 顺序）"""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                files = await run_in_thread(self._scan)
+            except OSError as e:
+                logger.warning(f"扫描媒体缓存目录失败: {self.directory} ({e})")
+                files = []
+
+            for _, name, size in sorted(files):
+                if name in self._entries:
+                    continue
+                self._entries[name] = size
+                self.total_bytes += size
+            self._loaded = True
+            await self._evict()
+            if self._entries:
+                logger.info(f"媒体缓存已加载: {len(self._entries)} 个文件, {self.total_bytes / 1024 / 1024:.1f}MB")
+
+    def _filename(self, url: str) -> str:
+        ext = os.path.splitext(urlparse(url).path)[1][:8]
+        return hashlib.sha1(url.encode('utf-8')).hexdigest() + ext
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    @staticmethod
+    def _remove_files(paths: list) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _touch(path: str) -> bool:
+        """更新文件修改时间（用于重启后恢复 LRU 顺序），文件不存在返回 False"""
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def _evict(self) -> None:
+        """按最近使用顺序淘汰文件，直到总大小不超过上限（跳过正在使用的文件，至少保留最新的一个文件）"""
+        excess = self.total_bytes - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for filename, size in islice(self._entries.items(), len(self._entries) - 1):
+            if excess <= 0:
+                break
+            if filename in self._pins:
+                continue
+            victims.append(filename)
+            excess -= size
+
+        paths = []
+        for filename in victims:
+            self.total_bytes -= self._entries.pop(filename)
+            self.evictions += 1
+            paths.append(self._path(filename))
+        if paths:
+            # 先同步更新索引，再在线程中删除文件，避免删除大量文件时阻塞事件循环
+            try:
+                await run_in_thread(self._remove_files, paths)
+            except OSError as e:
+                logger.warning(f"删除淘汰的媒体缓存文件失败: {e}")
+
+    @staticmethod
+    def _discard(f, tmp_path: str) -> None:
+        """关闭并删除下载失败的临时文件"""
+        if f is not None:
+            f.close()
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+
+    async def _download(self, url: str, filename: str) -> Optional[str]:
+        """分块流式下载到临时文件，完成后原子重命名（文件读写都在线程中执行，不阻塞事件循环）"""
+        path = self._path(filename)
+        tmp_path = path + '.part'
+        size = 0
+        self.downloads += 1
+        session = await self.http_client.get_session()
+        f = None
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                if response.status != 200:
+                    raise ValueError(f"HTTP {response.status}")
+                if response.content_length and response.content_length > self.max_file_bytes:
+                    raise ValueError(f"文件过大 ({response.content_length} 字节)")
+
+                f = await run_in_thread(open, tmp_path, 'wb')
+                pending = []
+                pending_bytes = 0
+                async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > self.max_file_bytes:
+                        raise ValueError(f"文件超过 {self.max_file_bytes} 字节上限")
+                    pending.append(chunk)
+                    pending_bytes += len(chunk)
+                    if pending_bytes >= self.WRITE_BUFFER_SIZE:
+                        await run_in_thread(f.writelines, pending)
+                        pending = []
+                        pending_bytes = 0
+                if pending:
+                    await run_in_thread(f.writelines, pending)
+
+            await run_in_thread(f.close)
+            await run_in_thread(os.replace, tmp_path, path)
+        except (asyncio.TimeoutError, aiohttp.ClientError, OSError, ValueError) as e:
+            self.download_failures += 1
+            logger.warning(f"媒体下载失败: {url} ({e})")
+            await run_in_thread(self._discard, f, tmp_path)
+            return None
+
+        self.downloaded_bytes += size
+        self._entries[filename] = size
+        self.total_bytes += size
+        await self._evict()
+        logger.info(f"媒体已缓存到本地: {url} ({size / 1024:.0f}KB)")
+        return path
+
+    async def get_path(self, url: str) -> Optional[str]:
+        """
+        获取媒体的本地文件路径，未缓存时下载（同一链接的并发请求只下载一次）
+
+        Args:
+            url: 推特媒体链接（仅允许白名单域名）
+
+        Returns:
+            本地文件路径，下载失败返回 None
+        """
+        if not utils.is_safe_twitter_media_url(url):
+            logger.warning(f"拒绝缓存不在白名单内的媒体链接: {url}")
+            return None
+
+        if not self._loaded:
+            await self._load()
+
+        filename = self._filename(url)
+        # 等待线程更新修改时间期间条目可能已被淘汰，需要再检查一次
+        if filename in self._entries and await run_in_thread(self._touch, self._path(filename)) \
+                and filename in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(filename)
+            return self._path(filename)
+
+        task = self._inflight.get(url)
+        if task is None:
+            self.misses += 1
+            if filename in self._entries:
+                # 文件已被外部删除，修正索引
+                self.total_bytes -= self._entries.pop(filename)
+            task = asyncio.ensure_future(self._download(url, filename))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(task)
+
+    @asynccontextmanager
+    async def open(self, url: str):
+        """
+        获取媒体（必要时下载）并在线程中以只读方式打开，使用期间该文件不会被淘汰
+
+        用法: ``async with cache.open(url) as media_file: ...``
+
+        Raises:
+            OSError: 媒体无法下载到本地，或本地文件无法打开
+        """
+        # 在等待下载之前固定：下载完成到调用方打开文件之间，其他下载触发的淘汰也不会删除它
+        filename = self._filename(url)
+        self._pins[filename] += 1
+        try:
+            path = await self.get_path(url)
+            if path is None:
+                raise OSError(f"媒体无法下载到本地: {url}")
+            media_file = await run_in_thread(open, path, 'rb')
+            try:
+                yield media_file
+            finally:
+                media_file.close()
+        finally:
+            self._pins[filename] -= 1
+            if not self._pins[filename]:
+                del self._pins[filename]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        lookups = self.hits + self.misses
+        return {
+            'files': len(self._entries),
+            'total_bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'downloads': self.downloads,
+            'download_failures': self.download_failures,
+            'downloaded_bytes': self.downloaded_bytes,
+            'evictions': self.evictions,
+            'pinned': len(self._pins),
+        }
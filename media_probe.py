@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+视频版本选择模块 - 并发 HEAD 探测各 mp4 版本的文件大小，挑选 Telegram 可直接拉取的最佳版本
+"""
+
+import asyncio
+import logging
+from typing import Optional, Sequence, Dict, Any
+
+import aiohttp
+
+from config import Config
+from tweet_model import VideoVariant
+from utils import utils, AsyncTTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class VideoVariantSelector:
+    """按文件大小挑选视频版本（Content-Length 按链接缓存，同一链接的并发探测合并为一次）"""
+
+    def __init__(self, http_client, max_bytes: int = None, cache_size: int = None, timeout: float = None):
+        """
+        初始化视频版本选择器
+
+        Args:
+            http_client: 共享的 PooledHttpClient
+            max_bytes: 允许发送的最大文件大小（字节）
+            cache_size: 缓存的文件大小条目数
+            timeout: 单次 HEAD 探测超时时间（秒）
+        """
+        self.http_client = http_client
+        self.max_bytes = max_bytes or Config.TELEGRAM_VIDEO_MAX_BYTES
+        self.upload_max_bytes = Config.TELEGRAM_UPLOAD_MAX_BYTES
+        self.timeout = timeout or Config.VIDEO_PROBE_TIMEOUT
+        # 推特视频链接内容不可变，大小可长期缓存
+        self.size_cache = AsyncTTLCache(max_size=cache_size or Config.VIDEO_PROBE_CACHE_SIZE, ttl=86400)
+        self.probes = 0
+        self.probe_failures = 0
+        self.selections = 0
+        self.oversized = 0
+        self.uploads = 0
+
+    async def _probe(self, url: str) -> Optional[int]:
+        """
+        发送 HEAD 请求获取文件大小
+
+        Returns:
+            文件大小（字节）；响应未提供 Content-Length 时返回 -1；请求失败返回 None（不缓存）
+        """
+        self.probes += 1
+        session = await self.http_client.get_session()
+        try:
+            async with session.head(url, allow_redirects=True,
+                                    timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                if response.status != 200:
+                    self.probe_failures += 1
+                    logger.warning(f"视频大小探测失败 HTTP {response.status}: {url}")
+                    # 4xx 说明该版本不可用，缓存为未知大小；5xx/429 视为暂时失败，下次重新探测
+                    return -1 if 400 <= response.status < 500 and response.status != 429 else None
+                return response.content_length if response.content_length is not None else -1
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            self.probe_failures += 1
+            logger.warning(f"视频大小探测失败: {url} ({e})")
+            return None
+
+    async def content_length(self, url: str) -> Optional[int]:
+        """获取（缓存的）视频文件大小"""
+        if not utils.is_safe_twitter_media_url(url):
+            return None
+        return await self.size_cache.get_or_fetch(url, lambda: self._probe(url))
+
+    async def select(self, variants: Sequence[VideoVariant]) -> Optional[Dict[str, Any]]:
+        """
+        并发探测全部版本，选择不超过链接拉取上限的最高码率版本，没有时退而选择可本地上传的版本
+
+        Args:
+            variants: VideoVariant 列表
+
+        Returns:
+            选中的版本（附带 'size' 字段，需要本地上传时附带 'upload': True），没有可用版本时返回 None
+        """
+        if not variants:
+            return None
+
+        sizes = await asyncio.gather(*(self.content_length(v.url) for v in variants))
+
+        candidates = [
+            {'url': variant.url, 'bitrate': variant.bitrate, 'size': size}
+            for variant, size in zip(variants, sizes)
+            if size is not None and 0 <= size <= self.max_bytes
+        ]
+        if not candidates:
+            # 超过链接拉取上限但不超过上传上限的版本，由本地缓存下载后上传
+            candidates = [
+                {'url': variant.url, 'bitrate': variant.bitrate, 'size': size, 'upload': True}
+                for variant, size in zip(variants, sizes)
+                if size is not None and self.max_bytes < size <= self.upload_max_bytes
+            ]
+            if candidates:
+                self.uploads += 1
+        if not candidates:
+            if any(size is not None and size > self.max_bytes for size in sizes):
+                self.oversized += 1
+                logger.info(f"所有视频版本均超过 {self.upload_max_bytes // (1024 * 1024)}MB 限制，改为发送封面图")
+            return None
+
+        self.selections += 1
+        return max(candidates, key=lambda v: (v['bitrate'], v['size']))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取探测统计"""
+        cache_stats = self.size_cache.get_stats()
+        return {
+            'probes': self.probes,
+            'probe_failures': self.probe_failures,
+            'selections': self.selections,
+            'oversized': self.oversized,
+            'uploads': self.uploads,
+            'cache_size': cache_stats['size'],
+            'cache_hits': cache_stats['hits'],
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+一次性迁移：把已有数据库切换为增量 auto_vacuum 模式
+
+切换需要一次完整 VACUUM（重写整个数据库文件，期间独占数据库，并临时占用与数据库相当的磁盘空间），
+请先停止机器人再运行。新建的数据库已默认启用增量模式，无需迁移。
+
+用法:
+    python migrate_auto_vacuum.py [--db tweets.db]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+from config import Config
+from database import Database
+
+
+def main():
+    parser = argparse.ArgumentParser(description='把数据库切换为增量 auto_vacuum 模式')
+    parser.add_argument('--db', help='数据库文件路径（默认 DATABASE_PATH）')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+    Config._init_configs()
+    db_path = args.db or Config.DATABASE_PATH
+    if not os.path.exists(db_path):
+        print(f"❌ 数据库文件不存在: {db_path}")
+        return 1
+
+    database = Database(db_path)
+    try:
+        if database.is_incremental_auto_vacuum():
+            print(f"✅ {db_path} 已启用增量 auto_vacuum，无需迁移")
+            return 0
+
+        before = database.get_storage_stats()
+        print(f"🔧 正在 VACUUM {db_path} ({before['size_bytes'] / 1024 / 1024:.1f}MB)，请确认机器人已停止...")
+        started = time.monotonic()
+        if not database.enable_incremental_auto_vacuum():
+            print("❌ 迁移失败，详见日志")
+            return 1
+        after = database.get_storage_stats()
+        print(f"✅ 已切换为增量 auto_vacuum，用时 {time.monotonic() - started:.1f}s，"
+              f"文件大小 {after['size_bytes'] / 1024 / 1024:.1f}MB")
+        return 0
+    finally:
+        database.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+配额预算模块 - 跟踪 RapidAPI 按月配额并把剩余额度均匀分配到计费周期的剩余时间
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaBudget:
+    """
+    RapidAPI 月度配额预算管理器（调用计数持久化到 SQLite）
+
+    计数在内存中维护，每次调用通过组提交排队写入，不在事件循环上等待提交；
+    每个计费周期的历史计数由 load() 在数据库线程中加载一次。
+    """
+
+    def __init__(self, database, monthly_quota: int = None, billing_day: int = None):
+        """
+        初始化配额预算
+
+        Args:
+            database: AsyncDatabase 实例，用于持久化调用计数
+            monthly_quota: 每个计费周期允许的调用次数
+            billing_day: 计费周期起始日（每月几号，1-28）
+        """
+        self.database = database
+        self.monthly_quota = monthly_quota or Config.RAPIDAPI_MONTHLY_QUOTA
+        self.billing_day = min(max(billing_day or Config.RAPIDAPI_BILLING_DAY, 1), 28)
+        self._period = None
+        self._usage = {}  # {endpoint: [calls, last_call_at]}
+        self._loaded_period = None  # 已从数据库加载计数的计费周期
+        self._load_lock = asyncio.Lock()
+        self._burst_calls = 1  # 最近一轮（60 秒内连续发生）的调用次数，用于计算配速等待
+        self.refused_calls = 0
+
+    def _period_bounds(self, now: datetime = None):
+        """计算当前计费周期的起止时间（UTC）"""
+        now = now or datetime.now(timezone.utc)
+        if now.day >= self.billing_day:
+            start = now.replace(day=self.billing_day, hour=0, minute=0, second=0, microsecond=0)
+        elif now.month == 1:
+            start = now.replace(year=now.year - 1, month=12, day=self.billing_day,
+                                hour=0, minute=0, second=0, microsecond=0)
+        else:
+            start = now.replace(month=now.month - 1, day=self.billing_day,
+                                hour=0, minute=0, second=0, microsecond=0)
+
+        if start.month == 12:
+            end = start.replace(year=start.year + 1, month=1)
+        else:
+            end = start.replace(month=start.month + 1)
+        return start, end
+
+    def _sync_period(self):
+        """进入新计费周期时清零内存计数（该周期已持久化的计数由 load() 加载）"""
+        start, _ = self._period_bounds()
+        period = start.strftime('%Y-%m-%d')
+        if period != self._period:
+            self._period = period
+            self._usage = {}
+
+    async def load(self):
+        """从数据库加载当前计费周期已持久化的调用计数（每个周期只加载一次）"""
+        self._sync_period()
+        if self._loaded_period == self._period:
+            return
+        async with self._load_lock:
+            period = self._period
+            if self._loaded_period == period:
+                return
+            usage = await self.database.get_api_usage(period)
+            if period != self._period:
+                return  # 加载期间进入了新周期，由下一次调用重新加载
+            # 加载期间已发生的调用已排队写入，取两者中较大的计数
+            for endpoint, (calls, last_call_at) in usage.items():
+                current = self._usage.setdefault(endpoint, [0, None])
+                current[0] = max(current[0], calls)
+                current[1] = max(current[1] or 0, last_call_at or 0) or None
+            self._loaded_period = period
+            logger.info(f"RapidAPI 计费周期 {period}: 已使用 {self.used()} / {self.monthly_quota}")
+
+    def used(self) -> int:
+        """当前计费周期内已使用的调用次数"""
+        return sum(calls for calls, _ in self._usage.values())
+
+    def remaining(self) -> int:
+        """当前计费周期内剩余的调用次数"""
+        self._sync_period()
+        return max(self.monthly_quota - self.used(), 0)
+
+    def _last_call_at(self) -> Optional[float]:
+        last_calls = [last_call_at for _, last_call_at in self._usage.values() if last_call_at]
+        return max(last_calls) if last_calls else None
+
+    def pace_interval(self) -> float:
+        """把剩余额度均匀分配到周期剩余时间后，两次调用之间的最小间隔（秒）"""
+        remaining = self.remaining()
+        _, end = self._period_bounds()
+        seconds_left = max((end - datetime.now(timezone.utc)).total_seconds(), 0)
+        if remaining <= 0:
+            return seconds_left
+        return seconds_left / remaining
+
+    def seconds_until_next_call(self) -> float:
+        """距离按配速允许的下一次调用还需等待的秒数（0 表示现在即可调用）"""
+        self._sync_period()
+        if self.remaining() <= 0:
+            _, end = self._period_bounds()
+            return max((end - datetime.now(timezone.utc)).total_seconds(), 0)
+
+        last_call_at = self._last_call_at()
+        if not last_call_at:
+            return 0
+        return max(last_call_at + self.pace_interval() * self._burst_calls - time.time(), 0)
+
+    def try_acquire(self, endpoint: str, cost: int = 1) -> bool:
+        """
+        申请一次调用额度，剩余额度不足时拒绝
+
+        Args:
+            endpoint: 接口路径
+            cost: 本次调用消耗的额度
+
+        Returns:
+            是否允许调用（允许时立即计数，并排队持久化）
+        """
+        if self.remaining() < cost:
+            self.refused_calls += 1
+            logger.warning(f"RapidAPI 月度配额已用尽 ({self.used()}/{self.monthly_quota})，拒绝调用 {endpoint}")
+            return False
+
+        now = time.time()
+        last_call_at = self._last_call_at()
+        if last_call_at and now - last_call_at < 60:
+            self._burst_calls += cost
+        else:
+            self._burst_calls = cost
+
+        usage = self._usage.setdefault(endpoint, [0, None])
+        usage[0] += cost
+        usage[1] = now
+        self.database.queue_api_call(self._period, endpoint, now, cost)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取配额状态"""
+        self._sync_period()
+        start, end = self._period_bounds()
+        return {
+            'period_start': start,
+            'period_end': end,
+            'monthly_quota': self.monthly_quota,
+            'used': self.used(),
+            'remaining': self.remaining(),
+            'pace_interval': self.pace_interval(),
+            'next_call_in': self.seconds_until_next_call(),
+            'refused_calls': self.refused_calls,
+            'endpoints': {endpoint: calls for endpoint, (calls, _) in self._usage.items()},
+        }
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+容错模块 - 为外部 HTTP 接口提供重试、抖动退避与熔断
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Callable, Any
+
+import aiohttp
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 错误类别
+ERROR_RATE_LIMITED = 'rate_limited'
+ERROR_SERVER = 'server_error'
+ERROR_CLIENT = 'client_error'
+ERROR_NOT_FOUND = 'not_found'
+ERROR_TIMEOUT = 'timeout'
+ERROR_NETWORK = 'network'
+ERROR_CIRCUIT_OPEN = 'circuit_open'
+ERROR_QUOTA_EXHAUSTED = 'quota_exhausted'
+ERROR_INVALID_RESPONSE = 'invalid_response'
+
+# 可重试的错误类别
+TRANSIENT_ERRORS = {ERROR_RATE_LIMITED, ERROR_SERVER, ERROR_TIMEOUT, ERROR_NETWORK}
+
+ERROR_DESCRIPTIONS = {
+    ERROR_RATE_LIMITED: "API速率限制，请稍后重试",
+    ERROR_SERVER: "API服务端错误，请稍后重试",
+    ERROR_CLIENT: "API请求被拒绝，请检查配置",
+    ERROR_NOT_FOUND: "推文或用户不存在",
+    ERROR_TIMEOUT: "网络连接超时，请稍后再试",
+    ERROR_NETWORK: "网络连接失败，请稍后再试",
+    ERROR_CIRCUIT_OPEN: "API连续失败已熔断，暂停调用",
+    ERROR_QUOTA_EXHAUSTED: "RapidAPI月度配额已用尽",
+    ERROR_INVALID_RESPONSE: "API返回数据格式异常",
+}
+
+
+class TwitterAPIError(Exception):
+    """外部接口调用失败（携带错误类别）"""
+
+    def __init__(self, category: str, message: str = "", status: int = None):
+        self.category = category
+        self.status = status
+        super().__init__(message or ERROR_DESCRIPTIONS.get(category, category))
+
+    @property
+    def description(self) -> str:
+        """面向管理员的中文错误说明"""
+        return ERROR_DESCRIPTIONS.get(self.category, str(self))
+
+
+class CircuitBreaker:
+    """简单的熔断器：连续失败达到阈值后打开，冷却时间后进入半开状态试探"""
+
+    STATE_CLOSED = 'closed'
+    STATE_OPEN = 'open'
+    STATE_HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = None, recovery_timeout: int = None):
+        """
+        初始化熔断器
+
+        Args:
+            name: 熔断器名称（用于日志）
+            failure_threshold: 连续失败多少次后熔断
+            recovery_timeout: 熔断后多久允许试探请求（秒）
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout or Config.CIRCUIT_RECOVERY_TIMEOUT
+        self.failures = 0
+        self.opened_until = 0.0
+        self.state = self.STATE_CLOSED
+
+    def allow_request(self) -> bool:
+        """当前是否允许发起请求"""
+        if self.state == self.STATE_OPEN:
+            if time.monotonic() >= self.opened_until:
+                self.state = self.STATE_HALF_OPEN
+                logger.info(f"熔断器 {self.name} 进入半开状态，允许试探请求")
+                return True
+            return False
+        return True
+
+    def is_available(self) -> bool:
+        """只读判断当前是否允许发起请求（不会把熔断器切换到半开状态）"""
+        return self.state != self.STATE_OPEN or time.monotonic() >= self.opened_until
+
+    def retry_in(self) -> float:
+        """熔断打开时距离允许试探还需等待的秒数"""
+        if self.state != self.STATE_OPEN:
+            return 0
+        return max(self.opened_until - time.monotonic(), 0)
+
+    def record_success(self) -> None:
+        if self.state != self.STATE_CLOSED:
+            logger.info(f"熔断器 {self.name} 已恢复")
+        self.failures = 0
+        self.state = self.STATE_CLOSED
+
+    def record_failure(self, cooldown: float = None) -> None:
+        """
+        记录一次失败
+
+        Args:
+            cooldown: 指定熔断时长（例如服务端 Retry-After），默认使用 recovery_timeout
+        """
+        self.failures += 1
+        if self.state == self.STATE_HALF_OPEN or self.failures >= self.failure_threshold or cooldown:
+            self.trip(cooldown)
+
+    def trip(self, cooldown: float = None) -> None:
+        """立即打开熔断器"""
+        cooldown = cooldown or self.recovery_timeout
+        self.state = self.STATE_OPEN
+        self.opened_until = time.monotonic() + cooldown
+        logger.warning(f"熔断器 {self.name} 已打开，{int(cooldown)} 秒内暂停请求 (连续失败 {self.failures} 次)")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 响应头（秒数或 HTTP 日期）"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = None, max_delay: float = None) -> float:
+    """指数退避 + 全抖动（full jitter）"""
+    base = base if base is not None else Config.HTTP_BACKOFF_BASE
+    max_delay = max_delay if max_delay is not None else Config.HTTP_BACKOFF_MAX
+    return random.uniform(0, min(max_delay, base * (2 ** attempt)))
+
+
+def classify_status(status: int) -> str:
+    """根据 HTTP 状态码判断错误类别"""
+    if status == 429:
+        return ERROR_RATE_LIMITED
+    if status == 404:
+        return ERROR_NOT_FOUND
+    if status >= 500:
+        return ERROR_SERVER
+    return ERROR_CLIENT
+
+
+async def request_json(session: aiohttp.ClientSession, url: str, breaker: CircuitBreaker,
+                       before_attempt: Callable[[], None] = None, max_retries: int = None,
+                       loads: Callable[[bytes], Any] = json.loads, **kwargs) -> Any:
+    """
+    带重试、退避与熔断的 GET JSON 请求
+
+    Args:
+        session: 共享的 aiohttp 会话
+        url: 请求地址
+        breaker: 该接口对应的熔断器
+        before_attempt: 每次实际发出请求前调用的钩子（例如配额扣减），可抛出 TwitterAPIError 终止请求
+        max_retries: 瞬时错误的最大重试次数
+        loads: JSON 解码函数（接收响应原始字节）
+        **kwargs: 传递给 session.get 的参数
+
+    Returns:
+        解析后的 JSON 数据
+
+    Raises:
+        TwitterAPIError: 请求最终失败时抛出，携带错误类别
+    """
+    max_retries = Config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+    last_error = None
+
+    for attempt in range(max_retries + 1):
+        if not breaker.allow_request():
+            raise TwitterAPIError(ERROR_CIRCUIT_OPEN,
+                                  f"{breaker.name} 已熔断，{int(breaker.retry_in())} 秒后重试")
+
+        if before_attempt:
+            before_attempt()
+
+        retry_after = None
+        try:
+            async with session.get(url, **kwargs) as response:
+                if response.status == 200:
+                    try:
+                        data = loads(await response.read())
+                    except ValueError as e:
+                        breaker.record_success()
+                        raise TwitterAPIError(ERROR_INVALID_RESPONSE, f"JSON 解析失败: {e}", response.status)
+                    breaker.record_success()
+                    return data
+
+                category = classify_status(response.status)
+                body = (await response.text())[:200]
+                last_error = TwitterAPIError(category, f"HTTP {response.status}: {body}", response.status)
+                if category == ERROR_RATE_LIMITED:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        except asyncio.TimeoutError:
+            last_error = TwitterAPIError(ERROR_TIMEOUT)
+        except aiohttp.ClientError as e:
+            last_error = TwitterAPIError(ERROR_NETWORK, f"网络请求错误: {e}")
+
+        if last_error.category not in TRANSIENT_ERRORS:
+            # 非瞬时错误（如 404/401）说明接口本身可用，不计入熔断
+            if last_error.category in (ERROR_NOT_FOUND, ERROR_CLIENT):
+                breaker.record_success()
+            raise last_error
+
+        if attempt >= max_retries:
+            break
+
+        delay = retry_after if retry_after is not None else backoff_delay(attempt)
+        if delay > Config.HTTP_BACKOFF_MAX:
+            # 服务端要求的等待时间过长，直接熔断到指定时间而不是阻塞等待
+            breaker.record_failure(cooldown=delay)
+            raise last_error
+
+        logger.warning(f"{breaker.name} 请求失败 ({last_error.category})，{delay:.1f} 秒后第 {attempt + 1} 次重试")
+        await asyncio.sleep(delay)
+
+    breaker.record_failure(cooldown=retry_after or None)
+    raise last_error
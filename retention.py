@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+数据保留模块 - 定期按各表的保留策略分批删除过期数据，并以增量 VACUUM 归还磁盘空间
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionJob:
+    """
+    数据保留任务
+
+    每个表按 Database.RETENTION_POLICIES 中的键列做键集分页，每批删除 RETENTION_CHUNK_SIZE 行并单独提交；
+    每批都是数据库线程上的一次独立请求，其他处理器的数据库调用可以插在批次之间执行，不会被整轮清理阻塞。
+    删除完成后分多次执行 PRAGMA incremental_vacuum 归还空闲页。
+    """
+
+    def __init__(self, database, interval: int = None):
+        """
+        初始化数据保留任务
+
+        Args:
+            database: AsyncDatabase 实例
+            interval: 运行间隔（秒）
+        """
+        self.database = database
+        self.interval = interval or Config.RETENTION_INTERVAL
+        self.running = False
+        self.runs = 0
+        self.last_run_at = None
+        self.last_duration = 0.0
+        self.last_rows_removed = 0
+        self.last_bytes_reclaimed = 0
+        self.rows_removed = Counter()  # 表 -> 累计删除行数
+        self.bytes_reclaimed = 0
+
+    def is_due(self, now: datetime = None) -> bool:
+        """是否到了运行时间"""
+        if self.running:
+            return False
+        if not self.last_run_at:
+            return True
+        now = now or datetime.now()
+        return (now - self.last_run_at).total_seconds() >= self.interval
+
+    async def run(self) -> Dict[str, int]:
+        """
+        执行一轮清理
+
+        Returns:
+            本轮各表删除的行数
+        """
+        if self.running:
+            return {}
+        self.running = True
+        started = time.monotonic()
+        removed = {}
+        try:
+            for table in self.database.RETENTION_POLICIES:
+                cutoff = self.database.retention_cutoff(table)
+                if cutoff is None:
+                    continue
+                removed[table], after = 0, None
+                while True:
+                    deleted, after = await self.database.delete_expired_rows(table, cutoff, after)
+                    removed[table] += deleted
+                    if after is None:
+                        break
+                    await asyncio.sleep(0)
+                self.rows_removed[table] += removed[table]
+
+            reclaimed = 0
+            while True:
+                freed, remaining = await self.database.incremental_vacuum()
+                reclaimed += freed
+                if not freed or not remaining:
+                    break
+                await asyncio.sleep(0)
+
+            self.runs += 1
+            self.last_rows_removed = sum(removed.values())
+            self.last_bytes_reclaimed = reclaimed
+            self.bytes_reclaimed += reclaimed
+            self.last_duration = time.monotonic() - started
+            detail = ", ".join(f"{table} {count}" for table, count in removed.items()) or "无"
+            logger.info(f"🧹 数据保留任务完成: 删除 {detail} 行，回收 {reclaimed / 1024:.0f}KB，"
+                        f"用时 {self.last_duration:.1f}s")
+            return removed
+        except Exception as e:
+            logger.error(f"数据保留任务失败: {e}")
+            return removed
+        finally:
+            self.last_run_at = datetime.now()
+            self.running = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取数据保留任务统计"""
+        return {
+            'runs': self.runs,
+            'last_run_at': self.last_run_at,
+            'last_duration': self.last_duration,
+            'last_rows_removed': self.last_rows_removed,
+            'last_bytes_reclaimed': self.last_bytes_reclaimed,
+            'rows_removed': dict(self.rows_removed),
+            'total_rows_removed': sum(self.rows_removed.values()),
+            'bytes_reclaimed': self.bytes_reclaimed,
+        }
@@ -4,6 +4,7 @@ from telegram import Bot, Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, MessageHandler, filters, ContextTypes
 from telegram.error import TelegramError
 from config import Config
+from tweet_model import Tweet
 from utils import utils
 
 logger = logging.getLogger(__name__)
@@ -26,11 +27,11 @@ class TelegramNotifier:
         ]
         return InlineKeyboardMarkup(keyboard)
     
-    async def send_tweet_notification(self, username, tweet_text, tweet_url, created_at):
+    async def send_tweet_notification(self, tweet: Tweet):
         """发送推文通知"""
         try:
             # 构建消息内容
-            message = self._format_tweet_message(username, tweet_text, tweet_url, created_at)
+            message = self._format_tweet_message(tweet)
             
             # 发送消息
             await self.bot.send_message(
@@ -41,7 +42,7 @@ class TelegramNotifier:
                 reply_markup=self._create_order_bot_button()
             )
             
-            logger.info(f"成功发送推文通知: {tweet_url}")
+            logger.info(f"成功发送推文通知: {tweet.url}")
             return True
             
         except TelegramError as e:
@@ -51,26 +52,25 @@ class TelegramNotifier:
             logger.error(f"发送通知时发生未知错误: {e}")
             return False
     
-    def _format_tweet_message(self, username, tweet_text, tweet_url, created_at):
+    def _format_tweet_message(self, tweet: Tweet):
         """格式化推文消息"""
         # 限制推文文本长度
-        max_text_length = 200
-        if len(tweet_text) > max_text_length:
-            tweet_text = tweet_text[:max_text_length] + "..."
+        tweet_text = utils.truncate_text(tweet.text, 200)
         
         # 转义HTML特殊字符 - 使用utils模块
         tweet_text = utils.escape_html(tweet_text)
+        username = tweet.username
         safe_username = username if utils.is_safe_twitter_username(username) else Config.TWITTER_USERNAME
         safe_username = safe_username if utils.is_safe_twitter_username(safe_username) else "i"
         display_username = utils.escape_html(username)
-        safe_tweet_url = tweet_url if utils.is_safe_twitter_url(tweet_url) else f"https://x.com/{safe_username}"
+        safe_tweet_url = tweet.url if utils.is_safe_twitter_url(tweet.url) else f"https://x.com/{safe_username}"
         
         message = f"""
 🐦 <b>新推文提醒</b>
 
 👤 <b>用户:</b> <a href="https://x.com/{safe_username}">@{display_username}</a>
 📝 <b>内容:</b> {tweet_text}
-🕒 <b>时间:</b> {utils.escape_html(str(created_at))}
+🕒 <b>时间:</b> {tweet.created_at_text}
 
 🔗 <a href="{safe_tweet_url}">查看原推文</a>
         """.strip()
@@ -109,10 +109,10 @@ class TelegramNotifier:
             return False
 
 # 同步包装器函数
-def send_tweet_notification_sync(username, tweet_text, tweet_url, created_at):
+def send_tweet_notification_sync(tweet: Tweet):
     """同步发送推文通知"""
     notifier = TelegramNotifier()
-    return asyncio.run(notifier.send_tweet_notification(username, tweet_text, tweet_url, created_at))
+    return asyncio.run(notifier.send_tweet_notification(tweet))
 
 def send_status_message_sync(message):
     """同步发送状态消息"""
@@ -222,13 +222,13 @@ class TelegramBotListener:
 
                         # 发送最新推文
                         safe_username = username if utils.is_safe_twitter_username(username) else "i"
-                        safe_tweet_url = tweet.get('url') if utils.is_safe_twitter_url(tweet.get('url')) else f"https://x.com/{safe_username}"
+                        safe_tweet_url = tweet.url if utils.is_safe_twitter_url(tweet.url) else f"https://x.com/{safe_username}"
 
                         message = f"""
 🐦 <b><a href="https://x.com/{safe_username}">@{utils.escape_html(username)}</a> 的最新推文</b>
 
-📝 <b>内容:</b> {utils.escape_html(tweet['text'])}
-🕒 <b>时间:</b> {tweet['created_at'].strftime('%Y-%m-%d %H:%M:%S UTC')}
+📝 <b>内容:</b> {utils.escape_html(tweet.text)}
+🕒 <b>时间:</b> {tweet.created_at_text}
 
 🔗 <a href="{safe_tweet_url}">查看原推文</a>
                         """.strip()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+时间线解析模块 - 惰性解析 twitter241 /user-tweets 返回的时间线，只在推文真正需要转发时才解析日期与媒体
+"""
+
+import json
+import logging
+from typing import Any, Iterator, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库
+    orjson = None
+
+from tweet_model import Tweet, TweetMedia, VideoVariant, parse_twitter_date
+
+logger = logging.getLogger(__name__)
+
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """使用可用的最快 JSON 后端解码（orjson 优先，回退到标准库 json）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def extract_media(legacy_tweet: dict) -> Tuple[TweetMedia, ...]:
+    """从 legacy 推文结构中提取媒体 (Twtttr 接口格式)"""
+    media_items = []
+    for m in (legacy_tweet.get("extended_entities") or {}).get("media") or ():
+        media_type = m.get("type")
+        media_url = m.get("media_url_https")
+
+        variants = ()
+        if media_type == "video" or media_type == "animated_gif":
+            # 收集全部 mp4 版本（按码率从高到低），发送时再按文件大小挑选
+            variants = tuple(sorted(
+                (
+                    VideoVariant(v["url"], v.get("bitrate", 0))
+                    for v in (m.get("video_info") or {}).get("variants") or ()
+                    if v.get("content_type") == "video/mp4" and v.get("url")
+                ),
+                key=lambda v: v.bitrate,
+                reverse=True
+            ))
+
+            if variants:
+                media_url = variants[0].url
+
+        media_items.append(TweetMedia(media_type, media_url, m.get("media_url_https"), variants))
+    return tuple(media_items)
+
+
+class TimelineTweet:
+    """时间线中的一条原创推文（只持有 legacy 引用，日期与媒体在转换为 Tweet 时才解析）"""
+
+    __slots__ = ('legacy', 'tweet_id', 'id')
+
+    def __init__(self, legacy: dict):
+        self.legacy = legacy
+        self.tweet_id = legacy.get("id_str") or ''
+        self.id = int(self.tweet_id) if self.tweet_id.isdigit() else 0
+
+    def to_tweet(self, username: str) -> Tweet:
+        """转换为共享的 Tweet 记录"""
+        return Tweet(
+            id=self.id,
+            text=self.legacy.get("full_text") or '',
+            created_at=parse_twitter_date(self.legacy.get("created_at")),
+            url=f"https://twitter.com/{username}/status/{self.tweet_id}",
+            username=username,
+            media=extract_media(self.legacy)
+        )
+
+
+def iter_timeline_tweets(data: Union[dict, bytes, str]) -> Iterator[TimelineTweet]:
+    """
+    按时间线顺序惰性产出原创推文（单次遍历内展开 TweetWithVisibilityResults 并跳过转推）
+
+    Args:
+        data: /user-tweets 响应（已解码的字典或原始 JSON）
+
+    Yields:
+        TimelineTweet 记录
+    """
+    if isinstance(data, (bytes, str)):
+        data = loads(data)
+
+    instructions = (((data.get("result") or {}).get("timeline") or {}).get("instructions")) or []
+
+    entries = ()
+    for inst in instructions:
+        if inst.get("type") == "TimelineAddEntries":
+            entries = inst.get("entries") or ()
+            break
+
+    for entry in entries:
+        content = entry.get("content")
+        # 只处理普通的 Tweet 条目（跳过置顶、分页游标等）
+        if not content or content.get("entryType") != "TimelineTimelineItem":
+            continue
+
+        item_result = ((content.get("itemContent") or {}).get("tweet_results") or {}).get("result")
+        if not item_result:
+            continue
+
+        # 处理 TweetWithVisibilityResults 嵌套
+        if item_result.get("__typename") == "TweetWithVisibilityResults":
+            item_result = item_result.get("tweet") or {}
+
+        legacy = item_result.get("legacy")
+        if not legacy or legacy.get("retweeted_status_result"):
+            continue  # 跳过转推
+
+        yield TimelineTweet(legacy)
+
+
+def extract_bottom_cursor(data: dict) -> str:
+    """
+    提取时间线的 Bottom 分页游标（用于继续读取更早的推文），不存在时返回空字符串
+
+    游标可能位于 TimelineAddEntries 的条目中，也可能由后续页的 TimelineReplaceEntry 给出
+    """
+    instructions = (((data.get("result") or {}).get("timeline") or {}).get("instructions")) or []
+    for inst in instructions:
+        if inst.get("type") == "TimelineAddEntries":
+            entries = inst.get("entries") or ()
+        elif inst.get("type") == "TimelineReplaceEntry":
+            entries = (inst.get("entry"),)
+        else:
+            continue
+        for entry in entries:
+            content = (entry or {}).get("content") or {}
+            if content.get("entryType") == "TimelineTimelineCursor" and content.get("cursorType") == "Bottom":
+                return content.get("value") or ''
+    return ''
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+推文数据模型 - 各模块共享的不可变推文记录（统一的 UTC 时间与紧凑的媒体元组）
+"""
+
+from datetime import datetime, timezone, timedelta
+from typing import NamedTuple, Optional, Tuple
+
+TWITTER_DATE_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+
+
+def parse_twitter_date(value) -> Optional[datetime]:
+    """
+    解析推特时间格式 "Sat Oct 14 00:00:00 +0000 2023" 并统一为 UTC
+
+    按固定位置切片解析，格式不符时回退到 strptime；datetime 输入直接转换为 UTC。
+
+    Returns:
+        带 UTC 时区的 datetime，无法解析时返回 None
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    if not isinstance(value, str):
+        return None
+
+    # 位置: 0-2 星期, 4-6 月, 8-9 日, 11-18 时间, 20-24 时区, 26-29 年
+    if len(value) == 30 and value[3] == ' ' and value[19] == ' ' and value[25] == ' ':
+        try:
+            month = _MONTHS[value[4:7]]
+            offset = value[20:25]
+            dt = datetime(int(value[26:30]), month, int(value[8:10]),
+                          int(value[11:13]), int(value[14:16]), int(value[17:19]),
+                          tzinfo=timezone.utc)
+            if offset != '+0000':
+                minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+                dt -= timedelta(minutes=minutes if offset[0] == '+' else -minutes)
+            return dt
+        except (KeyError, ValueError):
+            pass
+
+    try:
+        return datetime.strptime(value, TWITTER_DATE_FORMAT).astimezone(timezone.utc)
+    except ValueError:
+        return None
+
+
+class VideoVariant(NamedTuple):
+    """视频的一个 mp4 版本"""
+    url: str
+    bitrate: int = 0
+
+
+class TweetMedia(NamedTuple):
+    """推文中的单个媒体"""
+    type: str
+    url: Optional[str]
+    preview_image_url: Optional[str]
+    variants: Tuple[VideoVariant, ...] = ()  # 按码率从高到低
+
+
+class Tweet(NamedTuple):
+    """不可变的推文记录"""
+    id: int
+    text: str
+    created_at: Optional[datetime]  # UTC，无法解析时为 None
+    url: str
+    username: str
+    media: Tuple[TweetMedia, ...] = ()
+
+    @property
+    def has_media(self) -> bool:
+        return bool(self.media)
+
+    @property
+    def preview_image_url(self) -> Optional[str]:
+        """第一个媒体的预览图"""
+        for item in self.media:
+            if item.preview_image_url:
+                return item.preview_image_url
+        return None
+
+    @property
+    def timestamp(self) -> float:
+        """发布时间的 Unix 时间戳（时间未知时为 0）"""
+        return self.created_at.timestamp() if self.created_at else 0
+
+    @property
+    def created_at_text(self) -> str:
+        """用于消息展示的发布时间"""
+        return self.created_at.strftime('%Y-%m-%d %H:%M:%S UTC') if self.created_at else '未知'
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+单推文查询模块 - 多个上游接口统一归一化为共享的 Tweet 记录，并按延迟做对冲请求（hedged request）
+"""
+
+import asyncio
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Optional, Iterable, List, Dict, Any, Union
+
+from config import Config
+from resilience import (
+    CircuitBreaker, TwitterAPIError, request_json,
+    ERROR_NOT_FOUND, ERROR_INVALID_RESPONSE, ERROR_TIMEOUT, ERROR_CIRCUIT_OPEN
+)
+from timeline_parser import extract_media
+from tweet_model import Tweet, TweetMedia, VideoVariant, parse_twitter_date
+from utils import utils
+
+logger = logging.getLogger(__name__)
+
+
+def build_tweet_info(tweet_id: str, text: str, created_at: Union[datetime, str, None], tweet_url: str,
+                     screen_name: str, username: str, media_list: List[TweetMedia]) -> Tweet:
+    """把各接口解析出的字段组合为共享的 Tweet 记录（含安全校验）"""
+    if not utils.is_safe_twitter_url(tweet_url):
+        tweet_url = f"https://twitter.com/i/status/{tweet_id}"
+
+    if not utils.is_safe_twitter_username(screen_name):
+        screen_name = username if utils.is_safe_twitter_username(username) else 'Unknown'
+
+    return Tweet(
+        id=int(tweet_id),
+        text=text or '',
+        created_at=parse_twitter_date(created_at) or datetime.now(timezone.utc),
+        url=tweet_url,
+        username=screen_name,
+        media=tuple(media_list)
+    )
+
+
+def build_media_item(media_type: str, media_url: Optional[str], thumb_url: Optional[str],
+                     variants: Iterable[VideoVariant] = ()) -> TweetMedia:
+    """构建单个媒体条目，只保留白名单域名内的链接"""
+    safe_media_url = media_url if utils.is_safe_twitter_media_url(media_url) else None
+    safe_thumb_url = thumb_url if utils.is_safe_twitter_media_url(thumb_url) else None
+
+    safe_variants = [v for v in variants if utils.is_safe_twitter_media_url(v.url)]
+    if not safe_variants and media_type in ('video', 'animated_gif') and safe_media_url:
+        # 接口只给出单个视频链接时，把它作为唯一候选版本
+        safe_variants = [VideoVariant(safe_media_url)]
+
+    return TweetMedia(
+        type=media_type,
+        url=safe_media_url,
+        preview_image_url=safe_thumb_url or (safe_media_url if media_type == 'photo' else None),
+        variants=tuple(sorted(safe_variants, key=lambda v: v.bitrate, reverse=True))
+    )
+
+
+class TweetProvider(ABC):
+    """单推文查询接口基类（记录请求延迟的 EWMA，用于排序接口和估算对冲等待时间）"""
+
+    name = 'base'
+    EWMA_ALPHA = 0.2
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+        self.breaker = CircuitBreaker(self.name)
+        self.latency_ewma = None  # 平均延迟（秒）
+        self.latency_var = 0.0  # 延迟方差的指数加权估计
+        self.consecutive_failures = 0  # 连续失败次数，大于 0 时排在正常接口之后
+        self.last_used_at = None  # 最近一次发起请求的时间（单调时钟）
+        self.requests = 0
+        self.wins = 0
+
+    def record_latency(self, seconds: float) -> None:
+        """更新延迟的指数加权均值与方差"""
+        if self.latency_ewma is None:
+            self.latency_ewma = seconds
+            self.latency_var = 0.0
+            return
+        delta = seconds - self.latency_ewma
+        self.latency_ewma += self.EWMA_ALPHA * delta
+        self.latency_var = (1 - self.EWMA_ALPHA) * (self.latency_var + self.EWMA_ALPHA * delta * delta)
+
+    def p90(self) -> Optional[float]:
+        """基于正态近似估算的 p90 延迟（秒），无样本时返回 None"""
+        if self.latency_ewma is None:
+            return None
+        return self.latency_ewma + 1.2816 * math.sqrt(self.latency_var)
+
+    @abstractmethod
+    def build_url(self, tweet_id: str) -> str:
+        """构建查询推文的接口地址"""
+
+    @abstractmethod
+    def parse(self, data: Any, tweet_id: str, username: Optional[str]) -> Optional[Tweet]:
+        """把接口返回的数据归一化为 Tweet 记录，推文不存在时返回 None"""
+
+    async def fetch(self, session, tweet_id: str, username: Optional[str] = None) -> Optional[Tweet]:
+        """
+        查询推文并归一化
+
+        Returns:
+            Tweet 记录；推文不存在时返回 None
+
+        Raises:
+            TwitterAPIError: 接口不可用时抛出
+        """
+        try:
+            async with self.timed():
+                data = await request_json(session, self.build_url(tweet_id), self.breaker, max_retries=0)
+        except TwitterAPIError as e:
+            if e.category == ERROR_NOT_FOUND:
+                return None
+            raise
+
+        if not isinstance(data, dict):
+            raise TwitterAPIError(ERROR_INVALID_RESPONSE, f"{self.name} 返回数据格式异常")
+        return self.parse(data, tweet_id, username)
+
+    @asynccontextmanager
+    async def timed(self):
+        """
+        统计一次请求：成功或推文不存在时记录延迟样本，失败时累计连续失败次数
+
+        被对冲请求淘汰（取消）时实际延迟至少为已等待的时间，只在它高于当前均值时记入，
+        不会让较慢的接口看起来更快
+        """
+        self.requests += 1
+        self.last_used_at = started = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            elapsed = time.monotonic() - started
+            if self.latency_ewma is None or elapsed > self.latency_ewma:
+                self.record_latency(elapsed)
+            raise
+        except TwitterAPIError as e:
+            if e.category == ERROR_NOT_FOUND:
+                self.consecutive_failures = 0
+                self.record_latency(time.monotonic() - started)
+            else:
+                self.consecutive_failures += 1
+            raise
+        except Exception:
+            self.consecutive_failures += 1
+            raise
+        self.consecutive_failures = 0
+        self.record_latency(time.monotonic() - started)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'latency_ms': int(self.latency_ewma * 1000) if self.latency_ewma is not None else None,
+            'p90_ms': int(self.p90() * 1000) if self.p90() is not None else None,
+            'requests': self.requests,
+            'wins': self.wins,
+            'consecutive_failures': self.consecutive_failures,
+            'breaker': self.breaker.state,
+        }
+
+
+class VxTwitterProvider(TweetProvider):
+    """api.vxtwitter.com 接口"""
+
+    name = 'vxtwitter'
+
+    def build_url(self, tweet_id: str) -> str:
+        return f"{self.base_url}/Twitter/status/{tweet_id}"
+
+    # vxtwitter 的媒体类型命名与推特原生结构不同
+    MEDIA_TYPES = {'image': 'photo', 'gif': 'animated_gif'}
+
+    def parse(self, data, tweet_id, username):
+        media_list = [
+            build_media_item(self.MEDIA_TYPES.get(m.get('type'), m.get('type')), m.get('url'), m.get('thumbnail_url'))
+            for m in data.get('media_extended', []) or []
+        ]
+
+        created_at_epoch = data.get('date_epoch')
+        dt = datetime.fromtimestamp(created_at_epoch, tz=timezone.utc) if created_at_epoch else None
+
+        return build_tweet_info(
+            str(data.get('tweetID', tweet_id)),
+            data.get('text', ''),
+            dt,
+            data.get('tweetURL', f"https://twitter.com/i/status/{tweet_id}"),
+            data.get('user_screen_name', username or 'Unknown'),
+            username,
+            media_list
+        )
+
+
+class FxTwitterProvider(TweetProvider):
+    """api.fxtwitter.com 兼容接口"""
+
+    name = 'fxtwitter'
+
+    def build_url(self, tweet_id: str) -> str:
+        return f"{self.base_url}/status/{tweet_id}"
+
+    def parse(self, data, tweet_id, username):
+        tweet = data.get('tweet')
+        if data.get('code') == 404 or not isinstance(tweet, dict):
+            return None
+
+        media_list = []
+        for m in (tweet.get('media') or {}).get('all', []) or []:
+            media_type = m.get('type')
+            if media_type == 'gif':
+                media_type = 'animated_gif'
+            variants = [
+                VideoVariant(v['url'], v.get('bitrate') or 0)
+                for v in m.get('variants') or m.get('formats') or []
+                if v.get('url') and (v.get('content_type') == 'video/mp4' or v.get('container') == 'mp4')
+            ]
+            media_list.append(build_media_item(media_type, m.get('url'), m.get('thumbnail_url'), variants))
+
+        created_timestamp = tweet.get('created_timestamp')
+        dt = datetime.fromtimestamp(created_timestamp, tz=timezone.utc) if created_timestamp else None
+
+        return build_tweet_info(
+            str(tweet.get('id', tweet_id)),
+            tweet.get('text', ''),
+            dt,
+            tweet.get('url', f"https://twitter.com/i/status/{tweet_id}"),
+            (tweet.get('author') or {}).get('screen_name', username or 'Unknown'),
+            username,
+            media_list
+        )
+
+
+class RapidApiTweetProvider(TweetProvider):
+    """RapidAPI twitter241 /tweet 接口（会消耗月度配额，默认不启用）"""
+
+    name = 'rapidapi'
+
+    def __init__(self, monitor):
+        super().__init__(monitor.base_url)
+        self.monitor = monitor
+        # 复用 RapidAPI 的熔断器与配额扣减
+        self.breaker = monitor.rapidapi_breaker
+
+    def build_url(self, tweet_id):
+        return f"{self.base_url}/tweet?pid={tweet_id}"
+
+    def _find_tweet_result(self, node, tweet_id):
+        """在 GraphQL 结构中查找 legacy.id_str 匹配的推文节点"""
+        if isinstance(node, dict):
+            if node.get("__typename") == "TweetWithVisibilityResults" and isinstance(node.get("tweet"), dict):
+                node = node["tweet"]
+            legacy = node.get("legacy")
+            if isinstance(legacy, dict) and legacy.get("id_str") == tweet_id:
+                return node
+            for value in node.values():
+                found = self._find_tweet_result(value, tweet_id)
+                if found is not None:
+                    return found
+        elif isinstance(node, list):
+            for value in node:
+                found = self._find_tweet_result(value, tweet_id)
+                if found is not None:
+                    return found
+        return None
+
+    async def fetch(self, session, tweet_id, username=None):
+        async with self.timed():
+            data = await self.monitor.make_request("/tweet", {"pid": tweet_id})
+        return self.parse(data, tweet_id, username)
+
+    def parse(self, data, tweet_id, username):
+        result = self._find_tweet_result(data, tweet_id)
+        if result is None:
+            return None
+
+        legacy = result["legacy"]
+        user_result = (result.get("core") or {}).get("user_results", {}).get("result", {})
+        screen_name = (user_result.get("legacy") or {}).get("screen_name") \
+            or (user_result.get("core") or {}).get("screen_name") \
+            or username or 'Unknown'
+
+        media_list = [
+            build_media_item(m.type, m.url, m.preview_image_url, m.variants)
+            for m in extract_media(legacy)
+        ]
+
+        return build_tweet_info(
+            tweet_id,
+            legacy.get("full_text", ''),
+            legacy.get("created_at"),
+            f"https://twitter.com/{screen_name}/status/{tweet_id}",
+            screen_name,
+            username,
+            media_list
+        )
+
+
+class HedgedTweetLookup:
+    """按延迟排序依次对冲请求多个接口，取最先成功的结果并取消其余请求"""
+
+    EXPLORE_EVERY = 20  # 每隔多少次查询优先试探一次最久未使用的接口
+
+    def __init__(self, providers: List[TweetProvider], http_client, hedge_delay: float = None,
+                 timeout: float = None):
+        """
+        初始化对冲查询
+
+        Args:
+            providers: 参与查询的接口列表
+            http_client: 共享的 PooledHttpClient
+            hedge_delay: 接口尚无延迟样本时使用的默认对冲等待时间（秒）
+            timeout: 整体查询超时时间（秒）
+        """
+        self.providers = providers
+        self.http_client = http_client
+        self.hedge_delay = hedge_delay if hedge_delay is not None else Config.TWEET_HEDGE_DELAY
+        self.timeout = timeout or Config.TWEET_LOOKUP_TIMEOUT
+        self.hedged_requests = 0
+        self.lookups = 0
+        self.explorations = 0
+
+    def _ordered_providers(self) -> List[TweetProvider]:
+        """
+        可用接口按平均延迟从快到慢排序（最近失败的排在最后，无样本的排在有样本的之后）
+
+        每 EXPLORE_EVERY 次查询把最久未使用的接口排到第一位，使曾经失败或较慢的接口恢复后能重新被选中
+        """
+        # 只读检查熔断状态：排序不应把熔断器切换到半开状态，半开试探由实际请求触发
+        available = [p for p in self.providers if p.breaker.is_available()]
+        ordered = sorted(available, key=lambda p: (
+            p.consecutive_failures > 0, p.latency_ewma is None, p.latency_ewma or 0))
+        self.lookups += 1
+        if len(ordered) > 1 and self.lookups % self.EXPLORE_EVERY == 0:
+            stalest = min(ordered, key=lambda p: p.last_used_at if p.last_used_at is not None else -math.inf)
+            if stalest is not ordered[0]:
+                self.explorations += 1
+                ordered.remove(stalest)
+                ordered.insert(0, stalest)
+        return ordered
+
+    def _hedge_after(self, provider: TweetProvider) -> float:
+        p90 = provider.p90()
+        if p90 is None:
+            return self.hedge_delay
+        return min(max(p90, 0.05), self.timeout)
+
+    async def lookup(self, tweet_id: str, username: Optional[str] = None) -> Optional[Tweet]:
+        """
+        查询推文详情
+
+        Returns:
+            Tweet 记录；所有接口均确认推文不存在时返回 None
+
+        Raises:
+            TwitterAPIError: 所有接口都不可用时抛出最后一个错误
+        """
+        providers = self._ordered_providers()
+        if not providers:
+            raise TwitterAPIError(ERROR_CIRCUIT_OPEN, "所有单推文接口均已熔断")
+
+        session = await self.http_client.get_session()
+        pending = {}  # {task: provider}
+        last_error = None
+        deadline = time.monotonic() + self.timeout
+        next_index = 0
+
+        def _launch():
+            nonlocal next_index
+            provider = providers[next_index]
+            next_index += 1
+            task = asyncio.ensure_future(provider.fetch(session, tweet_id, username))
+            pending[task] = provider
+            return provider
+
+        current = _launch()
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    last_error = TwitterAPIError(ERROR_TIMEOUT, f"单推文查询 {tweet_id} 超时")
+                    break
+
+                wait_for = remaining
+                if next_index < len(providers):
+                    wait_for = min(wait_for, self._hedge_after(current))
+
+                done, _ = await asyncio.wait(pending.keys(), timeout=wait_for,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # 当前接口超过其 p90 延迟仍未返回，对冲请求下一个接口
+                    if next_index < len(providers):
+                        self.hedged_requests += 1
+                        current = _launch()
+                        logger.info(f"单推文查询 {tweet_id} 触发对冲请求: {current.name}")
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except TwitterAPIError as e:
+                        logger.warning(f"{provider.name} 查询推文 {tweet_id} 失败 ({e.category}): {e}")
+                        last_error = e
+                        continue
+                    except Exception as e:
+                        logger.warning(f"{provider.name} 查询推文 {tweet_id} 异常: {e}")
+                        last_error = TwitterAPIError(ERROR_INVALID_RESPONSE, str(e))
+                        continue
+
+                    if result is not None:
+                        provider.wins += 1
+                        logger.info(f"通过 {provider.name} 获取推文 {tweet_id} 成功")
+                        return result
+
+                # 已返回的接口均失败或未找到推文，立即尝试下一个接口
+                if not pending and next_index < len(providers):
+                    current = _launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if last_error is not None:
+            raise last_error
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'hedged_requests': self.hedged_requests,
+            'explorations': self.explorations,
+            'providers': {p.name: p.get_stats() for p in self.providers},
+        }
+
+
+def create_providers(monitor, names: List[str] = None) -> List[TweetProvider]:
+    """根据配置创建单推文查询接口列表"""
+    names = names or Config.TWEET_PROVIDERS
+    providers = []
+    for name in names:
+        name = name.strip().lower()
+        if name == VxTwitterProvider.name:
+            providers.append(VxTwitterProvider(Config.VXTWITTER_API_BASE))
+        elif name == FxTwitterProvider.name:
+            providers.append(FxTwitterProvider(Config.FXTWITTER_API_BASE))
+        elif name == RapidApiTweetProvider.name:
+            providers.append(RapidApiTweetProvider(monitor))
+        else:
+            logger.warning(f"未知的单推文接口: {name}")
+    return providers
@@ -1,21 +1,45 @@
 import aiohttp
 import asyncio
 import logging
+import time
 from datetime import datetime, timezone, timedelta
+from async_database import AsyncDatabase
 from config import Config
 from database import Database
-from utils import utils
+from http_client import PooledHttpClient
+from media_cache import MediaDiskCache
+from media_probe import VideoVariantSelector
+from quota_budget import QuotaBudget
+from resilience import (
+    CircuitBreaker, TwitterAPIError, request_json, ERROR_QUOTA_EXHAUSTED
+)
+from timeline_parser import iter_timeline_tweets, extract_bottom_cursor, loads as json_loads
+from tweet_providers import HedgedTweetLookup, create_providers
+from utils import utils, AsyncTTLCache
 
 logger = logging.getLogger(__name__)
 
 class TwitterMonitor:
     """Twitter监控类 (基于 RapidAPI twitter241)"""
     
-    def __init__(self):
+    def __init__(self, database=None):
         self.config = Config()
-        self.database = Database()
+        # 与机器人共用同一个 AsyncDatabase（SQLite 读写都在数据库线程执行，不阻塞事件循环）
+        self.database = database or AsyncDatabase(Database())
         self.headers = None
-        self.base_url = "https://twitter241.p.rapidapi.com"
+        self.base_url = Config.RAPIDAPI_BASE_URL
+        self.http_client = PooledHttpClient()  # 长连接复用的共享 HTTP 客户端
+        self.quota = QuotaBudget(self.database)  # RapidAPI 月度配额预算
+        # RapidAPI 熔断器（单推文查询接口各自持有独立的熔断器）
+        self.rapidapi_breaker = CircuitBreaker("RapidAPI")
+        # 多接口对冲的单推文查询
+        self.tweet_lookup = HedgedTweetLookup(create_providers(self), self.http_client)
+        self.last_check_errors = {}  # 最近一次 check_accounts 中各账号的错误类别
+        # 单推文详情缓存（并发请求同一推文时合并为一次上游请求）
+        self.tweet_cache = AsyncTTLCache(max_size=Config.TWEET_CACHE_SIZE, ttl=Config.TWEET_CACHE_TTL)
+        self.video_selector = VideoVariantSelector(self.http_client)  # 按文件大小挑选视频版本
+        self.media_cache = MediaDiskCache(self.http_client)  # Telegram 无法拉取链接时使用的本地媒体缓存
+        self._user_id_cache = {}  # 用户名 -> (rest_id, 解析时间戳) 的内存缓存
         self._setup_twitter_api()
     
     def _setup_twitter_api(self):
@@ -34,93 +58,110 @@ class TwitterMonitor:
             logger.error(f"API初始化失败: {e}")
             raise
 
-    async def _make_request(self, endpoint: str, params: dict = None) -> dict:
-        """封装 aiohttp 请求"""
-        url = f"https://twitter241.p.rapidapi.com{endpoint}"
-        
-        # 因为在常规循环里调用可能是同步结构，虽然是 async 方法
-        # 实际调用的主类如果不在协程里，需要用 asyncio.run，
-        # 但既然原本 TeleLuxBot 运行在 asyncio loop 中，我们会确保这正常工作。
+    async def make_request(self, endpoint: str, params: dict = None) -> dict:
+        """
+        封装 RapidAPI 请求（配额扣减 + 重试退避 + 熔断）
+
+        Raises:
+            TwitterAPIError: 请求最终失败时抛出，携带错误类别。用户ID解析与推文检查方法不吞掉该异常，
+                由调用方区分“无新推文”与“接口不可用”
+        """
+        url = f"{self.base_url}{endpoint}"
+
+        def _acquire_quota():
+            # 每次实际发出的请求（包括重试）都会消耗配额
+            if not self.quota.try_acquire(endpoint):
+                raise TwitterAPIError(ERROR_QUOTA_EXHAUSTED)
+
+        await self.quota.load()
+        session = await self.http_client.get_session()
         try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                async with session.get(url, params=params, timeout=15) as response:
-                    if response.status == 429:
-                        logger.warning(f"RapidAPI 触发速率限制")
-                        return None
-                    if response.status != 200:
-                        logger.error(f"API请求失败: {response.status} - {await response.text()}")
-                        return None
-                    return await response.json()
-        except Exception as e:
-            logger.error(f"网络请求错误: {e}")
-            return None
+            return await request_json(
+                session, url, self.rapidapi_breaker,
+                before_attempt=_acquire_quota, loads=json_loads,
+                params=params, headers=self.headers
+            )
+        except TwitterAPIError as e:
+            logger.error(f"RapidAPI 请求 {endpoint} 失败 ({e.category}): {e}")
+            raise
 
     def _is_rate_limit_error(self, e: Exception) -> bool:
         return '429' in str(e) or 'too many requests' in str(e).lower()
     
-    async def get_user_id(self, username):
-        """根据用户名获取用户ID (基于 twitter241 API /user)"""
+    async def _get_cached_user_id(self, username):
+        """从内存/数据库缓存中读取未过期的用户ID"""
+        key = username.lower()
+        ttl = Config.USER_ID_CACHE_TTL
+        now = time.time()
+
+        cached = self._user_id_cache.get(key)
+        if cached and now - cached[1] < ttl:
+            return cached[0]
+
+        row = await self.database.get_cached_user_id(key)
+        if row:
+            rest_id, resolved_at = row
+            resolved_at = resolved_at or 0
+            if now - resolved_at < ttl:
+                self._user_id_cache[key] = (rest_id, resolved_at)
+                return rest_id
+        return None
+
+    async def invalidate_user_id(self, username):
+        """使用户名 -> 用户ID 的缓存失效（内存与数据库）"""
+        key = username.lstrip('@').lower()
+        self._user_id_cache.pop(key, None)
+        await self.database.delete_user_id(key)
+        logger.info(f"已清除用户ID缓存: {key}")
+
+    async def get_user_id(self, username, force_refresh=False):
+        """根据用户名获取用户ID (优先读取缓存，未命中时调用 twitter241 API /user)"""
         try:
             username = username.lstrip('@')
+
+            if not force_refresh:
+                cached_id = await self._get_cached_user_id(username)
+                if cached_id:
+                    logger.info(f"用户ID缓存命中: {username} -> {cached_id}")
+                    return cached_id
             
-            data = await self._make_request("/user", {"username": username})
+            data = await self.make_request("/user", {"username": username})
             if data and data.get("result", {}).get("data", {}).get("user", {}):
                 rest_id = data["result"]["data"]["user"]["result"]["rest_id"]
                 logger.info(f"获取用户ID成功: {username} -> {rest_id}")
+                self._user_id_cache[username.lower()] = (rest_id, time.time())
+                await self.database.save_user_id(username, rest_id)
                 return rest_id
             else:
                 logger.error(f"用户不存在或结构变更: {username}")
                 return None
                 
+        except TwitterAPIError:
+            raise
         except Exception as e:
             logger.error(f"获取用户ID失败: {e}")
             return None
 
-    def _extract_media_info_from_legacy(self, legacy_tweet: dict) -> dict:
-        """从解析到的 legacy json 中提取媒体 (Twtttr 接口格式)"""
-        media_items = []
-        media_urls = []
-        preview_image_url = None
+    def _is_user_not_found(self, data: dict) -> bool:
+        """判断 /user-tweets 的返回是否为“用户不存在”结构"""
+        if not isinstance(data, dict):
+            return False
+        error_text = str(data.get("error") or data.get("message") or data.get("errors") or "").lower()
+        if "not found" in error_text or "does not exist" in error_text:
+            return True
+        result = data.get("result")
+        return isinstance(result, dict) and "timeline" not in result
 
-        extended_entities = legacy_tweet.get("extended_entities", {})
-        media_list = extended_entities.get("media", [])
-        
-        for m in media_list:
-            media_type = m.get("type")
-            media_url = m.get("media_url_https")
-            
-            if media_type == "video" or media_type == "animated_gif":
-                # 寻找视频链接中最高分辨率的
-                variants = m.get("video_info", {}).get("variants", [])
-                best_video_url = None
-                max_bitrate = -1
-                for v in variants:
-                    if v.get("content_type") == "video/mp4" and v.get("bitrate", -1) > max_bitrate:
-                        max_bitrate = v.get("bitrate")
-                        best_video_url = v.get("url")
-                
-                if best_video_url:
-                    media_url = best_video_url
-                
-            media_items.append({
-                'type': media_type,
-                'url': media_url,
-                'preview_image_url': m.get("media_url_https")
-            })
-            if media_url:
-                media_urls.append(media_url)
-            if not preview_image_url:
-                preview_image_url = m.get("media_url_https")
-
-        return {
-            'has_media': len(media_items) > 0,
-            'media_urls': media_urls,
-            'preview_image_url': preview_image_url,
-            'media': media_items
-        }
-    
-    async def get_latest_tweets(self, username, count=10):
-        """获取用户最新的推文 (基于 twitter241 API /user-tweets)"""
+    async def get_latest_tweets(self, username, count=10, since_id=0, max_pages=1):
+        """
+        获取用户最新的推文 (基于 twitter241 API /user-tweets)
+
+        Args:
+            username: Twitter 用户名
+            count: 每页请求的推文数量；未指定 since_id 时也是返回数量的上限
+            since_id: 高水位推文ID，遇到不大于该ID的推文即停止解析，返回高水位之后的全部推文
+            max_pages: 指定 since_id 时，第一页未到达高水位则沿 Bottom 游标继续向前翻页的总页数上限
+        """
         try:
             user_id = await self.get_user_id(username)
             if not user_id:
@@ -133,75 +174,54 @@ class TwitterMonitor:
                 "user": user_id,
                 "count": count
             }
-            
-            data = await self._make_request("/user-tweets", params)
-            if not data:
-                return []
 
-            # 解析推文 (twitter241 的 /user-tweets 结构为 result.timeline.instructions)
-            instructions = data.get("result", {}).get("timeline", {}).get("instructions", [])
-            
             tweet_list = []
-            
-            try:
-                entries = []
-                for inst in instructions:
-                    if inst.get("type") == "TimelineAddEntries":
-                        entries = inst.get("entries", [])
+            seen = set()
+            for page in range(max_pages if since_id else 1):
+                data = await self.make_request("/user-tweets", params)
+                if not data:
+                    break
+
+                if self._is_user_not_found(data):
+                    # 缓存的用户ID可能已失效（账号更名/注销），下次检查时重新解析
+                    logger.warning(f"/user-tweets 返回用户不存在结构，清除 {username} 的用户ID缓存")
+                    await self.invalidate_user_id(username)
+                    return []
+
+                # 解析推文 (twitter241 的 /user-tweets 结构为 result.timeline.instructions)
+                # 惰性遍历：到达高水位前的推文才会解析日期与媒体
+                reached = False
+                for record in iter_timeline_tweets(data):
+                    # 时间线按时间倒序排列，到达高水位后其余条目均已处理，直接停止解析
+                    if since_id and record.id and record.id <= since_id:
+                        logger.info(f"到达高水位 {since_id}，停止解析剩余条目")
+                        reached = True
                         break
-                
-                logger.info(f"提取到 {len(entries)} 条内容项")
-                
-                for entry in entries:
-                    content = entry.get("content", {})
-                    # 我们只处理普通的 Tweet
-                    if content.get("entryType") == "TimelineTimelineItem":
-                        item_result = content.get("itemContent", {}).get("tweet_results", {}).get("result", {})
-                        if not item_result:
-                            continue
-                            
-                        # 处理 TweetWithVisibilityResults 嵌套
-                        if item_result.get("__typename") == "TweetWithVisibilityResults":
-                            item_result = item_result.get("tweet", {})
-                            
-                        # 排除转推
-                        legacy = item_result.get("legacy", {})
-                        if not legacy or legacy.get("retweeted_status_result"):
-                            continue  # 跳过转推
-                        
-                        tweet_id = legacy.get("id_str")
-                        text = legacy.get("full_text")
-                        
-                        # 将时间字符串 "Sat Oct 14 00:00:00 +0000 2023" 转为 datetime 对象
-                        # 或者为了兼容下游直接存 string，如果外层是 datetime 建议使用 parsed
-                        created_at_str = legacy.get("created_at")
-                        try:
-                            # 格式化日期：Sat Dec 14 02:45:00 +0000 2019
-                            dt = datetime.strptime(created_at_str, '%a %b %d %H:%M:%S %z %Y')
-                        except:
-                            dt = created_at_str  # fallback
-
-                        media_info = self._extract_media_info_from_legacy(legacy)
-
-                        tweet_info = {
-                            'id': int(tweet_id) if tweet_id else 0,
-                            'text': text,
-                            'created_at': dt,
-                            'url': f"https://twitter.com/{username}/status/{tweet_id}",
-                            'username': username,
-                            **media_info
-                        }
-                        tweet_list.append(tweet_info)
-                        
-                        if len(tweet_list) >= count:
-                            break
-                            
-            except KeyError as e:
-                logger.error(f"解析 JSON 结构出错，请检查 RapidAPI 结构是否更改: {e}")
+                    if record.id in seen:
+                        continue  # 翻页期间发布新推文时，相邻两页可能有重叠
+                    seen.add(record.id)
+
+                    tweet_list.append(record.to_tweet(username))
+                    if not since_id and len(tweet_list) >= count:
+                        break
+
+                if not since_id or reached:
+                    break
+                cursor = extract_bottom_cursor(data)
+                if not cursor:
+                    break
+                if page + 1 >= max_pages:
+                    # 两次检查之间的新推文超过翻页上限：更早的推文将被高水位越过，需调大翻页上限或缩短检查间隔
+                    logger.warning(f"@{username} 翻页 {max_pages} 页仍未到达高水位 {since_id}，更早的新推文将无法补齐")
+                    break
+                logger.info(f"@{username} 第 {page + 1} 页未到达高水位，继续向前翻页")
+                params = {**params, "cursor": cursor}
                 
             logger.info(f"最终捕获了 {len(tweet_list)} 条有效推文")
             return tweet_list
 
+        except TwitterAPIError:
+            raise
         except Exception as e:
             logger.error(f"获取推文失败: {e}")
             return []
@@ -216,94 +236,43 @@ class TwitterMonitor:
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(days=days)
         
-        recent_tweets = []
-        for tweet in latest_tweets:
-            tweet_time = tweet['created_at']
-            if isinstance(tweet_time, str):
-                try:
-                    tweet_time = datetime.strptime(tweet_time, '%a %b %d %H:%M:%S %z %Y')
-                except:
-                    pass
-                    
-            if isinstance(tweet_time, datetime):
-                # 确保是 timezone 对应的
-                if tweet_time.tzinfo is None:
-                    tweet_time = tweet_time.replace(tzinfo=timezone.utc)
-                if start_time <= tweet_time <= end_time:
-                    recent_tweets.append(tweet)
-            else:
-                # 无法解析时间的默认加进去
-                recent_tweets.append(tweet)
+        # created_at 已统一为 UTC；无法解析时间的推文默认保留
+        recent_tweets = [
+            tweet for tweet in latest_tweets
+            if tweet.created_at is None or start_time <= tweet.created_at <= end_time
+        ]
                 
         return recent_tweets[:count]
 
     async def get_tweet_by_id(self, tweet_id, username=None):
-        """根据推文ID获取推文详情 (使用免费的高可用 api.vxtwitter.com 解决直接获取单推文难题)"""
-        try:
-            tweet_id = str(tweet_id).strip()
-            if not tweet_id.isdigit():
-                logger.warning(f"非法推文ID，已拒绝请求: {tweet_id}")
-                return None
+        """根据推文ID获取推文详情（带 TTL/LRU 缓存，同一推文的并发请求只访问一次上游）"""
+        tweet_id = str(tweet_id).strip()
+        if not tweet_id.isdigit():
+            logger.warning(f"非法推文ID，已拒绝请求: {tweet_id}")
+            return None
 
-            logger.info(f"尝试通过 VxTwitter 接口获取推文详情: {tweet_id}")
-            url = f"https://api.vxtwitter.com/Twitter/status/{tweet_id}"
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=15) as resp:
-                    if resp.status != 200:
-                        logger.error(f"VxTwitter 未找到推文 {tweet_id}：{resp.status}")
-                        return None
-                        
-                    data = await resp.json()
-                    
-                    # 提取媒体
-                    media_list = []
-                    preview_image_url = None
-                    media_extended = data.get('media_extended', [])
-                    for m in media_extended:
-                        m_type = m.get('type')
-                        m_url = m.get('url')
-                        m_thumb = m.get('thumbnail_url')
-                        safe_media_url = m_url if utils.is_safe_twitter_media_url(m_url) else None
-                        safe_thumb_url = m_thumb if utils.is_safe_twitter_media_url(m_thumb) else None
-                        
-                        media_list.append({
-                            'url': safe_media_url,
-                            'type': m_type,
-                            'preview_image_url': safe_thumb_url or safe_media_url
-                        })
-                        if not preview_image_url:
-                            preview_image_url = safe_thumb_url or safe_media_url
-                    
-                    # 提取时间
-                    created_at_epoch = data.get('date_epoch')
-                    if created_at_epoch:
-                        dt = datetime.fromtimestamp(created_at_epoch, tz=timezone.utc)
-                    else:
-                        dt = datetime.now(timezone.utc)
-                        
-                    # 组合与 get_latest_tweets 结构一致的字典
-                    tweet_url = data.get('tweetURL', f"https://twitter.com/i/status/{tweet_id}")
-                    if not utils.is_safe_twitter_url(tweet_url):
-                        tweet_url = f"https://twitter.com/i/status/{tweet_id}"
-
-                    screen_name = data.get('user_screen_name', username or 'Unknown')
-                    if not utils.is_safe_twitter_username(screen_name):
-                        screen_name = username if utils.is_safe_twitter_username(username) else 'Unknown'
-
-                    tweet_info = {
-                        'id': int(data.get('tweetID', tweet_id)),
-                        'text': data.get('text', ''),
-                        'created_at': dt,
-                        'url': tweet_url,
-                        'username': screen_name,
-                        'preview_image_url': preview_image_url,
-                        'media': media_list
-                    }
-                    
-                    logger.info(f"成功获取单推文 {tweet_id} 详情！")
-                    return tweet_info
+        return await self.tweet_cache.get_or_fetch(
+            tweet_id, lambda: self._fetch_tweet_by_id(tweet_id, username)
+        )
+
+    def get_tweet_cache_stats(self):
+        """获取单推文缓存统计"""
+        return self.tweet_cache.get_stats()
+
+    async def _fetch_tweet_by_id(self, tweet_id, username=None):
+        """根据推文ID获取推文详情（按延迟对冲请求 vxtwitter / fxtwitter 等接口）"""
+        try:
+            logger.info(f"尝试获取推文详情: {tweet_id}")
+            tweet_info = await self.tweet_lookup.lookup(tweet_id, username)
+            if tweet_info:
+                logger.info(f"成功获取单推文 {tweet_id} 详情！")
+            else:
+                logger.error(f"未找到推文 {tweet_id}")
+            return tweet_info
 
+        except TwitterAPIError as e:
+            logger.error(f"获取推文 {tweet_id} 详情失败 ({e.category}): {e}")
+            raise
         except Exception as e:
             logger.error(f"获取推文 {tweet_id} 详情失败: {e}")
             return None
@@ -313,14 +282,14 @@ class TwitterMonitor:
         try:
             logger.info(f"开始检查用户 {username} 的新推文")
             
-            # 获取最新推文
-            latest_tweets = await self.get_latest_tweets(username, count=8)
+            # 获取高水位之后的全部推文（超过一页时向前翻页），由调用方决定本轮转发其中最旧的几条
+            watermark = await self.database.get_tweet_watermark(username)
+            latest_tweets = await self.get_latest_tweets(username, count=20, since_id=watermark,
+                                                         max_pages=Config.TWEET_BACKFILL_MAX_PAGES)
             
-            new_tweets = []
-            for tweet in latest_tweets:
-                # 检查是否已经处理过
-                if not self.database.is_tweet_processed(str(tweet['id'])):
-                    new_tweets.append(tweet)
+            # 批量检查是否已经处理过（内存集合命中时无需查询数据库）
+            unprocessed_ids = set(await self.database.filter_unprocessed([tweet.id for tweet in latest_tweets]))
+            new_tweets = [tweet for tweet in latest_tweets if str(tweet.id) in unprocessed_ids]
             
             if new_tweets:
                 logger.info(f"发现 {len(new_tweets)} 条新推文")
@@ -329,14 +298,117 @@ class TwitterMonitor:
             
             return new_tweets
             
+        except TwitterAPIError:
+            raise
         except Exception as e:
             logger.error(f"检查新推文失败: {e}")
             return []
     
+    async def check_accounts(self, usernames, max_concurrency=None, per_account_limit=None):
+        """
+        并发检查多个账号的新推文，并按时间正序合并结果
+
+        Args:
+            usernames: 要检查的用户名列表
+            max_concurrency: 同时抓取的账号数量上限
+            per_account_limit: 每个账号本轮最多转发的推文数量（取最旧的若干条，其余留到下一轮）
+
+        Returns:
+            按发布时间从旧到新排序的新推文列表（各账号的错误类别记录在 last_check_errors 中）
+        """
+        if not usernames:
+            return []
+
+        semaphore = asyncio.Semaphore(max_concurrency or Config.TWITTER_MAX_CONCURRENCY)
+
+        async def _check(username):
+            async with semaphore:
+                return await self.check_new_tweets(username)
+
+        results = await asyncio.gather(*(_check(username) for username in usernames), return_exceptions=True)
+
+        merged = []
+        errors = {}
+        for username, result in zip(usernames, results):
+            if isinstance(result, TwitterAPIError):
+                logger.error(f"检查 @{username} 的新推文失败 ({result.category}): {result}")
+                errors[username] = result.category
+                continue
+            if isinstance(result, Exception):
+                logger.error(f"检查 @{username} 的新推文失败: {result}")
+                errors[username] = 'unknown'
+                continue
+            if per_account_limit and len(result) > per_account_limit:
+                # 高水位只推进到实际转发的推文：从最旧的开始取，较新的推文仍在高水位之上，下一轮继续转发
+                result = sorted(result, key=lambda tweet: tweet.id)
+                logger.info(f"@{username} 有 {len(result)} 条新推文，本轮转发最旧的 {per_account_limit} 条，"
+                            f"其余 {len(result) - per_account_limit} 条留到下一轮")
+                result = result[:per_account_limit]
+            merged.extend(result)
+
+        # 推文ID (snowflake) 与时间单调对应，作为同一时间戳下的稳定排序键
+        merged.sort(key=lambda tweet: (tweet.timestamp, tweet.id))
+        self.last_check_errors = errors
+        return merged
+
+    async def get_quota_stats(self):
+        """获取 RapidAPI 配额状态"""
+        await self.quota.load()
+        return self.quota.get_stats()
+
+    def get_breaker_states(self):
+        """获取各上游接口熔断器状态"""
+        breakers = [self.rapidapi_breaker] + [
+            provider.breaker for provider in self.tweet_lookup.providers
+            if provider.breaker is not self.rapidapi_breaker
+        ]
+        return {breaker.name: (breaker.state, int(breaker.retry_in())) for breaker in breakers}
+
+    def get_lookup_stats(self):
+        """获取单推文查询接口的延迟与对冲统计"""
+        return self.tweet_lookup.get_stats()
+
+    async def select_video_variant(self, media_item):
+        """
+        为视频/GIF 媒体挑选 Telegram 可直接拉取的 mp4 版本
+
+        Args:
+            media_item: TweetMedia 媒体条目
+
+        Returns:
+            选中的版本 {'url', 'bitrate', 'size'}，无可用版本时返回 None
+        """
+        return await self.video_selector.select(media_item.variants)
+
+    def open_cached_media(self, url):
+        """
+        把媒体流式下载到本地缓存并打开（异步上下文管理器，使用期间文件不会被淘汰）
+
+        Raises:
+            OSError: 媒体无法下载或文件无法打开
+        """
+        return self.media_cache.open(url)
+
+    def get_media_cache_stats(self):
+        """获取本地媒体缓存统计"""
+        return self.media_cache.get_stats()
+
+    def get_video_probe_stats(self):
+        """获取视频版本探测统计"""
+        return self.video_selector.get_stats()
+
+    def get_http_stats(self):
+        """获取共享 HTTP 连接池统计信息"""
+        return self.http_client.get_stats()
+
+    async def close(self):
+        """释放 Twitter 监控持有的网络资源"""
+        await self.http_client.close()
+
     async def test_connection(self):
         """测试 RapidAPI 连接 (twitter241)"""
         try:
-            data = await self._make_request("/user", {"username": "elonmusk"})
+            data = await self.make_request("/user", {"username": "elonmusk"})
             if data and data.get("result"):
                 logger.info("RapidAPI (twitter241) 连接测试成功")
                 return True
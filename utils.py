@@ -6,9 +6,11 @@
 import asyncio
 import re
 import logging
+import sys
+import time
+from collections import OrderedDict
 from functools import wraps, partial
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Awaitable, Callable
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
@@ -276,105 +278,224 @@ async def run_in_thread(func, *args, **kwargs):
     return await loop.run_in_executor(None, partial(func, *args, **kwargs))
 
 
-class MemoryManager:
-    """内存管理器 - 用于管理内存使用的工具类"""
-    
-    def __init__(self, max_size: int = 1000, cleanup_threshold: float = 0.8):
+class LRUCache:
+    """
+    按最近使用顺序淘汰的缓存（OrderedDict + 单调时钟）
+
+    add / get / remove 与淘汰均为 O(1)：每次超出容量只淘汰最久未使用的一个条目，不会集中清理阻塞事件循环。
+    支持可选的条目有效期（TTL），容量可按条目数和/或近似字节数限制。
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: Optional[float] = None, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = sys.getsizeof):
         """
-        初始化内存管理器
-        
+        初始化缓存
+
         Args:
-            max_size: 最大存储数量
-            cleanup_threshold: 清理阈值（当使用量达到此比例时触发清理）
+            max_size: 最大条目数（None 表示不限制）
+            ttl: 默认有效期（秒，None 表示不过期）
+            max_bytes: 近似字节数上限（None 表示不限制）
+            sizeof: 估算条目大小的函数（默认 sys.getsizeof，只计算对象本身，不递归）
         """
         self.max_size = max_size
-        self.cleanup_threshold = cleanup_threshold
-        self.data = {}
-        self.access_times = {}
-    
-    def add(self, key: str, value: Any) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data = OrderedDict()  # {key: (expires_at, nbytes, value)}，最近使用的在末尾
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _pop(self, key) -> None:
+        _, nbytes, _ = self._data.pop(key)
+        self.total_bytes -= nbytes
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
         """
-        添加数据
-        
+        添加或替换条目（成为最近使用的条目）
+
         Args:
             key: 键
             value: 值
+            ttl: 该条目的有效期（秒，默认使用缓存的 ttl）
         """
-        self.data[key] = value
-        self.access_times[key] = datetime.now()
-        
-        # 检查是否需要清理
-        if len(self.data) > self.max_size * self.cleanup_threshold:
-            self._cleanup()
-    
-    def get(self, key: str) -> Any:
+        if key in self._data:
+            self._pop(key)
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        nbytes = self.sizeof(key) + self.sizeof(value) if self.max_bytes is not None else 0
+        self._data[key] = (expires_at, nbytes, value)
+        self.total_bytes += nbytes
+        self._evict()
+
+    def _evict(self) -> None:
+        """淘汰已过期的最久未使用条目，以及超出容量的条目"""
+        now = None
+        while self._data:
+            key, (expires_at, _, _) = next(iter(self._data.items()))
+            if expires_at is not None:
+                now = now or time.monotonic()
+                if now >= expires_at:
+                    self._pop(key)
+                    self.expirations += 1
+                    continue
+            over_size = self.max_size is not None and len(self._data) > self.max_size
+            over_bytes = self.max_bytes is not None and self.total_bytes > self.max_bytes
+            if not (over_size or over_bytes) or len(self._data) == 1:
+                break
+            self._pop(key)
+            self.evictions += 1
+
+    def get(self, key: str, default: Any = None) -> Any:
         """
-        获取数据
-        
-        Args:
-            key: 键
-            
+        获取条目并标记为最近使用
+
         Returns:
-            值，如果不存在则返回None
+            值，不存在或已过期时返回 default
         """
-        if key in self.data:
-            self.access_times[key] = datetime.now()
-            return self.data[key]
-        return None
-    
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, _, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self._pop(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
     def remove(self, key: str) -> bool:
         """
-        移除数据
-        
-        Args:
-            key: 键
-            
+        移除条目
+
         Returns:
             是否成功移除
         """
-        if key in self.data:
-            del self.data[key]
-            del self.access_times[key]
+        if key in self._data:
+            self._pop(key)
             return True
         return False
-    
-    def _cleanup(self) -> None:
-        """清理最久未使用的数据"""
-        if not self.data:
-            return
-        
-        # 按访问时间排序，移除最久未使用的50%数据
-        sorted_items = sorted(self.access_times.items(), key=lambda x: x[1])
-        items_to_remove = sorted_items[:len(sorted_items) // 2]
-        
-        for key, _ in items_to_remove:
-            self.remove(key)
-        
-        logger.info(f"内存清理完成: 移除了 {len(items_to_remove)} 个条目，剩余 {len(self.data)} 个")
-    
+
     def clear(self) -> None:
-        """清空所有数据"""
-        self.data.clear()
-        self.access_times.clear()
-        logger.info("内存管理器已清空")
-    
+        """清空所有条目"""
+        self._data.clear()
+        self.total_bytes = 0
+
     def size(self) -> int:
+        """当前条目数（可能包含尚未被访问或淘汰的过期条目）"""
+        return len(self._data)
+
+    def is_full(self) -> bool:
+        """是否达到条目数上限"""
+        return self.max_size is not None and len(self._data) >= self.max_size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'max_size': self.max_size,
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class AsyncTTLCache:
+    """带 TTL 与 LRU 淘汰的异步缓存，同一键的并发未命中合并为一次请求（single-flight）"""
+
+    def __init__(self, max_size: int = 256, ttl: float = 600):
         """
-        获取当前数据量
-        
-        Returns:
-            当前存储的数据数量
+        初始化异步缓存
+
+        Args:
+            max_size: 最大缓存条目数
+            ttl: 条目有效期（秒）
         """
-        return len(self.data)
-    
-    def is_full(self) -> bool:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()  # {key: (expires_at, value)}
+        self._inflight = {}  # {key: asyncio.Task}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _get_fresh(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def _store(self, key, value) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    async def get_or_fetch(self, key, fetcher: Callable[[], Awaitable[Any]]) -> Any:
         """
-        检查是否已满
-        
+        读取缓存，未命中时调用 fetcher 获取并缓存结果（None 不缓存）
+
+        Args:
+            key: 缓存键
+            fetcher: 无参协程函数，返回要缓存的值
+
         Returns:
-            是否达到最大容量
+            缓存值或 fetcher 的返回值；fetcher 抛出的异常会传递给所有等待者
         """
-        return len(self.data) >= self.max_size
+        found, value = self._get_fresh(key)
+        if found:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+
+        async def _run():
+            try:
+                result = await fetcher()
+                if result is not None:
+                    self._store(key, result)
+                return result
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(_run())
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    def invalidate(self, key) -> None:
+        """移除指定缓存条目"""
+        self._data.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存命中统计"""
+        return {
+            'size': len(self._data),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'inflight': len(self._inflight),
+        }
 
 
 # 全局工具实例